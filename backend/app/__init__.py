@@ -7,6 +7,9 @@ from datetime import timedelta
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from app.log import configure_logging
+from app.json_provider import configure_json
+from app.compression import configure_compression
 
 # Initialize extensions
 db = SQLAlchemy()
@@ -29,6 +32,36 @@ def create_app(config_name='development'):
     )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # Logging (see app/log.py); DEBUG adds per-record ingest detail
+    app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')
+    configure_logging(app)
+    
+    # JSON responses through orjson when installed (see app/json_provider.py); FAST_JSON=false keeps the stdlib
+    app.config['FAST_JSON'] = os.environ.get('FAST_JSON', 'true').lower() in ('1', 'true', 'yes')
+    configure_json(app)
+    
+    # gzip/brotli for JSON and NDJSON bodies (see app/compression.py); turn off when a proxy already compresses
+    app.config['COMPRESS_RESPONSES'] = os.environ.get('COMPRESS_RESPONSES', 'true').lower() in ('1', 'true', 'yes')
+    app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    configure_compression(app)
+    
+    # Background upload jobs (see app/services/upload_jobs.py)
+    app.config['UPLOAD_JOB_WORKERS'] = int(os.environ.get('UPLOAD_JOB_WORKERS', 2))
+    app.config['UPLOAD_JOB_MAX_PENDING'] = int(os.environ.get('UPLOAD_JOB_MAX_PENDING', 8))
+    
+    # Concurrent per-location insert batches for multi-location uploads (1 = serial)
+    app.config['INGEST_PARALLELISM'] = int(os.environ.get('INGEST_PARALLELISM', min(os.cpu_count() or 1, 4)))
+    
+    # Farthest an uploaded record's coordinates may be from a saved location and still match it
+    app.config['LOCATION_MATCH_MAX_KM'] = float(os.environ.get('LOCATION_MATCH_MAX_KM', 111.0))
+    
+    # Per-process cache of versioned GET responses (see app/services/response_cache.py)
+    app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('RESPONSE_CACHE_SIZE', 256))
+    
+    # Per-process cache of period statistics (see app/services/period_stats_cache.py)
+    app.config['PERIOD_STATS_CACHE_SIZE'] = int(os.environ.get('PERIOD_STATS_CACHE_SIZE', 2048))
+    app.config['PERIOD_STATS_CACHE_TTL'] = float(os.environ.get('PERIOD_STATS_CACHE_TTL', 3600))
+    
     # Get JWT secret from environment
     jwt_secret_from_env = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     app.config['JWT_SECRET_KEY'] = jwt_secret_from_env
@@ -50,12 +83,6 @@ def create_app(config_name='development'):
     # Explicitly configure JWT with the app config
     jwt.secret_key = app.config['JWT_SECRET_KEY']
     
-    # Log JWT configuration
-    print(f"JWT Debug - SECRET_KEY: {app.config['SECRET_KEY'][:10]}...")
-    print(f"JWT Debug - JWT_SECRET_KEY: {app.config['JWT_SECRET_KEY']}")
-    print(f"JWT Debug - JWT_ACCESS_TOKEN_EXPIRES: {app.config['JWT_ACCESS_TOKEN_EXPIRES']}")
-    print(f"JWT Debug - JWT Manager secret_key: {jwt.secret_key}")
-    
     CORS(app, resources={r"/api/*": {"origins": "*"}})
     
     # Register blueprints
@@ -73,6 +100,14 @@ def create_app(config_name='development'):
     app.register_blueprint(people_bp, url_prefix='/api')
     app.register_blueprint(location_data_bp)
     
+    # Bump users' data_version on ORM writes, for the versioned response cache
+    from .services.response_cache import register_data_version_hooks
+    register_data_version_hooks()
+    
+    # CLI commands (flask <command>)
+    from .commands import rebuild_daily_summaries_command
+    app.cli.add_command(rebuild_daily_summaries_command)
+    
     # Error handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -0,0 +1,14 @@
+import click
+from flask.cli import with_appcontext
+from app import db
+from app.services.daily_summaries import rebuild_daily_summaries
+
+@click.command('rebuild-daily-summaries')
+@click.option('--location-id', 'location_ids', type=int, multiple=True,
+              help='Only rebuild these locations (repeatable); default is all locations')
+@with_appcontext
+def rebuild_daily_summaries_command(location_ids):
+    """Recompute the weather_daily_summaries rollup from weather_records"""
+    total = rebuild_daily_summaries(db.session, list(location_ids) or None)
+    db.session.commit()
+    click.echo(f"📅 Rebuilt {total} daily summaries")
@@ -0,0 +1,90 @@
+import zlib
+from typing import Iterable, Iterator, Optional, Union
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+# Bodies worth compressing; images and uploads' binary payloads are left alone
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript',
+    'text/plain', 'text/html', 'text/css', 'text/csv',
+}
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # higher levels cost far more CPU per request for little gain on JSON
+
+def _choose_encoding() -> Optional[str]:
+    """'br' or 'gzip' from the request's Accept-Encoding, or None for an uncompressed body"""
+    accepted = request.accept_encodings
+    gzip_quality = accepted.quality('gzip')
+    if brotli is not None and accepted.quality('br') and accepted.quality('br') >= gzip_quality:
+        return 'br'
+    return 'gzip' if gzip_quality else None
+
+def _compressor(encoding: str):
+    """(compress, flush, finish) for one body; flush ends a chunk so it can be decoded right away"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31: gzip container
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+def _compress_stream(chunks: Iterable[Union[str, bytes]], encoding: str) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk, each one flushed so streams stay live"""
+    compress, flush, finish = _compressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                data = compress(chunk) + flush()
+                if data:
+                    yield data
+        yield finish()
+    finally:
+        # Closing the response must still close the wrapped iterable (and its request context)
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+def compress_response(response, min_size: int):
+    """after_request hook: gzip or brotli the body when the client accepts it.
+
+    Buffered bodies under ``min_size`` bytes are sent as is. Streamed bodies
+    (NDJSON history, upload reports) are always compressed, incrementally,
+    without buffering them. Strong ETags become weak, since the bytes differ
+    from the identity encoding's.
+    """
+    if (response.status_code < 200 or response.status_code in (204, 304)
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.direct_passthrough or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        compress, _, finish = _compressor(encoding)
+        response.set_data(compress(data) + finish())
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def configure_compression(app) -> None:
+    """Compress responses when COMPRESS_RESPONSES is on (bodies from COMPRESS_MIN_SIZE bytes)"""
+    if not app.config.get('COMPRESS_RESPONSES'):
+        return
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+    app.after_request(lambda response: compress_response(response, min_size))
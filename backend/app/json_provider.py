@@ -0,0 +1,53 @@
+import re
+from typing import Any, Optional
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: without it the app keeps Flask's stdlib provider
+    orjson = None
+
+# orjson writes exponents as 1e16 / 1e-7 where the stdlib writes 1e+16 / 1e-07; a hit
+# inside a string just means that response is encoded by the stdlib
+_EXPONENT = re.compile(rb'e[-0-9]')
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson, byte for byte like DefaultJSONProvider.
+
+    Only ``response()`` (jsonify) uses orjson: keys are sorted and separators
+    compact, as Flask does there outside debug mode; dates, datetimes and
+    dataclasses are handed to Flask's ``default`` so they keep their current
+    format. Anything orjson would write differently - non-ASCII text (Flask
+    escapes it), floats in exponent notation, non-string keys, integers beyond
+    64 bits - is re-encoded with the stdlib. Debug mode (indented output)
+    always uses the stdlib. The one difference left: NaN and infinities become
+    null instead of invalid JSON. ``dumps()`` and ``loads()`` are inherited, so
+    they keep the stdlib's spaced separators and exact big integers.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _encode(self, obj: Any) -> Optional[bytes]:
+        """Compact JSON bytes from orjson, or None when the stdlib must produce them"""
+        try:
+            data = orjson.dumps(obj, default=self.default, option=self.option)
+        except orjson.JSONEncodeError:
+            return None
+        if not data.isascii() or _EXPONENT.search(data):
+            return None
+        return data
+
+    def response(self, *args: Any, **kwargs: Any):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        data = self._encode(self._prepare_response_obj(args, kwargs))
+        if data is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data + b'\n', mimetype=self.mimetype)
+
+def configure_json(app) -> None:
+    """Use OrjsonProvider when FAST_JSON is on and orjson is installed"""
+    if app.config.get('FAST_JSON') and orjson is not None:
+        app.json = OrjsonProvider(app)
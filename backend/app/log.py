@@ -0,0 +1,57 @@
+import logging
+import os
+import sys
+from typing import Dict
+
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(name)s] %(message)s'
+
+def configure_logging(app) -> None:
+    """Send the ``app.*`` loggers to stderr at LOG_LEVEL (default INFO).
+
+    Modules log through ``logging.getLogger(__name__)``; per-record detail is
+    logged at DEBUG so production runs at INFO pay only an ``isEnabledFor``
+    check for it.
+    """
+    level = app.config.get('LOG_LEVEL') or os.environ.get('LOG_LEVEL', 'INFO')
+    logger = logging.getLogger('app')
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+    # create_app may run more than once per process (scripts, tests)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+    logger.propagate = False
+
+class SampledLogger:
+    """Log repetitive per-record events without flooding the output.
+
+    The first ``first`` events for each key are logged, after that only every
+    ``every``-th one, annotated with how many were seen. Disabled levels cost a
+    single ``isEnabledFor`` check, so per-record calls are cheap at INFO.
+    """
+
+    def __init__(self, logger: logging.Logger, first: int = 5, every: int = 1000):
+        self.logger = logger
+        self.first = first
+        self.every = every
+        self.counts: Dict[str, int] = {}
+
+    def log(self, level: int, key: str, msg: str, *args) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count <= self.first:
+            self.logger.log(level, msg, *args)
+        elif count % self.every == 0:
+            self.logger.log(level, msg + ' (%d so far)', *args, count)
+
+    def debug(self, key: str, msg: str, *args) -> None:
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def info(self, key: str, msg: str, *args) -> None:
+        self.log(logging.INFO, key, msg, *args)
+
+    def warning(self, key: str, msg: str, *args) -> None:
+        self.log(logging.WARNING, key, msg, *args)
@@ -1,10 +1,14 @@
 from .user import User
 from .location import Location
 from .weather_record import WeatherRecord
+from .weather_daily_summary import WeatherDailySummary
 from .person import Person
 from .person_location import PersonLocation
 from .country import Country
 from .state import State
 from .city import City
+from .upload_job import UploadJob
+from .upload_session import UploadSession
+from .upload_chunk import UploadChunk
 
-__all__ = ['User', 'Location', 'WeatherRecord', 'Person', 'PersonLocation', 'Country', 'State', 'City'] 
\ No newline at end of file
+__all__ = ['User', 'Location', 'WeatherRecord', 'WeatherDailySummary', 'Person', 'PersonLocation', 'Country', 'State', 'City', 'UploadJob', 'UploadSession', 'UploadChunk'] 
\ No newline at end of file
@@ -5,7 +5,7 @@ class Location(db.Model):
     __tablename__ = 'locations'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     name = db.Column(db.String(100), nullable=False)
     address = db.Column(db.String(500), nullable=True)  # Full address string
     city = db.Column(db.String(100), nullable=False)
@@ -15,9 +15,15 @@ class Location(db.Model):
     notes = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Maintained from the daily rollup (see app/services/daily_summaries.py) so
+    # serializing a location never loads its weather records
+    weather_records_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Incremented with every rollup change, in the same UPDATE; versioned responses (response_cache) key on it
+    weather_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     weather_records = db.relationship('WeatherRecord', backref='location', lazy=True, cascade='all, delete-orphan')
+    daily_summaries = db.relationship('WeatherDailySummary', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
     
     def __init__(self, user_id, name, address=None, city=None, country=None, latitude=None, longitude=None, notes=None):
         self.user_id = user_id
@@ -43,14 +49,14 @@ class Location(db.Model):
             'description': self.notes,  # Map notes to description for frontend
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'weather_records_count': len(self.weather_records)
+            'weather_records_count': self.weather_records_count
         }
     
     def get_latest_weather(self):
         """Get the most recent weather record for this location"""
-        if self.weather_records:
-            return max(self.weather_records, key=lambda x: x.recorded_at)
-        return None
+        from app.models.weather_record import WeatherRecord
+        # One backward probe of the (location_id, recorded_at) index; many locations: weather_reads.latest_records
+        return WeatherRecord.query.filter_by(location_id=self.id).order_by(WeatherRecord.recorded_at.desc()).first()
     
     def __repr__(self):
         return f'<Location {self.name}, {self.city}, {self.country}>' 
\ No newline at end of file
@@ -0,0 +1,40 @@
+from app import db
+from datetime import datetime
+
+class UploadChunk(db.Model):
+    __tablename__ = 'upload_chunks'
+    __table_args__ = (
+        # A chunk is committed at most once; replays find the existing row
+        db.UniqueConstraint('session_id', 'chunk_index', name='uq_upload_chunks_session_chunk'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String(32), db.ForeignKey('upload_sessions.id', ondelete='CASCADE'), nullable=False)
+    chunk_index = db.Column(db.Integer, nullable=False)
+    total_records = db.Column(db.Integer, nullable=False, default=0)
+    stored_records = db.Column(db.Integer, nullable=False, default=0)
+    skipped_records = db.Column(db.Integer, nullable=False, default=0)
+    errors_count = db.Column(db.Integer, nullable=False, default=0)
+    committed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __init__(self, session_id, chunk_index, total_records=0, stored_records=0, skipped_records=0, errors_count=0):
+        self.session_id = session_id
+        self.chunk_index = chunk_index
+        self.total_records = total_records
+        self.stored_records = stored_records
+        self.skipped_records = skipped_records
+        self.errors_count = errors_count
+    
+    def to_dict(self):
+        """Convert upload chunk to dictionary"""
+        return {
+            'chunk_index': self.chunk_index,
+            'total_records': self.total_records,
+            'stored_records': self.stored_records,
+            'skipped_records': self.skipped_records,
+            'errors_count': self.errors_count,
+            'committed_at': self.committed_at.isoformat() if self.committed_at else None
+        }
+    
+    def __repr__(self):
+        return f'<UploadChunk {self.session_id}#{self.chunk_index}>'
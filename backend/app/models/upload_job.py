@@ -0,0 +1,61 @@
+from app import db
+from datetime import datetime
+import uuid
+
+class UploadJob(db.Model):
+    __tablename__ = 'upload_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    location_id = db.Column(db.Integer, db.ForeignKey('locations.id', ondelete='SET NULL'), nullable=True)  # NULL for multi-location uploads
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, completed, failed
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    stored_records = db.Column(db.Integer, nullable=False, default=0)
+    skipped_records = db.Column(db.Integer, nullable=False, default=0)
+    errors_count = db.Column(db.Integer, nullable=False, default=0)
+    locations_processed = db.Column(db.Integer, nullable=True)
+    date_fallbacks = db.Column(db.Integer, nullable=True)  # timestamps that missed the detected format; set when the job completes
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def __init__(self, user_id, location_id=None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.location_id = location_id
+        self.status = 'queued'
+        self.rows_processed = 0
+        self.stored_records = 0
+        self.skipped_records = 0
+        self.errors_count = 0
+    
+    @property
+    def rows_per_second(self):
+        """Average ingest rate since the job started"""
+        if not self.started_at:
+            return None
+        elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 1) if elapsed > 0 else None
+    
+    def to_dict(self):
+        """Convert upload job to dictionary"""
+        return {
+            'id': self.id,
+            'location_id': self.location_id,
+            'status': self.status,
+            'rows_processed': self.rows_processed,
+            'rows_per_second': self.rows_per_second,
+            'stored_records': self.stored_records,
+            'skipped_records': self.skipped_records,
+            'errors_count': self.errors_count,
+            'locations_processed': self.locations_processed,
+            'date_fallbacks': self.date_fallbacks,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+    
+    def __repr__(self):
+        return f'<UploadJob {self.id} {self.status}>'
@@ -0,0 +1,52 @@
+from app import db
+from datetime import datetime
+import uuid
+
+class UploadSession(db.Model):
+    __tablename__ = 'upload_sessions'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    location_id = db.Column(db.Integer, db.ForeignKey('locations.id', ondelete='CASCADE'), nullable=True)  # NULL for multi-location uploads
+    total_chunks = db.Column(db.Integer, nullable=True)  # Expected number of chunks, if the client knows it
+    status = db.Column(db.String(20), nullable=False, default='open')  # open, finalized
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finalized_at = db.Column(db.DateTime, nullable=True)
+    
+    # Relationships
+    chunks = db.relationship('UploadChunk', backref='session', lazy=True, cascade='all, delete-orphan',
+                             order_by='UploadChunk.chunk_index')
+    
+    def __init__(self, user_id, location_id=None, total_chunks=None):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.location_id = location_id
+        self.total_chunks = total_chunks
+        self.status = 'open'
+    
+    def missing_chunks(self):
+        """Chunk indexes (0-based) not yet committed, when total_chunks is known"""
+        if self.total_chunks is None:
+            return []
+        committed = {chunk.chunk_index for chunk in self.chunks}
+        return [index for index in range(self.total_chunks) if index not in committed]
+    
+    def to_dict(self):
+        """Convert upload session to dictionary"""
+        return {
+            'id': self.id,
+            'location_id': self.location_id,
+            'total_chunks': self.total_chunks,
+            'status': self.status,
+            'committed_chunks': [chunk.chunk_index for chunk in self.chunks],
+            'missing_chunks': self.missing_chunks(),
+            'total_records': sum(chunk.total_records for chunk in self.chunks),
+            'stored_records': sum(chunk.stored_records for chunk in self.chunks),
+            'skipped_records': sum(chunk.skipped_records for chunk in self.chunks),
+            'errors_count': sum(chunk.errors_count for chunk in self.chunks),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finalized_at': self.finalized_at.isoformat() if self.finalized_at else None
+        }
+    
+    def __repr__(self):
+        return f'<UploadSession {self.id} {self.status}>'
@@ -14,6 +14,8 @@ class User(db.Model):
     last_name = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Bumped on every write to the user's locations, people, visits or weather (see services/response_cache.py)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Relationships
     locations = db.relationship('Location', backref='user', lazy=True, cascade='all, delete-orphan')
@@ -35,18 +37,8 @@ class User(db.Model):
     
     def generate_tokens(self):
         """Generate access and refresh tokens"""
-        print(f"JWT Debug - Creating token for user ID: {self.id}")
         access_token = create_access_token(identity=self.id)
         refresh_token = create_refresh_token(identity=self.id)
-        print(f"JWT Debug - Access token created: {access_token[:50]}...")
-        
-        # Debug: Decode the token to see what's in it
-        try:
-            import jwt
-            decoded = jwt.decode(access_token, options={"verify_signature": False})
-            print(f"JWT Debug - Token payload: {decoded}")
-        except Exception as e:
-            print(f"JWT Debug - Could not decode token: {e}")
         
         return {
             'access_token': access_token,
@@ -0,0 +1,39 @@
+from app import db
+from datetime import datetime
+
+# Per location, per day rollup of weather_records, maintained on every insert
+# path by app/services/daily_summaries.py
+class WeatherDailySummary(db.Model):
+    __tablename__ = 'weather_daily_summaries'
+    __table_args__ = (
+        db.UniqueConstraint('location_id', 'day', name='uq_weather_daily_summaries_location_day'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    location_id = db.Column(db.Integer, db.ForeignKey('locations.id', ondelete='CASCADE'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    record_count = db.Column(db.Integer, nullable=False)
+    temperature_min = db.Column(db.Float, nullable=False)  # Celsius
+    temperature_max = db.Column(db.Float, nullable=False)
+    temperature_sum = db.Column(db.Float, nullable=False)
+    valid_count = db.Column(db.Integer, nullable=False, default=0)  # valid_* only cover the realistic 0-45 °C range
+    valid_min = db.Column(db.Float, nullable=True)
+    valid_max = db.Column(db.Float, nullable=True)
+    valid_sum = db.Column(db.Float, nullable=True)
+    condition_counts = db.Column(db.JSON, nullable=True)  # {description: count}
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        """Convert daily summary to dictionary"""
+        return {
+            'location_id': self.location_id,
+            'day': self.day.isoformat(),
+            'record_count': self.record_count,
+            'temperature_min': self.temperature_min,
+            'temperature_max': self.temperature_max,
+            'average_temperature': self.temperature_sum / self.record_count if self.record_count else None,
+            'condition_counts': self.condition_counts or {}
+        }
+    
+    def __repr__(self):
+        return f'<WeatherDailySummary {self.location_id} {self.day}>'
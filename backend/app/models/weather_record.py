@@ -3,6 +3,10 @@ from datetime import datetime
 
 class WeatherRecord(db.Model):
     __tablename__ = 'weather_records'
+    __table_args__ = (
+        # One observation per location and timestamp; uploads rely on this to skip duplicates
+        db.UniqueConstraint('location_id', 'recorded_at', name='uq_weather_records_location_recorded_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     location_id = db.Column(db.Integer, db.ForeignKey('locations.id'), nullable=False)
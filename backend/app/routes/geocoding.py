@@ -1,5 +1,8 @@
 from flask import Blueprint, request, jsonify
 from app.services.geocoding import get_coordinates
+import logging
+
+logger = logging.getLogger(__name__)
 
 geocoding_bp = Blueprint('geocoding', __name__)
 
@@ -25,5 +28,5 @@ def geocode_location():
             return jsonify({'error': 'Location not found'}), 404
             
     except Exception as e:
-        print(f"Geocoding error: {e}")
+        logger.exception("Geocoding error: %s", e)
         return jsonify({'error': 'Failed to geocode location'}), 500
@@ -3,32 +3,31 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.location import Location
 from app.services.geocoding import get_coordinates
+from app.services.response_cache import versioned_response
 from datetime import datetime
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 locations_bp = Blueprint('locations', __name__)
 
 @locations_bp.route('/', methods=['GET'])
 @jwt_required()
+@versioned_response
 def get_locations():
     """Get all locations for the current user"""
-    print("JWT Debug - About to validate JWT token")
     try:
-        print("JWT Debug - JWT validation passed!")
         current_user_id = get_jwt_identity()
-        print("JWT Debug - User ID:", current_user_id)
-        print("JWT Debug - Token type:", type(current_user_id))
         
         # Get locations for the current user
         locations = Location.query.filter_by(user_id=current_user_id).order_by(Location.created_at.desc()).all()
-        print("JWT Debug - Found", len(locations), "locations")
         
         return {
             'locations': [location.to_dict() for location in locations]
         }
     except Exception as e:
-        print("JWT Debug - Exception in get_locations:", e)
-        print("JWT Debug - Exception type:", type(e))
+        logger.exception("Error in get_locations: %s", e)
         return {'error': str(e)}, 500
 
 @locations_bp.route('/<int:location_id>', methods=['GET'])
@@ -51,14 +50,10 @@ def get_location(location_id):
 @jwt_required()
 def create_location():
     """Create a new location"""
-    print("JWT Debug - About to validate JWT token in create_location")
     try:
-        print("JWT Debug - JWT validation passed in create_location!")
         current_user_id = get_jwt_identity()
-        print("JWT Debug - Creating location for user ID:", current_user_id)
         
         data = request.get_json()
-        print("JWT Debug - Received data:", data)
         
         # Validate required fields
         required_fields = ['name', 'city', 'country']
@@ -111,8 +106,7 @@ def create_location():
             return jsonify({'error': 'Failed to create location'}), 500
             
     except Exception as e:
-        print("JWT Debug - Exception in create_location:", e)
-        print("JWT Debug - Exception type:", type(e))
+        logger.exception("Error in create_location: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @locations_bp.route('/<int:location_id>', methods=['PUT'])
@@ -4,7 +4,12 @@ from app import db
 from app.models.person import Person
 from app.models.person_location import PersonLocation
 from app.models.location import Location
+from app.services.daily_summaries import valid_temperature_extremes, visit_window_temperatures
+from app.services.response_cache import versioned_response
 from datetime import datetime, date
+import logging
+
+logger = logging.getLogger(__name__)
 
 people_bp = Blueprint('people', __name__)
 
@@ -28,7 +33,7 @@ def get_people():
         
         return jsonify(people_with_visits), 200
     except Exception as e:
-        print(f"Error fetching people: {e}")
+        logger.exception("Error fetching people: %s", e)
         return jsonify({'error': 'Failed to fetch people'}), 500
 
 @people_bp.route('/people/<int:person_id>', methods=['GET'])
@@ -52,7 +57,7 @@ def get_person(person_id):
         
         return jsonify(person_data), 200
     except Exception as e:
-        print(f"Error fetching person: {e}")
+        logger.exception("Error fetching person: %s", e)
         return jsonify({'error': 'Failed to fetch person'}), 500
 
 @people_bp.route('/people', methods=['POST'])
@@ -96,7 +101,7 @@ def create_person():
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error creating person: {e}")
+        logger.exception("Error creating person: %s", e)
         return jsonify({'error': 'Failed to create person'}), 500
 
 @people_bp.route('/people/<int:person_id>', methods=['PUT'])
@@ -143,7 +148,7 @@ def update_person(person_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error updating person: {e}")
+        logger.exception("Error updating person: %s", e)
         return jsonify({'error': 'Failed to update person'}), 500
 
 @people_bp.route('/people/<int:person_id>', methods=['DELETE'])
@@ -165,7 +170,7 @@ def delete_person(person_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error deleting person: {e}")
+        logger.exception("Error deleting person: %s", e)
         return jsonify({'error': 'Failed to delete person'}), 500
 
 @people_bp.route('/people/<int:person_id>/visits', methods=['POST'])
@@ -218,7 +223,7 @@ def add_person_visit(person_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error adding visit: {e}")
+        logger.exception("Error adding visit: %s", e)
         return jsonify({'error': 'Failed to add visit'}), 500
 
 @people_bp.route('/people/<int:person_id>/visits/<int:visit_id>', methods=['PUT'])
@@ -259,7 +264,7 @@ def update_person_visit(person_id, visit_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error updating visit: {e}")
+        logger.exception("Error updating visit: %s", e)
         return jsonify({'error': 'Failed to update visit'}), 500
 
 @people_bp.route('/people/<int:person_id>/visits/<int:visit_id>', methods=['DELETE'])
@@ -286,7 +291,7 @@ def delete_person_visit(person_id, visit_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error deleting visit: {e}")
+        logger.exception("Error deleting visit: %s", e)
         return jsonify({'error': 'Failed to delete visit'}), 500
 
 @people_bp.route('/people/search', methods=['GET'])
@@ -312,88 +317,47 @@ def search_people():
         return jsonify([person.to_dict() for person in people]), 200
         
     except Exception as e:
-        print(f"Error searching people: {e}")
+        logger.exception("Error searching people: %s", e)
         return jsonify({'error': 'Failed to search people'}), 500
 
 @people_bp.route('/people/dashboard-temps', methods=['GET'])
 @jwt_required()
+@versioned_response
 def get_dashboard_temps():
     """Get temperature data using the same calculation method as PersonDashboard"""
     try:
         current_user_id = get_jwt_identity()
         
-        # Get all people for this user
-        people = Person.query.filter_by(user_id=current_user_id).all()
+        # Realistic temperatures in a 14-day window around each visit (same as
+        # PersonDashboard), for all people and visits in one statement
+        temperatures = visit_window_temperatures(current_user_id)
+        rows = db.session.execute(
+            db.select(Person.id, Person.first_name, temperatures.c.highest_temp,
+                      temperatures.c.lowest_temp, temperatures.c.avg_temp)
+            .outerjoin(temperatures, temperatures.c.person_id == Person.id)
+            .where(Person.user_id == current_user_id)
+            .order_by(Person.id)
+        )
         
         people_temps = []
-        
-        for person in people:
-            # Get visits for this person
-            person_visits = PersonLocation.query.filter_by(person_id=person.id).all()
-            
-            if person_visits:
-                # Use the same calculation method as PersonDashboard
-                from app.models.weather_record import WeatherRecord
-                from datetime import datetime, timedelta
-                
-                all_highest_temps = []
-                all_lowest_temps = []
-                all_avg_temps = []
-                
-                for visit in person_visits:
-                    location = Location.query.get(visit.location_id)
-                    if location:
-                        # Create a 14-day window around the visit date (same as PersonDashboard)
-                        visit_date = visit.start_date  # Already a date object
-                        start_date = visit_date - timedelta(days=7)
-                        end_date = visit_date + timedelta(days=7)
-                        
-                        # Get weather records for this specific period
-                        weather_records = WeatherRecord.query.filter(
-                            WeatherRecord.location_id == location.id,
-                            WeatherRecord.recorded_at >= start_date,
-                            WeatherRecord.recorded_at <= end_date
-                        ).all()
-                        
-                        if weather_records:
-                            # Filter to realistic temperature range
-                            valid_temps = [record.temperature for record in weather_records 
-                                         if 0 <= record.temperature <= 45]
-                            
-                            if valid_temps:
-                                all_highest_temps.append(max(valid_temps))
-                                all_lowest_temps.append(min(valid_temps))
-                                all_avg_temps.append(sum(valid_temps) / len(valid_temps))
-                
-                if all_highest_temps and all_lowest_temps and all_avg_temps:
-                    highest_temp = max(all_highest_temps)
-                    lowest_temp = min(all_lowest_temps)
-                    avg_temp = sum(all_avg_temps) / len(all_avg_temps)
-                else:
-                    highest_temp = 0
-                    lowest_temp = 0
-                    avg_temp = 0
-            else:
-                highest_temp = 0
-                lowest_temp = 0
-                avg_temp = 0
-            
+        for person_id, first_name, highest_temp, lowest_temp, avg_temp in rows:
             people_temps.append({
-                'person_id': person.id,
-                'first_name': person.first_name,
-                'highest_temp': highest_temp,
-                'lowest_temp': lowest_temp,
-                'avg_temp': avg_temp
+                'person_id': person_id,
+                'first_name': first_name,
+                'highest_temp': highest_temp if highest_temp is not None else 0,
+                'lowest_temp': lowest_temp if lowest_temp is not None else 0,
+                'avg_temp': avg_temp if avg_temp is not None else 0
             })
         
         return jsonify({'people_temps': people_temps})
         
     except Exception as e:
-        print(f"Error fetching dashboard temps: {str(e)}")
+        logger.exception("Error fetching dashboard temps: %s", e)
         return jsonify({'error': 'Failed to fetch dashboard temps'}), 500
 
 @people_bp.route('/people/homepage-stats', methods=['GET'])
 @jwt_required()
+@versioned_response
 def get_homepage_stats():
     """Get homepage statistics for all people in one efficient call"""
     current_user_id = get_jwt_identity()
@@ -409,6 +373,9 @@ def get_homepage_stats():
         # Get all person locations (visits) in one query
         all_visits = PersonLocation.query.join(Person).filter(Person.user_id == current_user_id).all()
         
+        # Realistic temperature range (0-45 °C) extremes of every location, in one query on the daily rollup
+        location_extremes = valid_temperature_extremes(location_dict)
+        
         # Group visits by person
         visits_by_person = {}
         for visit in all_visits:
@@ -441,26 +408,11 @@ def get_homepage_stats():
             highest_temp = 0
             lowest_temp = 0
             
-            if person_visits:
-                # Get weather data for this person's specific visits
-                from app.models.weather_record import WeatherRecord
-                
-                all_temperatures = []
-                
-                for visit in person_visits:
-                    location = location_dict.get(visit.location_id)
-                    if location:
-                        # Get weather records for this location
-                        weather_records = WeatherRecord.query.filter_by(location_id=location.id).all()
-                        
-                        # Filter to realistic temperature range for California locations
-                        valid_temps = [record.temperature for record in weather_records 
-                                     if 0 <= record.temperature <= 45]
-                        all_temperatures.extend(valid_temps)
-                
-                if all_temperatures:
-                    highest_temp = max(all_temperatures)
-                    lowest_temp = min(all_temperatures)
+            # Reduce the extremes of the visited locations
+            visited_extremes = [location_extremes[loc_id] for loc_id in visited_location_ids if loc_id in location_extremes]
+            if visited_extremes:
+                highest_temp = max(highest for highest, _ in visited_extremes)
+                lowest_temp = min(lowest for _, lowest in visited_extremes)
             
             people_stats.append({
                 'id': person.id,
@@ -480,5 +432,5 @@ def get_homepage_stats():
         }), 200
         
     except Exception as e:
-        print(f"Error fetching homepage stats: {e}")
+        logger.exception("Error fetching homepage stats: %s", e)
         return jsonify({'error': 'Failed to fetch homepage stats'}), 500
@@ -1,16 +1,42 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.location import Location
 from app.models.weather_record import WeatherRecord
 from app.services.weather_service import get_weather_data, get_weather_history, upload_historical_weather_data, upload_multi_location_historical_data
+from app.services.weather_service import dry_run_historical_weather_data, dry_run_multi_location_historical_data
+from app.services.json_stream import iter_json_array
+from app.services.upload_jobs import create_upload_job, UploadJobQueueFull
+from app.services.bulk_import import import_openweather_bulk
+from app.services.downsampling import parse_bucket, lttb_indices, bucket_aggregates
+from app.services.daily_summaries import refresh_daily_summaries, daily_aggregates, cached_period_stats
+from app.services.period_stats_cache import get_period_stats_cache
+from app.services.upload_sessions import create_upload_session, store_upload_chunk, finalize_upload_session
+from app.services.response_cache import versioned_response
+from app.services.weather_reads import RECORD_COLUMNS, RECORDED_AT_INDEX, record_query, record_row, record_dict, fetch_records, latest_records
+from app.models.upload_job import UploadJob
+from app.models.upload_session import UploadSession
 from datetime import datetime, timedelta
-import statistics
 import json
+import logging
+import numpy as np
+import statistics
 import os
 
+logger = logging.getLogger(__name__)
+
 weather_bp = Blueprint('weather', __name__)
 
+# Weather history paging and streaming
+DEFAULT_HISTORY_PAGE_SIZE = 500
+MAX_HISTORY_PAGE_SIZE = 5000
+HISTORY_STREAM_BATCH_SIZE = 1000
+MIN_HISTORY_POINTS = 3
+MAX_HISTORY_POINTS = 10000
+
+# Each window is two UNION ALL branches; SQLite allows 500 per compound SELECT
+MAX_PERIOD_STATS_WINDOWS = 200
+
 @weather_bp.route('/<int:location_id>', methods=['GET'])
 @jwt_required()
 def get_location_weather(location_id):
@@ -42,6 +68,8 @@ def get_location_weather(location_id):
         )
         
         db.session.add(weather_record)
+        db.session.flush()
+        refresh_daily_summaries(db.session, [(weather_record.location_id, weather_record.recorded_at)])
         db.session.commit()
         
         return jsonify({
@@ -56,26 +84,149 @@ def get_location_weather(location_id):
 @weather_bp.route('/history/<int:location_id>', methods=['GET'])
 @jwt_required()
 def get_weather_history(location_id):
-    """Get weather history for a specific location"""
+    """
+    Get weather history for a specific location, newest first
+    
+    Query parameters (all optional):
+    - start, end: only records with start <= recorded_at <= end
+    - limit, cursor: keyset pagination; pass the returned next_cursor to get the next page
+    - stream=true: newline-delimited JSON, one record per line, read through a server-side cursor
+    - points=N: a chart series of N temperature samples picked with LTTB (shape preserving)
+    - bucket=1h (or 900, 15m, 1d): a chart series of count/min/avg/max temperature per time bucket
+    - format=rows: records as value arrays under 'rows', in the order given by 'columns'
+      (in streams, each line is one array in RECORD_COLUMNS order)
+    Without any of these the whole history is returned in one array.
+    """
     current_user_id = get_jwt_identity()
     
     try:
+        try:
+            start = _query_datetime('start')
+            end = _query_datetime('end')
+            cursor = _query_datetime('cursor')
+            limit = request.args.get('limit', type=int)
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'}), 400
+        
+        points = request.args.get('points', type=int)
+        try:
+            bucket_seconds = parse_bucket(request.args['bucket']) if request.args.get('bucket') else None
+        except ValueError:
+            return jsonify({'error': 'Invalid bucket. Use seconds or a duration like 15m, 1h, 1d'}), 400
+        if points is not None and not MIN_HISTORY_POINTS <= points <= MAX_HISTORY_POINTS:
+            return jsonify({'error': f'points must be between {MIN_HISTORY_POINTS} and {MAX_HISTORY_POINTS}'}), 400
+        if points is not None and bucket_seconds is not None:
+            return jsonify({'error': 'Use either points or bucket, not both'}), 400
+        
+        history_format = request.args.get('format', 'records')
+        if history_format not in ('records', 'rows'):
+            return jsonify({'error': 'format must be records or rows'}), 400
+        as_rows = history_format == 'rows'
+        serialize = record_row if as_rows else record_dict
+        
+        paginate = limit is not None or cursor is not None
+        if paginate:
+            if limit is None:
+                limit = DEFAULT_HISTORY_PAGE_SIZE
+            if not 1 <= limit <= MAX_HISTORY_PAGE_SIZE:
+                return jsonify({'error': f'limit must be between 1 and {MAX_HISTORY_PAGE_SIZE}'}), 400
+        
         location = Location.query.filter_by(id=location_id, user_id=current_user_id).first()
         
         if not location:
             return jsonify({'error': 'Location not found'}), 404
         
-        # Get weather records from database
-        weather_records = WeatherRecord.query.filter_by(location_id=location_id).order_by(WeatherRecord.recorded_at.desc()).all()
-        
-        return jsonify({
-            'location': location.to_dict(),
-            'weather_history': [record.to_dict() for record in weather_records]
-        }), 200
+        query = record_query(location_id, start, end)
+        
+        if points is not None or bucket_seconds is not None:
+            return jsonify(dict(
+                _downsampled_history(query, points, bucket_seconds),
+                location=location.to_dict()
+            )), 200
+        
+        if _query_flag('stream'):
+            # yield_per streams rows from a server-side cursor instead of buffering the result;
+            # one chunk per fetched batch keeps per-chunk overhead (and compression flushes) low
+            def batches():
+                result = db.session.execute(query.execution_options(yield_per=HISTORY_STREAM_BATCH_SIZE))
+                for rows in result.partitions():
+                    yield ''.join(json.dumps(serialize(row)) + '\n' for row in rows)
+            return Response(stream_with_context(batches()), mimetype='application/x-ndjson')
+        
+        if not paginate:
+            return jsonify(_history_payload(location, [serialize(row) for row in fetch_records(query)], as_rows)), 200
+        
+        # Keyset pagination: (location_id, recorded_at) is unique, so the last
+        # timestamp of a page identifies where the next one starts
+        table = WeatherRecord.__table__
+        query = query.where(table.c.recorded_at.isnot(None))
+        if cursor is not None:
+            query = query.where(table.c.recorded_at < cursor)
+        rows = fetch_records(query.limit(limit + 1))
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1][RECORDED_AT_INDEX].isoformat()
+        
+        return jsonify(dict(
+            _history_payload(location, [serialize(row) for row in rows], as_rows),
+            next_cursor=next_cursor
+        )), 200
         
     except Exception as e:
+        logger.exception("Error in get_weather_history: %s", e)
         return jsonify({'error': 'Failed to fetch weather history'}), 500
 
+def _query_datetime(name):
+    """Optional ISO datetime query parameter; raises ValueError when malformed"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def _history_payload(location, records, as_rows):
+    """History response body: record dicts under weather_history, or value arrays under rows"""
+    if as_rows:
+        return {'location': location.to_dict(), 'columns': list(RECORD_COLUMNS), 'rows': records}
+    return {'location': location.to_dict(), 'weather_history': records}
+
+def _downsampled_history(query, points, bucket_seconds):
+    """Chart series for a history query: LTTB samples (points) or per-bucket aggregates (bucket_seconds)"""
+    table = WeatherRecord.__table__
+    rows = db.session.execute(
+        query.with_only_columns(table.c.recorded_at, table.c.temperature)
+        .where(table.c.recorded_at.isnot(None))
+        .order_by(None).order_by(table.c.recorded_at)
+    ).all()
+    
+    seconds = np.array([row[0] for row in rows], dtype='datetime64[us]').astype('datetime64[s]').astype(np.int64)
+    temperatures = np.array([row[1] for row in rows], dtype=np.float64)
+    
+    if points is not None:
+        series = [
+            {'recorded_at': rows[i][0].isoformat(), 'temperature': rows[i][1]}
+            for i in lttb_indices(seconds, temperatures, points).tolist()
+        ]
+        downsampling = {'method': 'lttb', 'points': points}
+    else:
+        buckets = bucket_aggregates(seconds, temperatures, bucket_seconds)
+        starts = np.datetime_as_string(buckets['start'].astype('datetime64[s]')).tolist()
+        series = [
+            {'recorded_at': start, 'count': count, 'min': low, 'avg': round(average, 2), 'max': high}
+            for start, count, low, average, high in zip(
+                starts, buckets['count'].tolist(), buckets['min'].tolist(),
+                buckets['avg'].tolist(), buckets['max'].tolist()
+            )
+        ]
+        downsampling = {'method': 'bucket', 'bucket_seconds': bucket_seconds}
+    
+    return {
+        'total_records': len(rows),
+        'downsampling': downsampling,
+        'series': series
+    }
+
 @weather_bp.route('/stats/<int:location_id>', methods=['GET'])
 @jwt_required()
 def get_weather_stats(location_id):
@@ -88,10 +239,11 @@ def get_weather_stats(location_id):
         if not location:
             return jsonify({'error': 'Location not found'}), 404
         
-        # Get weather records
-        weather_records = WeatherRecord.query.filter_by(location_id=location_id).all()
+        # Aggregate in the database (every day of the location comes from the rollup)
+        totals, conditions = cached_period_stats([(location_id, None, None)])
+        totals = totals[0]
         
-        if not weather_records:
+        if not totals['record_count']:
             return jsonify({
                 'location': location.to_dict(),
                 'stats': {
@@ -102,26 +254,16 @@ def get_weather_stats(location_id):
                 }
             }), 200
         
-        # Calculate statistics
-        temperatures = [record.temperature for record in weather_records]
-        descriptions = [record.description for record in weather_records if record.description]
-        
         stats = {
-            'total_records': len(weather_records),
-            'average_temperature': round(statistics.mean(temperatures), 1),
+            'total_records': totals['record_count'],
+            'average_temperature': round(totals['average_temperature'], 1),
             'temperature_range': {
-                'min': round(min(temperatures), 1),
-                'max': round(max(temperatures), 1)
+                'min': round(totals['lowest_temperature'], 1),
+                'max': round(totals['highest_temperature'], 1)
             },
-            'most_common_conditions': []
+            'most_common_conditions': conditions[0]
         }
         
-        # Find most common weather conditions
-        if descriptions:
-            from collections import Counter
-            condition_counts = Counter(descriptions)
-            stats['most_common_conditions'] = condition_counts.most_common(3)
-        
         return jsonify({
             'location': location.to_dict(),
             'stats': stats
@@ -132,6 +274,7 @@ def get_weather_stats(location_id):
 
 @weather_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
+@versioned_response
 def get_weather_dashboard():
     """Get weather dashboard data for all user locations"""
     current_user_id = get_jwt_identity()
@@ -152,15 +295,17 @@ def get_weather_dashboard():
         recent_weather = []
         all_temperatures = []
         
+        latest_by_location = latest_records([location.id for location in locations])
+        
         for location in locations:
-            latest_weather = WeatherRecord.query.filter_by(location_id=location.id).order_by(WeatherRecord.recorded_at.desc()).first()
+            latest_weather = latest_by_location.get(location.id)
             
             if latest_weather:
                 recent_weather.append({
                     'location': location.to_dict(),
-                    'weather': latest_weather.to_dict()
+                    'weather': latest_weather
                 })
-                all_temperatures.append(latest_weather.temperature)
+                all_temperatures.append(latest_weather['temperature'])
         
         # Calculate overall statistics
         dashboard_data = {
@@ -170,28 +315,25 @@ def get_weather_dashboard():
             'temperature_trends': []
         }
         
-        # Calculate temperature trends (last 7 days)
+        # Calculate temperature trends (last 7 days) from the daily rollup
         week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_records = WeatherRecord.query.filter(
-            WeatherRecord.location_id.in_([loc.id for loc in locations]),
-            WeatherRecord.recorded_at >= week_ago
-        ).order_by(WeatherRecord.recorded_at).all()
+        recent_days = daily_aggregates([loc.id for loc in locations], week_ago)
         
-        if recent_records:
-            # Group by date and calculate daily averages
+        if recent_days:
+            # Combine all locations into daily averages
             from collections import defaultdict
-            daily_temps = defaultdict(list)
+            daily_totals = defaultdict(lambda: [0.0, 0])
             
-            for record in recent_records:
-                date_key = record.recorded_at.date().isoformat()
-                daily_temps[date_key].append(record.temperature)
+            for (_, day), aggregate in recent_days.items():
+                daily_totals[day][0] += aggregate['temperature_sum']
+                daily_totals[day][1] += aggregate['record_count']
             
             dashboard_data['temperature_trends'] = [
                 {
-                    'date': date,
-                    'average_temp': round(statistics.mean(temps), 1)
+                    'date': day.isoformat(),
+                    'average_temp': round(total / count, 1)
                 }
-                for date, temps in sorted(daily_temps.items())
+                for day, (total, count) in sorted(daily_totals.items())
             ]
         
         return jsonify(dashboard_data), 200
@@ -230,6 +372,8 @@ def refresh_weather_data(location_id):
         )
         
         db.session.add(weather_record)
+        db.session.flush()
+        refresh_daily_summaries(db.session, [(weather_record.location_id, weather_record.recorded_at)])
         db.session.commit()
         
         return jsonify({
@@ -273,16 +417,15 @@ def get_weather_period_stats(location_id):
         if not location:
             return jsonify({'error': 'Location not found'}), 404
         
-        # Get weather records for the specified period
-        weather_records = WeatherRecord.query.filter(
-            WeatherRecord.location_id == location_id,
-            WeatherRecord.recorded_at >= start_date,
-            WeatherRecord.recorded_at <= end_date
-        ).all()
+        # Aggregate the period in the database, from the daily rollup (raw records
+        # only for partial edge days), or take it from the period stats cache;
+        # temperatures come back in Fahrenheit
+        totals, conditions = cached_period_stats([(location_id, start_date, end_date)], fahrenheit=True)
+        totals = totals[0]
         
         # If no database records, try to fetch historical weather data
-        if not weather_records:
-            print(f"🌤️ No database records found for {start_date.date()} to {end_date.date()}, fetching historical data...")
+        if not totals['record_count']:
+            logger.info("🌤️ No database records found for %s to %s, fetching historical data...", start_date.date(), end_date.date())
             
             try:
                 from app.services.weather_service import get_historical_weather_data
@@ -294,7 +437,7 @@ def get_weather_period_stats(location_id):
                 )
                 
                 if historical_weather:
-                    print(f"✅ Fetched {len(historical_weather)} historical weather records")
+                    logger.info("✅ Fetched %d historical weather records", len(historical_weather))
                     # Convert historical data to the format we need
                     temperatures = [record['temperature'] for record in historical_weather]
                     descriptions = [record['description'] for record in historical_weather if record['description']]
@@ -340,78 +483,16 @@ def get_weather_period_stats(location_id):
                         }
                     }), 200
                 else:
-                    print("❌ Failed to fetch historical weather data")
+                    logger.warning("❌ Failed to fetch historical weather data")
             except Exception as e:
-                print(f"❌ Error fetching historical weather: {e}")
-        
-        # If still no data, return fallback
-        if not weather_records:
-            return jsonify({
-                'location': location.to_dict(),
-                'period_stats': {
-                    'start_date': start_date.isoformat(),
-                    'end_date': end_date.isoformat(),
-                    'total_records': 0,
-                    'average_temperature': None,
-                    'highest_temperature': None,
-                    'lowest_temperature': None,
-                    'temperature_range': None,
-                    'most_common_conditions': [],
-                    'data_exists': False,
-                    'data_coverage': 'fallback'
-                }
-            }), 200
-        
-        # Calculate statistics for the period
-        temperatures = [record.temperature_fahrenheit() for record in weather_records]
-        descriptions = [record.description for record in weather_records if record.description]
-        
-        # Debug: Log the temperature conversion
-        print(f"🌡️ DEBUG: Raw Celsius temperatures: {[record.temperature for record in weather_records[:5]]}")
-        print(f"🌡️ DEBUG: Converted Fahrenheit temperatures: {temperatures[:5]}")
-        print(f"🌡️ DEBUG: Temperature count: {len(temperatures)}")
-        print(f"🌡️ DEBUG: Min temp: {min(temperatures) if temperatures else 'None'}")
-        print(f"🌡️ DEBUG: Max temp: {max(temperatures) if temperatures else 'None'}")
-        print(f"🌡️ DEBUG: Avg temp: {statistics.mean(temperatures) if temperatures else 'None'}")
-        
-        # Calculate data coverage percentage
-        total_days = (end_date - start_date).days + 1
-        days_with_data = len(set(record.recorded_at.date() for record in weather_records))
-        coverage_percentage = (days_with_data / total_days) * 100 if total_days > 0 else 0
-        
-        # Determine data existence state
-        data_exists = len(weather_records) > 0
-        if coverage_percentage >= 80:
-            data_coverage = 'complete'
-        elif coverage_percentage >= 50:
-            data_coverage = 'partial'
-        else:
-            data_coverage = 'fallback'
+                logger.exception("❌ Error fetching historical weather: %s", e)
         
-        period_stats = {
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat(),
-            'total_records': len(weather_records),
-            'average_temperature': round(statistics.mean(temperatures), 1),
-            'highest_temperature': round(max(temperatures), 1),
-            'lowest_temperature': round(min(temperatures), 1),
-            'temperature_range': {
-                'min': round(min(temperatures), 1),
-                'max': round(max(temperatures), 1)
-            },
-            'most_common_conditions': [],
-            'data_exists': data_exists,
-            'data_coverage': data_coverage,
-            'days_with_data': days_with_data,
-            'total_days': total_days,
-            'coverage_percentage': round(coverage_percentage, 1)
-        }
+        if totals['record_count']:
+            logger.debug("🌡️ Period stats for location %s: %d records over %d days, min %.1f°F, max %.1f°F",
+                         location_id, totals['record_count'], totals['days_with_data'],
+                         totals['lowest_temperature'], totals['highest_temperature'])
         
-        # Find most common weather conditions
-        if descriptions:
-            from collections import Counter
-            condition_counts = Counter(descriptions)
-            period_stats['most_common_conditions'] = condition_counts.most_common(3)
+        period_stats = _period_stats(start_date, end_date, totals, conditions[0])
         
         return jsonify({
             'location': location.to_dict(),
@@ -419,9 +500,131 @@ def get_weather_period_stats(location_id):
         }), 200
         
     except Exception as e:
-        print(f"Error in get_weather_period_stats: {e}")
+        logger.exception("Error in get_weather_period_stats: %s", e)
+        return jsonify({'error': 'Failed to fetch period weather statistics'}), 500
+
+def _period_stats(start_date, end_date, totals, most_common_conditions):
+    """period_stats payload for one window from its period_totals() row (in Fahrenheit)"""
+    if not totals['record_count']:
+        return {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'total_records': 0,
+            'average_temperature': None,
+            'highest_temperature': None,
+            'lowest_temperature': None,
+            'temperature_range': None,
+            'most_common_conditions': [],
+            'data_exists': False,
+            'data_coverage': 'fallback'
+        }
+    
+    average_temperature = totals['average_temperature']
+    highest_temperature = totals['highest_temperature']
+    lowest_temperature = totals['lowest_temperature']
+    
+    # Calculate data coverage percentage
+    total_days = (end_date - start_date).days + 1
+    days_with_data = totals['days_with_data']
+    coverage_percentage = (days_with_data / total_days) * 100 if total_days > 0 else 0
+    
+    if coverage_percentage >= 80:
+        data_coverage = 'complete'
+    elif coverage_percentage >= 50:
+        data_coverage = 'partial'
+    else:
+        data_coverage = 'fallback'
+    
+    return {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'total_records': totals['record_count'],
+        'average_temperature': round(average_temperature, 1),
+        'highest_temperature': round(highest_temperature, 1),
+        'lowest_temperature': round(lowest_temperature, 1),
+        'temperature_range': {
+            'min': round(lowest_temperature, 1),
+            'max': round(highest_temperature, 1)
+        },
+        'most_common_conditions': most_common_conditions,
+        'data_exists': True,
+        'data_coverage': data_coverage,
+        'days_with_data': days_with_data,
+        'total_days': total_days,
+        'coverage_percentage': round(coverage_percentage, 1)
+    }
+
+@weather_bp.route('/period-stats/batch', methods=['POST'])
+@jwt_required()
+def get_weather_period_stats_batch():
+    """
+    Get weather statistics for many (location, time period) windows in one call
+    
+    Body: [{"location_id": 1, "start_date": "...", "end_date": "..."}, ...]
+    Results come back in the same order. A window that is malformed or names
+    an unknown location gets {"location_id": ..., "error": ...} in its slot
+    and the others are still answered. Unlike the single-window endpoint,
+    windows without stored records are not filled from the external API.
+    """
+    current_user_id = get_jwt_identity()
+    
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({'error': 'Request body must be a JSON array of windows'}), 400
+        if len(data) > MAX_PERIOD_STATS_WINDOWS:
+            return jsonify({'error': f'At most {MAX_PERIOD_STATS_WINDOWS} windows per request'}), 400
+        
+        results = [None] * len(data)
+        windows = {}  # index in data -> (location_id, start_date, end_date)
+        for i, item in enumerate(data):
+            if not isinstance(item, dict) or not item.get('location_id') or not item.get('start_date') or not item.get('end_date'):
+                results[i] = {'location_id': item.get('location_id') if isinstance(item, dict) else None,
+                              'error': 'location_id, start_date and end_date are required'}
+                continue
+            try:
+                location_id = int(item['location_id'])
+                start_date = datetime.fromisoformat(str(item['start_date']).replace('Z', '+00:00'))
+                end_date = datetime.fromisoformat(str(item['end_date']).replace('Z', '+00:00'))
+            except (TypeError, ValueError):
+                results[i] = {'location_id': item['location_id'],
+                              'error': 'Invalid location_id or date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)'}
+                continue
+            windows[i] = (location_id, start_date, end_date)
+        
+        # Verify every location belongs to the user with one query
+        requested_ids = {location_id for location_id, _, _ in windows.values()}
+        owned_ids = {
+            location_id for (location_id,) in db.session.query(Location.id).filter(
+                Location.id.in_(requested_ids), Location.user_id == current_user_id
+            )
+        } if requested_ids else set()
+        for i, (location_id, _, _) in list(windows.items()):
+            if location_id not in owned_ids:
+                results[i] = {'location_id': location_id, 'error': 'Location not found'}
+                del windows[i]
+        
+        indexes = list(windows)
+        totals, conditions = cached_period_stats([windows[i] for i in indexes], fahrenheit=True)
+        for n, i in enumerate(indexes):
+            location_id, start_date, end_date = windows[i]
+            results[i] = {
+                'location_id': location_id,
+                'period_stats': _period_stats(start_date, end_date, totals[n], conditions[n])
+            }
+        
+        return jsonify({'results': results}), 200
+        
+    except Exception as e:
+        logger.exception("Error in get_weather_period_stats_batch: %s", e)
         return jsonify({'error': 'Failed to fetch period weather statistics'}), 500
 
+@weather_bp.route('/period-stats/cache', methods=['GET'])
+@jwt_required()
+def get_period_stats_cache_stats():
+    """Size and hit/miss counters of this worker's period stats cache (for sizing PERIOD_STATS_CACHE_SIZE)"""
+    return jsonify(get_period_stats_cache().stats()), 200
+
 @weather_bp.route('/upload-historical/<int:location_id>', methods=['POST'])
 @jwt_required()
 def upload_historical_weather(location_id):
@@ -439,16 +642,20 @@ def upload_historical_weather(location_id):
         if not request.is_json:
             return jsonify({'error': 'Request must contain JSON data'}), 400
         
-        json_data = request.get_json()
+        if _query_flag('dry_run'):
+            return _ndjson_response(dry_run_historical_weather_data(location_id, iter_json_array(request.stream)))
         
-        if not json_data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+        if _query_flag('async'):
+            return _start_upload_job(
+                current_user_id, location_id,
+                lambda records, progress: upload_historical_weather_data(location_id, records, progress)
+            )
         
-        # Convert JSON data to string for processing
-        json_string = json.dumps(json_data)
+        # Parse the body incrementally so records reach the database while it is still being read
+        records = iter_json_array(request.stream)
         
         # Upload and store historical weather data
-        result = upload_historical_weather_data(location_id, json_string)
+        result = upload_historical_weather_data(location_id, records)
         
         if result['success']:
             return jsonify({
@@ -458,6 +665,7 @@ def upload_historical_weather(location_id):
                     'total_records': result['total_records'],
                     'stored_records': result['stored_records'],
                     'skipped_records': result['skipped_records'],
+                    'date_fallbacks': result['date_fallbacks'],
                     'errors_count': len(result['errors'])
                 }
             }), 200
@@ -468,7 +676,7 @@ def upload_historical_weather(location_id):
             }), 400
             
     except Exception as e:
-        print(f"Error in upload_historical_weather: {e}")
+        logger.exception("Error in upload_historical_weather: %s", e)
         return jsonify({'error': 'Failed to upload historical weather data'}), 500 
 
 @weather_bp.route('/upload-multi-location-historical', methods=['POST'])
@@ -482,16 +690,20 @@ def upload_multi_location_historical_weather():
         if not request.is_json:
             return jsonify({'error': 'Request must contain JSON data'}), 400
         
-        json_data = request.get_json()
+        if _query_flag('dry_run'):
+            return _ndjson_response(dry_run_multi_location_historical_data(current_user_id, iter_json_array(request.stream)))
         
-        if not json_data:
-            return jsonify({'error': 'No JSON data provided'}), 400
+        if _query_flag('async'):
+            return _start_upload_job(
+                current_user_id, None,
+                lambda records, progress: upload_multi_location_historical_data(current_user_id, records, progress)
+            )
         
-        # Convert JSON data to string for processing
-        json_string = json.dumps(json_data)
+        # Parse the body incrementally so records reach the database while it is still being read
+        records = iter_json_array(request.stream)
         
         # Upload and store historical weather data for multiple locations
-        result = upload_multi_location_historical_data(current_user_id, json_string)
+        result = upload_multi_location_historical_data(current_user_id, records)
         
         if result['success']:
             return jsonify({
@@ -501,6 +713,7 @@ def upload_multi_location_historical_weather():
                     'stored_records': result['stored_records'],
                     'skipped_records': result['skipped_records'],
                     'locations_processed': result['locations_processed'],
+                    'date_fallbacks': result['date_fallbacks'],
                     'errors_count': len(result['errors'])
                 }
             }), 200
@@ -511,5 +724,216 @@ def upload_multi_location_historical_weather():
             }), 400
             
     except Exception as e:
-        print(f"Error in upload_multi_location_historical_weather: {e}")
-        return jsonify({'error': 'Failed to upload historical weather data'}), 500
\ No newline at end of file
+        logger.exception("Error in upload_multi_location_historical_weather: %s", e)
+        return jsonify({'error': 'Failed to upload historical weather data'}), 500
+
+@weather_bp.route('/upload-historical-bulk', methods=['POST'])
+@jwt_required()
+def upload_historical_bulk_export():
+    """Import an OpenWeather History Bulk export (CSV, or Parquet with ?format=parquet)
+    
+    Query parameters:
+        location_id: store every row at this location instead of matching by lat/lon/city_name
+        units: imperial (default), metric or standard - the units the export was ordered in
+        format: csv (default) or parquet
+    """
+    current_user_id = get_jwt_identity()
+    
+    try:
+        location_id = request.args.get('location_id', type=int)
+        if location_id is not None:
+            location = Location.query.filter_by(id=location_id, user_id=current_user_id).first()
+            if not location:
+                return jsonify({'error': 'Location not found'}), 404
+        
+        # Accept either a multipart file field or the raw request body
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        
+        result = import_openweather_bulk(
+            current_user_id,
+            stream,
+            location_id=location_id,
+            units=request.args.get('units', 'imperial'),
+            file_format=request.args.get('format', 'csv').lower()
+        )
+        
+        if result['success']:
+            return jsonify({
+                'message': 'Historical weather export imported successfully',
+                'upload_stats': {
+                    'total_records': result['total_records'],
+                    'stored_records': result['stored_records'],
+                    'skipped_records': result['skipped_records'],
+                    'locations_processed': result['locations_processed'],
+                    'errors_count': result['errors_count'],
+                    'errors': result['errors']
+                }
+            }), 200
+        else:
+            return jsonify({
+                'error': 'Failed to import historical weather export',
+                'details': result['error']
+            }), 400
+            
+    except Exception as e:
+        logger.exception("Error in upload_historical_bulk_export: %s", e)
+        return jsonify({'error': 'Failed to import historical weather export'}), 500
+
+def _query_flag(name):
+    """True when a boolean query parameter is set, e.g. ?async=true or ?dry_run=1"""
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+def _ndjson_response(lines):
+    """Stream report lines as newline-delimited JSON while the request body is still being read"""
+    return Response(
+        stream_with_context(json.dumps(line) + '\n' for line in lines),
+        mimetype='application/x-ndjson'
+    )
+
+def _start_upload_job(user_id, location_id, ingest):
+    """Queue an upload job for the current request body and return 202 with its id"""
+    try:
+        job = create_upload_job(user_id, location_id, request.stream, ingest)
+    except UploadJobQueueFull:
+        return jsonify({'error': 'Too many uploads in progress, please retry shortly'}), 503
+    except Exception as e:
+        logger.exception("Error in _start_upload_job: %s", e)
+        return jsonify({'error': 'Failed to read upload body'}), 400
+    
+    return jsonify({
+        'message': 'Historical weather upload queued',
+        'job_id': job.id,
+        'job': job.to_dict()
+    }), 202
+
+@weather_bp.route('/upload-jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_upload_job(job_id):
+    """Get progress and final status of a background historical upload"""
+    current_user_id = get_jwt_identity()
+    
+    try:
+        job = UploadJob.query.filter_by(id=job_id, user_id=current_user_id).first()
+        
+        if not job:
+            return jsonify({'error': 'Upload job not found'}), 404
+        
+        return jsonify({'job': job.to_dict()}), 200
+        
+    except Exception as e:
+        logger.exception("Error in get_upload_job: %s", e)
+        return jsonify({'error': 'Failed to fetch upload job'}), 500
+
+@weather_bp.route('/upload-sessions', methods=['POST'])
+@jwt_required()
+def create_historical_upload_session():
+    """Open a resumable, chunked historical upload"""
+    current_user_id = get_jwt_identity()
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        location_id = data.get('location_id')
+        total_chunks = data.get('total_chunks')
+        
+        if location_id is not None:
+            location = Location.query.filter_by(id=location_id, user_id=current_user_id).first()
+            if not location:
+                return jsonify({'error': 'Location not found'}), 404
+        
+        if total_chunks is not None and (not isinstance(total_chunks, int) or total_chunks < 1):
+            return jsonify({'error': 'total_chunks must be a positive integer'}), 400
+        
+        session = create_upload_session(current_user_id, location_id, total_chunks)
+        
+        return jsonify({
+            'message': 'Upload session created',
+            'session': session.to_dict()
+        }), 201
+        
+    except Exception as e:
+        logger.exception("Error in create_historical_upload_session: %s", e)
+        return jsonify({'error': 'Failed to create upload session'}), 500
+
+@weather_bp.route('/upload-sessions/<session_id>/chunks/<int:chunk_index>', methods=['PUT'])
+@jwt_required()
+def upload_session_chunk(session_id, chunk_index):
+    """Upload one numbered chunk (a JSON array of records); re-sending a committed chunk is a no-op"""
+    current_user_id = get_jwt_identity()
+    
+    try:
+        session = UploadSession.query.filter_by(id=session_id, user_id=current_user_id).first()
+        
+        if not session:
+            return jsonify({'error': 'Upload session not found'}), 404
+        
+        if session.total_chunks is not None and chunk_index >= session.total_chunks:
+            return jsonify({'error': f'Chunk index must be below {session.total_chunks}'}), 400
+        
+        if session.status == 'finalized':
+            return jsonify({'error': 'Upload session is already finalized'}), 409
+        
+        result = store_upload_chunk(session, chunk_index, request.stream)
+        
+        if result['success']:
+            return jsonify({
+                'message': 'Chunk already committed' if result['replayed'] else 'Chunk committed',
+                'replayed': result['replayed'],
+                'chunk': result['chunk'].to_dict()
+            }), 200
+        else:
+            return jsonify({
+                'error': 'Failed to upload chunk',
+                'details': result['error']
+            }), 400
+            
+    except Exception as e:
+        logger.exception("Error in upload_session_chunk: %s", e)
+        return jsonify({'error': 'Failed to upload chunk'}), 500
+
+@weather_bp.route('/upload-sessions/<session_id>', methods=['GET'])
+@jwt_required()
+def get_upload_session(session_id):
+    """Get committed and missing chunks of an upload session, so a client can resume it"""
+    current_user_id = get_jwt_identity()
+    
+    try:
+        session = UploadSession.query.filter_by(id=session_id, user_id=current_user_id).first()
+        
+        if not session:
+            return jsonify({'error': 'Upload session not found'}), 404
+        
+        return jsonify({'session': session.to_dict()}), 200
+        
+    except Exception as e:
+        logger.exception("Error in get_upload_session: %s", e)
+        return jsonify({'error': 'Failed to fetch upload session'}), 500
+
+@weather_bp.route('/upload-sessions/<session_id>/finalize', methods=['POST'])
+@jwt_required()
+def finalize_historical_upload_session(session_id):
+    """Finalize an upload session once all of its chunks are committed"""
+    current_user_id = get_jwt_identity()
+    
+    try:
+        session = UploadSession.query.filter_by(id=session_id, user_id=current_user_id).first()
+        
+        if not session:
+            return jsonify({'error': 'Upload session not found'}), 404
+        
+        result = finalize_upload_session(session)
+        
+        if not result['success']:
+            return jsonify({
+                'error': result['error'],
+                'missing_chunks': result.get('missing_chunks', [])
+            }), 409
+        
+        return jsonify({
+            'message': 'Historical weather upload completed',
+            'session': session.to_dict()
+        }), 200
+        
+    except Exception as e:
+        logger.exception("Error in finalize_historical_upload_session: %s", e)
+        return jsonify({'error': 'Failed to finalize upload session'}), 500
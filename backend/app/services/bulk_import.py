@@ -0,0 +1,206 @@
+import logging
+import shutil
+import tempfile
+from typing import IO, Dict, Optional
+from dateutil import tz
+import numpy as np
+import pandas as pd
+from flask import current_app
+from app import db
+from app.services.location_index import LocationIndex
+from app.services.weather_ingest import create_weather_writer
+
+logger = logging.getLogger(__name__)
+
+# Rows parsed per pandas chunk; keeps memory flat for multi-million row exports
+CHUNK_ROWS = 50000
+
+# Invalid rows described individually in the result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Plausible surface air temperatures in Celsius; anything outside is a unit or data error
+MIN_TEMPERATURE_C = -90.0
+MAX_TEMPERATURE_C = 60.0
+
+# OpenWeather History Bulk columns we read, and the weather_records column they map to
+OPTIONAL_COLUMNS = {
+    'humidity': 'humidity',
+    'pressure': 'pressure',
+    'wind_speed': 'wind_speed',
+    'wind_deg': 'wind_direction',
+}
+LOCATION_COLUMNS = ('lat', 'lon', 'city_name')
+
+class BulkImportError(ValueError):
+    """Raised when an export file can't be imported at all (bad format, missing columns)"""
+
+def _read_chunks(stream: IO[bytes], file_format: str):
+    """Yield DataFrames of at most CHUNK_ROWS rows from a CSV or Parquet export"""
+    if file_format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise BulkImportError('Parquet import requires the pyarrow package')
+        # Parquet keeps its metadata at the end of the file, so it needs a seekable source
+        with tempfile.TemporaryFile() as spool:
+            shutil.copyfileobj(stream, spool)
+            spool.seek(0)
+            for batch in pq.ParquetFile(spool).iter_batches(batch_size=CHUNK_ROWS):
+                yield batch.to_pandas()
+        return
+
+    if file_format != 'csv':
+        raise BulkImportError(f'Unsupported file format: {file_format}')
+
+    try:
+        yield from pd.read_csv(stream, chunksize=CHUNK_ROWS, low_memory=False)
+    except pd.errors.EmptyDataError:
+        return
+    except pd.errors.ParserError as e:
+        raise BulkImportError(f'Invalid CSV: {e}')
+
+def _parse_timestamps(chunk: pd.DataFrame) -> pd.Series:
+    """Vectorized timestamp parsing; invalid values become NaT.
+
+    Timestamps are stored as naive server-local times, the same way the JSON
+    upload stores epoch ``dt`` values (datetime.fromtimestamp), so a file
+    imported through either path dedupes against the other.
+    """
+    if 'dt' in chunk.columns:
+        seconds = pd.to_numeric(chunk['dt'], errors='coerce')
+        utc = pd.to_datetime(seconds, unit='s', utc=True, errors='coerce')
+    elif 'dt_iso' in chunk.columns:
+        # "2022-01-01 00:00:00 +0000 UTC"
+        utc = pd.to_datetime(chunk['dt_iso'].astype(str).str.slice(0, 25), format='%Y-%m-%d %H:%M:%S %z',
+                             utc=True, errors='coerce')
+    else:
+        raise BulkImportError('Missing timestamp column (dt or dt_iso)')
+    return utc.dt.tz_convert(tz.tzlocal()).dt.tz_localize(None)
+
+def _to_celsius(values: pd.Series, units: str) -> pd.Series:
+    if units == 'imperial':
+        return (values - 32) * 5 / 9
+    if units == 'standard':
+        return values - 273.15
+    return values
+
+def import_openweather_bulk(user_id: int, stream: IO[bytes], location_id: Optional[int] = None,
+                            units: str = 'imperial', file_format: str = 'csv') -> Dict:
+    """Import an OpenWeather History Bulk export (CSV or Parquet).
+
+    Whole columns are parsed, validated and deduplicated at once with pandas,
+    and each chunk's valid rows go to the bulk insert path as one batch. Rows
+    are matched to the user's locations by lat/lon (or city_name) unless
+    ``location_id`` is given. ``errors`` describes the first
+    MAX_REPORTED_ERRORS invalid rows; ``errors_count`` counts all of them.
+    """
+    if units not in ('imperial', 'metric', 'standard'):
+        return {'success': False, 'error': f'Unsupported units: {units}'}
+
+    try:
+        total_records = 0
+        skipped_records = 0
+        errors = []
+        errors_count = 0
+        matched_locations = set()
+        writer = create_weather_writer()
+        location_index = None
+        if location_id is None:
+            location_index = LocationIndex.for_user(user_id, max_distance_km=current_app.config['LOCATION_MATCH_MAX_KM'])
+
+        logger.info("📊 Importing OpenWeather bulk %s export for user %s", file_format, user_id)
+
+        for chunk in _read_chunks(stream, file_format):
+            offset = total_records
+            total_records += len(chunk)
+            if 'temp' not in chunk.columns:
+                raise BulkImportError('Missing temperature column (temp)')
+
+            frame = pd.DataFrame({
+                'recorded_at': _parse_timestamps(chunk),
+                'temperature': _to_celsius(pd.to_numeric(chunk['temp'], errors='coerce'), units),
+            })
+            for source, target in OPTIONAL_COLUMNS.items():
+                frame[target] = pd.to_numeric(chunk[source], errors='coerce') if source in chunk.columns else np.nan
+            frame['description'] = chunk['weather_description'] if 'weather_description' in chunk.columns else 'Historical data'
+            frame['icon'] = chunk['weather_icon'] if 'weather_icon' in chunk.columns else '01d'
+
+            # Resolve locations once per distinct (lat, lon, city) combination
+            if location_id is not None:
+                frame['location_id'] = location_id
+            else:
+                keys = pd.DataFrame({
+                    column: chunk[column] if column in chunk.columns else None for column in LOCATION_COLUMNS
+                })
+                keys['lat'] = pd.to_numeric(keys['lat'], errors='coerce')
+                keys['lon'] = pd.to_numeric(keys['lon'], errors='coerce')
+                # NaN never equals itself, so use None for missing parts of the key
+                keys = keys.astype(object).where(keys.notna(), None)
+                resolved = {}
+                for lat, lon, city in keys.drop_duplicates().itertuples(index=False):
+                    info = {'name': str(city), 'city': str(city)} if city else {}
+                    if lat is not None and lon is not None:
+                        info['latitude'], info['longitude'] = float(lat), float(lon)
+                    location = location_index.match(info) if info else None
+                    resolved[(lat, lon, city)] = location.id if location else np.nan
+                frame['location_id'] = [resolved[key] for key in keys.itertuples(index=False, name=None)]
+
+            # Validate whole columns at once
+            bad_timestamp = frame['recorded_at'].isna().to_numpy()
+            bad_temperature = ~frame['temperature'].between(MIN_TEMPERATURE_C, MAX_TEMPERATURE_C).to_numpy()
+            no_location = frame['location_id'].isna().to_numpy()
+            invalid = bad_timestamp | bad_temperature | no_location
+
+            for position in np.flatnonzero(invalid)[:MAX_REPORTED_ERRORS - len(errors)]:
+                if bad_timestamp[position]:
+                    reason = 'Invalid timestamp'
+                elif bad_temperature[position]:
+                    reason = f"Invalid temperature: {chunk['temp'].iloc[position]}"
+                else:
+                    reason = 'No matching location found'
+                errors.append(f"Record {offset + position}: {reason}")
+            errors_count += int(invalid.sum())
+            skipped_records += int(invalid.sum())
+
+            valid = frame[~invalid].astype({'location_id': int})
+            # Same timestamp twice for a location - keep the first one
+            unique = valid.drop_duplicates(['location_id', 'recorded_at'])
+            skipped_records += len(valid) - len(unique)
+            matched_locations.update(unique['location_id'].unique().tolist())
+
+            rows = unique.astype(object).where(unique.notna(), None)
+            # Plain datetimes; to_pydatetime() returns an array or (pandas 3) a Series with a fresh index
+            recorded_at = np.asarray(unique['recorded_at'].dt.to_pydatetime(), dtype=object)
+            rows['recorded_at'] = pd.Series(recorded_at, index=unique.index, dtype=object)
+            writer.add_many(rows.to_dict('records'))
+
+            logger.info("📦 Parsed %d rows (%d invalid so far)", total_records, errors_count)
+
+        if total_records == 0:
+            db.session.rollback()
+            return {'success': False, 'error': 'No weather records provided'}
+
+        writer.flush()
+        stored_records = writer.stored_records
+        skipped_records += writer.skipped_records
+
+        logger.info("✅ Imported %d of %d records, skipped %d", stored_records, total_records, skipped_records)
+        if errors:
+            logger.warning("⚠️ %d invalid rows, first: %s", errors_count, '; '.join(errors[:5]))
+
+        return {
+            'success': True,
+            'total_records': total_records,
+            'stored_records': stored_records,
+            'skipped_records': skipped_records,
+            'locations_processed': len(matched_locations),
+            'errors': errors,
+            'errors_count': errors_count
+        }
+
+    except BulkImportError as e:
+        db.session.rollback()
+        return {'success': False, 'error': str(e)}
+    except Exception as e:
+        db.session.rollback()
+        return {'success': False, 'error': f'Failed to import historical data: {str(e)}'}
@@ -0,0 +1,528 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import DateTime, Integer, and_, case, cast, func, literal_column, not_, or_, select, true, union_all
+from app import db
+from app.models.location import Location
+from app.models.person import Person
+from app.models.person_location import PersonLocation
+from app.models.weather_record import WeatherRecord
+from app.models.weather_daily_summary import WeatherDailySummary
+from app.services.period_stats_cache import get_period_stats_cache
+
+logger = logging.getLogger(__name__)
+
+# Realistic surface temperature range (Celsius) the people dashboards filter to
+VALID_MIN_C = 0.0
+VALID_MAX_C = 45.0
+
+# First key of the two-key PostgreSQL advisory lock taken per location while its days are recomputed
+ADVISORY_LOCK_NAMESPACE = 1101
+
+AGGREGATE_COLUMNS = (
+    'record_count', 'temperature_min', 'temperature_max', 'temperature_sum',
+    'valid_count', 'valid_min', 'valid_max', 'valid_sum'
+)
+
+def _as_date(value) -> date:
+    # date() returns a date on PostgreSQL and an ISO string on SQLite
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min)
+
+def _day_runs(days: List[date]) -> List[Tuple[date, date]]:
+    """(first, last) of each run of consecutive days in sorted ``days``"""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+def _dialect_name(executor) -> str:
+    bind = executor.get_bind() if hasattr(executor, 'get_bind') else executor
+    return bind.dialect.name
+
+def aggregate_records(executor, location_ids: Iterable[int], period=None) -> Dict[Tuple[int, date], Dict]:
+    """Aggregate raw weather_records per (location, day) in the database.
+
+    ``period`` is an optional SQL condition on recorded_at. Returns one dict
+    per day with AGGREGATE_COLUMNS and ``condition_counts``.
+    """
+    table = WeatherRecord.__table__
+    day = func.date(table.c.recorded_at)
+    valid_temperature = case(
+        (table.c.temperature.between(VALID_MIN_C, VALID_MAX_C), table.c.temperature)
+    )
+    conditions = [table.c.location_id.in_(list(location_ids)), table.c.recorded_at.isnot(None)]
+    if period is not None:
+        conditions.append(period)
+
+    aggregates = {}
+    result = executor.execute(
+        select(
+            table.c.location_id, day,
+            func.count(), func.min(table.c.temperature), func.max(table.c.temperature), func.sum(table.c.temperature),
+            func.count(valid_temperature), func.min(valid_temperature), func.max(valid_temperature), func.sum(valid_temperature)
+        ).where(*conditions).group_by(table.c.location_id, day)
+    )
+    for location_id, day_value, *values in result:
+        aggregate = dict(zip(AGGREGATE_COLUMNS, values))
+        aggregate['condition_counts'] = {}
+        aggregates[(location_id, _as_date(day_value))] = aggregate
+
+    result = executor.execute(
+        select(table.c.location_id, day, table.c.description, func.count())
+        .where(*conditions, table.c.description != '')
+        .group_by(table.c.location_id, day, table.c.description)
+    )
+    for location_id, day_value, description, count in result:
+        aggregates[(location_id, _as_date(day_value))]['condition_counts'][description] = count
+
+    return aggregates
+
+def _update_record_counts(executor, location_ids: Optional[List[int]] = None) -> None:
+    """Set locations.weather_records_count from the rollup and increment weather_version (all locations when ``location_ids`` is None)"""
+    locations = Location.__table__
+    summaries = WeatherDailySummary.__table__
+    total = select(func.coalesce(func.sum(summaries.c.record_count), 0)).where(
+        summaries.c.location_id == locations.c.id
+    ).scalar_subquery()
+    # updated_at is kept as is: the location itself didn't change (and would otherwise get its onupdate)
+    stmt = locations.update().values(
+        weather_records_count=total, weather_version=locations.c.weather_version + 1,
+        updated_at=locations.c.updated_at
+    )
+    if location_ids is not None:
+        stmt = stmt.where(locations.c.id.in_(location_ids))
+    executor.execute(stmt)
+
+def refresh_daily_summaries(executor, keys: Iterable[Tuple[int, datetime]]) -> int:
+    """Recompute the summaries of every (location, day) touched by ``keys``.
+
+    ``keys`` are the (location_id, recorded_at) pairs just inserted; only
+    their days are recomputed, from the raw records, inside the caller's
+    transaction. The locations' weather_records_count follows the rollup and
+    their weather_version is incremented, which is also what moves their
+    owners' cached responses on (see response_cache.versioned_response).
+    Returns the number of days refreshed.
+    """
+    days_by_location = defaultdict(set)
+    for location_id, recorded_at in keys:
+        if recorded_at is not None:
+            days_by_location[location_id].add(recorded_at.date())
+
+    summaries = WeatherDailySummary.__table__
+    table = WeatherRecord.__table__
+    is_postgresql = _dialect_name(executor) == 'postgresql'
+
+    for location_id, days in days_by_location.items():
+        if is_postgresql:
+            # Serialize concurrent refreshes of one location; the second one
+            # then recomputes after the first commits and sees its rows too
+            executor.execute(select(func.pg_advisory_xact_lock(ADVISORY_LOCK_NAMESPACE, location_id)))
+
+        day_list = sorted(days)
+        # Only the touched days: one range per run of consecutive days, so a batch
+        # spanning years doesn't rescan everything in between
+        period = or_(*(
+            and_(table.c.recorded_at >= _midnight(first), table.c.recorded_at < _midnight(last + timedelta(days=1)))
+            for first, last in _day_runs(day_list)
+        ))
+        aggregates = aggregate_records(executor, [location_id], period)
+
+        executor.execute(summaries.delete().where(
+            summaries.c.location_id == location_id, summaries.c.day.in_(day_list)
+        ))
+        rows = [
+            dict(aggregate, location_id=location_id, day=day, updated_at=datetime.utcnow())
+            for (_, day), aggregate in aggregates.items()
+        ]
+        if rows:
+            executor.execute(summaries.insert(), rows)
+        _update_record_counts(executor, [location_id])
+
+    return sum(len(days) for days in days_by_location.values())
+
+def rebuild_daily_summaries(executor, location_ids: Optional[List[int]] = None) -> int:
+    """Recompute all summaries (or those of ``location_ids``) and the record counts from weather_records"""
+    summaries = WeatherDailySummary.__table__
+    rebuild_all = location_ids is None
+    if rebuild_all:
+        location_ids = [row[0] for row in executor.execute(select(WeatherRecord.location_id).distinct())]
+        executor.execute(summaries.delete())
+    else:
+        executor.execute(summaries.delete().where(summaries.c.location_id.in_(location_ids)))
+
+    total = 0
+    for location_id in location_ids:
+        rows = [
+            dict(aggregate, location_id=location_id, day=day, updated_at=datetime.utcnow())
+            for (_, day), aggregate in aggregate_records(executor, [location_id]).items()
+        ]
+        if rows:
+            executor.execute(summaries.insert(), rows)
+        total += len(rows)
+        logger.info("📅 Rebuilt %d daily summaries for location %s", len(rows), location_id)
+
+    # Rebuilding everything updates every location: records may have been removed from any of them
+    _update_record_counts(executor, None if rebuild_all else location_ids)
+    return total
+
+def _range_parts(start: Optional[datetime], end: Optional[datetime]):
+    """Split start <= recorded_at <= end into the part served by the rollup and the rest.
+
+    Returns ``(day_conditions, raw_condition)``: conditions on
+    weather_daily_summaries.day selecting the days that lie completely inside
+    the range, and a condition on weather_records.recorded_at for the partial
+    days at either edge. Either is None when that part is empty. ``None``
+    bounds are open.
+    """
+    table = WeatherRecord.__table__
+    summaries = WeatherDailySummary.__table__
+
+    first_full = None
+    if start is not None:
+        first_full = start.date() if start == _midnight(start.date()) else start.date() + timedelta(days=1)
+    last_full = end.date() - timedelta(days=1) if end is not None else None
+
+    raw_bounds = [table.c.recorded_at.isnot(None)]
+    if start is not None:
+        raw_bounds.append(table.c.recorded_at >= start)
+    if end is not None:
+        raw_bounds.append(table.c.recorded_at <= end)
+
+    if first_full is not None and last_full is not None and first_full > last_full:
+        # No complete day in the range
+        return None, and_(*raw_bounds)
+
+    day_conditions = []
+    full_days = []
+    if first_full is not None:
+        day_conditions.append(summaries.c.day >= first_full)
+        full_days.append(table.c.recorded_at >= _midnight(first_full))
+    if last_full is not None:
+        day_conditions.append(summaries.c.day <= last_full)
+        full_days.append(table.c.recorded_at < _midnight(last_full + timedelta(days=1)))
+
+    if not full_days:
+        # Unbounded range: every day comes from the rollup
+        return day_conditions, None
+    return day_conditions, and_(*raw_bounds, not_(and_(*full_days)))
+
+def daily_aggregates(location_ids: Iterable[int], start: datetime,
+                     end: Optional[datetime] = None) -> Dict[Tuple[int, date], Dict]:
+    """Per (location, day) aggregates of the records with start <= recorded_at <= end.
+
+    Days that lie completely inside the range come from the rollup table;
+    only the partial days at either edge are aggregated from raw records.
+    ``end=None`` means no upper bound.
+    """
+    location_ids = list(location_ids)
+    if not location_ids:
+        return {}
+
+    summaries = WeatherDailySummary.__table__
+    day_conditions, raw_condition = _range_parts(start, end)
+
+    aggregates = {}
+    if day_conditions is not None:
+        result = db.session.execute(
+            select(summaries.c.location_id, summaries.c.day, summaries.c.condition_counts,
+                   *(summaries.c[column] for column in AGGREGATE_COLUMNS))
+            .where(summaries.c.location_id.in_(location_ids), *day_conditions)
+        )
+        for location_id, day, condition_counts, *values in result:
+            aggregate = dict(zip(AGGREGATE_COLUMNS, values))
+            aggregate['condition_counts'] = condition_counts or {}
+            aggregates[(location_id, _as_date(day))] = aggregate
+
+    if raw_condition is not None:
+        aggregates.update(aggregate_records(db.session, location_ids, raw_condition))
+
+    return aggregates
+
+def valid_temperature_extremes(location_ids: Iterable[int]) -> Dict[int, Tuple[float, float]]:
+    """{location_id: (highest, lowest)} within the realistic 0-45 °C range, from one grouped query.
+
+    Locations without any realistic reading are left out.
+    """
+    location_ids = list(location_ids)
+    if not location_ids:
+        return {}
+
+    summaries = WeatherDailySummary.__table__
+    result = db.session.execute(
+        select(summaries.c.location_id, func.max(summaries.c.valid_max), func.min(summaries.c.valid_min))
+        .where(summaries.c.location_id.in_(location_ids), summaries.c.valid_count > 0)
+        .group_by(summaries.c.location_id)
+    )
+    return {location_id: (highest, lowest) for location_id, highest, lowest in result}
+
+def _shift_date(column, days: int):
+    """SQL date ``column`` + ``days``, comparable with weather_daily_summaries.day"""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        return func.date(column, f'{days:+d} days')
+    return column + days
+
+def _midnight_after(column, days: int):
+    """Midnight of SQL date ``column`` + ``days``, comparable for equality with recorded_at"""
+    if db.session.get_bind().dialect.name == 'sqlite':
+        # SQLite stores DateTime as 'YYYY-MM-DD HH:MM:SS.ffffff'; %f only has milliseconds
+        return func.strftime('%Y-%m-%d %H:%M:%f', column, f'{days:+d} days') + '000'
+    return cast(column + days, DateTime)
+
+def visit_window_temperatures(user_id: int, days: int = 7):
+    """Per-person realistic (0-45 °C) temperatures around every visit, as one SQL subquery.
+
+    Each visit covers start_date - ``days`` at midnight up to and including
+    start_date + ``days`` at midnight: the whole days come from the rollup and
+    the closing midnight reading from weather_records. Visits are reduced to
+    their min, max and mean, and people to the max and min of their visits
+    and the mean of the visit means. Columns: person_id, highest_temp,
+    lowest_temp, avg_temp; people without realistic readings are absent.
+    """
+    visits_table = PersonLocation.__table__
+    people = Person.__table__
+    summaries = WeatherDailySummary.__table__
+    table = WeatherRecord.__table__
+
+    visits = (
+        select(
+            visits_table.c.id.label('visit_id'),
+            visits_table.c.person_id,
+            visits_table.c.location_id,
+            _shift_date(visits_table.c.start_date, -days).label('first_day'),
+            _shift_date(visits_table.c.start_date, days - 1).label('last_day'),
+            _midnight_after(visits_table.c.start_date, days).label('closing_time')
+        )
+        .join(people, people.c.id == visits_table.c.person_id)
+        .where(people.c.user_id == user_id)
+        .cte('visits')
+    )
+
+    valid_temperature = case((table.c.temperature.between(VALID_MIN_C, VALID_MAX_C), table.c.temperature))
+    readings = union_all(
+        select(visits.c.visit_id, visits.c.person_id, summaries.c.valid_count,
+               summaries.c.valid_min, summaries.c.valid_max, summaries.c.valid_sum)
+        .join(summaries, and_(
+            summaries.c.location_id == visits.c.location_id,
+            summaries.c.day >= visits.c.first_day,
+            summaries.c.day <= visits.c.last_day
+        )),
+        select(visits.c.visit_id, visits.c.person_id, func.count(valid_temperature).label('valid_count'),
+               func.min(valid_temperature).label('valid_min'), func.max(valid_temperature).label('valid_max'),
+               func.sum(valid_temperature).label('valid_sum'))
+        .join(table, and_(
+            table.c.location_id == visits.c.location_id,
+            table.c.recorded_at == visits.c.closing_time
+        ))
+        .group_by(visits.c.visit_id, visits.c.person_id)
+    ).subquery()
+
+    per_visit = (
+        select(
+            readings.c.person_id,
+            func.max(readings.c.valid_max).label('highest_temp'),
+            func.min(readings.c.valid_min).label('lowest_temp'),
+            (func.sum(readings.c.valid_sum) / func.sum(readings.c.valid_count)).label('avg_temp')
+        )
+        .group_by(readings.c.visit_id, readings.c.person_id)
+        .having(func.sum(readings.c.valid_count) > 0)
+        .subquery()
+    )
+
+    return (
+        select(
+            per_visit.c.person_id,
+            func.max(per_visit.c.highest_temp).label('highest_temp'),
+            func.min(per_visit.c.lowest_temp).label('lowest_temp'),
+            func.avg(per_visit.c.avg_temp).label('avg_temp')
+        )
+        .group_by(per_visit.c.person_id)
+        .subquery()
+    )
+
+# A period window: (location_id, start, end); None bounds are open
+Window = Tuple[int, Optional[datetime], Optional[datetime]]
+
+def _window_label(index: int):
+    # Inlined so every UNION ALL branch carries a plain integer column
+    return literal_column(str(int(index)), Integer).label('window_index')
+
+def period_totals(windows: List[Window], fahrenheit: bool = False) -> List[Dict]:
+    """Count, average, min and max temperature and days with data per window, in one query.
+
+    Whole days are summed from the rollup and the partial edge days from raw
+    records; the database does all of the arithmetic, including the
+    Fahrenheit conversion, so memory use doesn't depend on the range size.
+    Results are in the order of ``windows``.
+    """
+    table = WeatherRecord.__table__
+    summaries = WeatherDailySummary.__table__
+
+    parts = []
+    for index, (location_id, start, end) in enumerate(windows):
+        day_conditions, raw_condition = _range_parts(start, end)
+        if day_conditions is not None:
+            parts.append(
+                select(_window_label(index), summaries.c.day.label('day'), summaries.c.record_count,
+                       summaries.c.temperature_sum, summaries.c.temperature_min, summaries.c.temperature_max)
+                .where(summaries.c.location_id == location_id, *day_conditions)
+            )
+        if raw_condition is not None:
+            day = func.date(table.c.recorded_at)
+            parts.append(
+                select(_window_label(index), day.label('day'), func.count().label('record_count'),
+                       func.sum(table.c.temperature).label('temperature_sum'),
+                       func.min(table.c.temperature).label('temperature_min'),
+                       func.max(table.c.temperature).label('temperature_max'))
+                .where(table.c.location_id == location_id, raw_condition)
+                .group_by(day)
+            )
+
+    totals = [
+        {'record_count': 0, 'days_with_data': 0, 'average_temperature': None,
+         'lowest_temperature': None, 'highest_temperature': None}
+        for _ in windows
+    ]
+    if not parts:
+        return totals
+
+    days = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+    convert = (lambda celsius: celsius * 9 / 5 + 32) if fahrenheit else (lambda celsius: celsius)
+    result = db.session.execute(
+        select(
+            days.c.window_index,
+            func.sum(days.c.record_count),
+            func.count(func.distinct(days.c.day)),
+            convert(func.sum(days.c.temperature_sum) / func.sum(days.c.record_count)),
+            convert(func.min(days.c.temperature_min)),
+            convert(func.max(days.c.temperature_max))
+        ).group_by(days.c.window_index)
+    )
+    for index, record_count, days_with_data, average, lowest, highest in result:
+        totals[index] = {
+            # SUM over integer and bigint branches is numeric (a Decimal) on PostgreSQL
+            'record_count': int(record_count or 0),
+            'days_with_data': days_with_data,
+            'average_temperature': average,
+            'lowest_temperature': lowest,
+            'highest_temperature': highest
+        }
+    return totals
+
+def _condition_counts_table(column):
+    """condition_counts expanded into (key, value) rows; the function name differs per dialect"""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.json_each_text(column).table_valued('key', 'value')
+    return func.json_each(column).table_valued('key', 'value')
+
+def period_top_conditions(windows: List[Window], limit: int = 3) -> List[List[Tuple[str, int]]]:
+    """Most common weather descriptions per window, counted and ranked in the database"""
+    table = WeatherRecord.__table__
+    summaries = WeatherDailySummary.__table__
+
+    parts = []
+    for index, (location_id, start, end) in enumerate(windows):
+        day_conditions, raw_condition = _range_parts(start, end)
+        if day_conditions is not None:
+            counts = _condition_counts_table(summaries.c.condition_counts)
+            parts.append(
+                select(_window_label(index), counts.c.key.label('description'),
+                       cast(counts.c.value, Integer).label('record_count'))
+                .select_from(summaries.join(counts, true()))
+                .where(summaries.c.location_id == location_id, *day_conditions)
+            )
+        if raw_condition is not None:
+            parts.append(
+                select(_window_label(index), table.c.description.label('description'),
+                       func.count().label('record_count'))
+                .where(table.c.location_id == location_id, raw_condition, table.c.description != '')
+                .group_by(table.c.description)
+            )
+
+    top_conditions = [[] for _ in windows]
+    if not parts:
+        return top_conditions
+
+    conditions = (union_all(*parts) if len(parts) > 1 else parts[0]).subquery()
+    total = func.sum(conditions.c.record_count)
+    ranked = select(
+        conditions.c.window_index, conditions.c.description, total.label('total'),
+        func.row_number().over(
+            partition_by=conditions.c.window_index, order_by=(total.desc(), conditions.c.description)
+        ).label('condition_rank')
+    ).group_by(conditions.c.window_index, conditions.c.description).subquery()
+
+    result = db.session.execute(
+        select(ranked.c.window_index, ranked.c.description, ranked.c.total)
+        .where(ranked.c.condition_rank <= limit)
+        .order_by(ranked.c.window_index, ranked.c.condition_rank)
+    )
+    for index, description, count in result:
+        top_conditions[index].append((description, int(count)))
+    return top_conditions
+
+def _window_signatures(windows: List[Window]) -> List[Tuple]:
+    """What each window's rollup rows look like now, in one query: (days, records, last refresh).
+
+    Every insert path refreshes the rollup rows of the days it touched (and
+    rebuilds rewrite them), so the signature of a window changes exactly
+    when records inside it are added or removed, and never for writes to
+    other days of the same location. Partial edge days count as whole days.
+    """
+    summaries = WeatherDailySummary.__table__
+    parts = []
+    for index, (location_id, start, end) in enumerate(windows):
+        conditions = [summaries.c.location_id == location_id]
+        if start is not None:
+            conditions.append(summaries.c.day >= start.date())
+        if end is not None:
+            conditions.append(summaries.c.day <= end.date())
+        parts.append(
+            select(_window_label(index), func.count().label('days'),
+                   func.coalesce(func.sum(summaries.c.record_count), 0).label('records'),
+                   func.max(summaries.c.updated_at).label('refreshed_at'))
+            .where(*conditions)
+        )
+
+    signatures = [(0, 0, None) for _ in windows]
+    if not parts:
+        return signatures
+    for index, days, records, refreshed_at in db.session.execute(union_all(*parts) if len(parts) > 1 else parts[0]):
+        signatures[index] = (days, int(records), refreshed_at)
+    return signatures
+
+def cached_period_stats(windows: List[Window], fahrenheit: bool = False) -> Tuple[List[Dict], List[List[Tuple[str, int]]]]:
+    """period_totals() and period_top_conditions() of ``windows``, through the period stats cache.
+
+    Each entry is stored with its window's rollup signature (_window_signatures),
+    read first with one small query, and only served while that still
+    matches: a write by any worker inside the window changes it and the
+    outdated entry is dropped, while writes to other days leave it alone. The
+    signature is read before the aggregates, so an entry never claims older
+    data than it was computed from. Only the windows missing from the cache
+    are queried, together; windows without records skip the conditions query.
+    """
+    cache = get_period_stats_cache()
+    signatures = _window_signatures(windows)
+    keys = [(location_id, start, end, fahrenheit) for location_id, start, end in windows]
+    results = []
+    for key, signature in zip(keys, signatures):
+        cached = cache.get(key, is_current=lambda entry: entry[0] == signature)
+        results.append(cached[1] if cached is not None else None)
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        totals = period_totals([windows[i] for i in missing], fahrenheit)
+        with_records = [i for i, window_totals in zip(missing, totals) if window_totals['record_count']]
+        conditions = dict(zip(with_records, period_top_conditions([windows[i] for i in with_records])))
+        for i, window_totals in zip(missing, totals):
+            results[i] = (window_totals, conditions.get(i, []))
+            cache.set(keys[i], (signatures[i], results[i]))
+
+    return [dict(window_totals) for window_totals, _ in results], [list(top) for _, top in results]
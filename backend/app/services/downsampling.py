@@ -0,0 +1,74 @@
+import re
+from typing import Dict
+import numpy as np
+
+# Accepted bucket units for ?bucket=, e.g. "900", "15m", "1h", "1d"
+BUCKET_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_bucket(value: str) -> int:
+    """Bucket width in seconds from "900", "15m", "1h" or "1d"; raises ValueError when malformed"""
+    match = re.fullmatch(r'(\d+)([smhd]?)', value.strip().lower())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f'Invalid bucket: {value}')
+    return int(match.group(1)) * BUCKET_UNITS[match.group(2)]
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of ``points`` samples that keep the series' shape.
+
+    ``x`` must be ascending. The first and last samples are always kept; from
+    each of the ``points - 2`` buckets in between, the sample forming the
+    largest triangle with the previous pick and the next bucket's average.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+
+    # Bucket i covers samples edges[i]:edges[i + 1]; first and last sample stay on their own
+    edges = (np.arange(points - 1) * (n - 2) / (points - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(edges)
+    average_x = np.add.reduceat(x[:-1], edges[:-1]) / sizes
+    average_y = np.add.reduceat(y[:-1], edges[:-1]) / sizes
+    # The point after the last bucket is the final sample itself
+    next_x = np.append(average_x[1:], x[-1])
+    next_y = np.append(average_y[1:], y[-1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(points - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the triangle areas for every candidate in the bucket at once
+        areas = np.abs(
+            (x[previous] - next_x[i]) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y[i] - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+def bucket_aggregates(x: np.ndarray, y: np.ndarray, bucket_seconds: int) -> Dict[str, np.ndarray]:
+    """Count, min, mean and max of ``y`` per fixed-width time bucket.
+
+    ``x`` are ascending epoch seconds; buckets are aligned to the epoch, so
+    day buckets start at midnight. Empty buckets are left out.
+    """
+    if len(x) == 0:
+        empty = np.empty(0)
+        return {'start': empty.astype(np.int64), 'count': empty.astype(np.int64),
+                'min': empty, 'avg': empty, 'max': empty}
+
+    keys = (x // bucket_seconds) * bucket_seconds
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(keys)) + 1))
+    counts = np.diff(np.append(starts, len(x)))
+    return {
+        'start': keys[starts],
+        'count': counts,
+        'min': np.minimum.reduceat(y, starts),
+        'avg': np.add.reduceat(y, starts) / counts,
+        'max': np.maximum.reduceat(y, starts),
+    }
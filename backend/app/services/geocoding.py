@@ -1,7 +1,10 @@
 import requests
 import os
+import logging
 from typing import Optional, Tuple
 
+logger = logging.getLogger(__name__)
+
 class GeocodingService:
     def __init__(self):
         self.api_key = os.environ.get('GOOGLE_MAPS_API_KEY')
@@ -28,17 +31,17 @@ class GeocodingService:
                 location = data['results'][0]['geometry']['location']
                 return (location['lat'], location['lng'])
             elif data['status'] == 'ZERO_RESULTS':
-                print(f"No results found for: {location_name}")
+                logger.info("No results found for: %s", location_name)
                 return None
             else:
-                print(f"Google Geocoding API error: {data['status']}")
+                logger.error("Google Geocoding API error: %s", data['status'])
                 return self._get_mock_coordinates(location_name)
             
         except requests.RequestException as e:
-            print(f"Google Geocoding API request error: {e}")
+            logger.error("Google Geocoding API request error: %s", e)
             return self._get_mock_coordinates(location_name)
         except Exception as e:
-            print(f"Unexpected error in Google geocoding service: {e}")
+            logger.exception("Unexpected error in Google geocoding service: %s", e)
             return self._get_mock_coordinates(location_name)
     
     def get_location_name(self, lat: float, lon: float) -> Optional[str]:
@@ -66,10 +69,10 @@ class GeocodingService:
             return None
             
         except requests.RequestException as e:
-            print(f"Google Reverse Geocoding API error: {e}")
+            logger.error("Google Reverse Geocoding API error: %s", e)
             return self._get_mock_location_name(lat, lon)
         except Exception as e:
-            print(f"Unexpected error in Google reverse geocoding service: {e}")
+            logger.exception("Unexpected error in Google reverse geocoding service: %s", e)
             return self._get_mock_location_name(lat, lon)
     
     def _get_mock_coordinates(self, location_name: str) -> Tuple[float, float]:
@@ -0,0 +1,97 @@
+import codecs
+import json
+from typing import IO, Any, Iterator
+
+# Bytes read from the request body per iteration
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Largest single array element we are willing to buffer while waiting for it to complete
+MAX_ELEMENT_SIZE = 1024 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+class JSONArrayExpected(ValueError):
+    """Raised when the document is valid so far but is not a top-level JSON array"""
+
+def iter_json_array(stream: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array as they are read from a binary stream.
+
+    Only the current element and one chunk of input are held in memory, so
+    uploads of any size are parsed in bounded memory and callers can start
+    working on the first records before the rest of the body has arrived.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            buffer = buffer[pos:] + text_decoder.decode(b'', final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        """Advance to the next significant character, reading more input as needed"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not fill():
+                return False
+
+    if not skip_whitespace():
+        raise json.JSONDecodeError('Expecting value', buffer, pos)
+    if buffer[pos] != '[':
+        raise JSONArrayExpected('JSON data must be a list of weather records')
+    pos += 1
+
+    expect_value = True
+    first = True
+    while True:
+        if not skip_whitespace():
+            raise json.JSONDecodeError("Expecting ',' delimiter or ']'", buffer, pos)
+
+        char = buffer[pos]
+        if char == ']' and (first or not expect_value):
+            pos += 1
+            break
+        if not expect_value:
+            if char != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            pos += 1
+            expect_value = True
+            continue
+
+        # Decode the next element. A value that ends exactly at the end of the
+        # buffer might be a truncated number or literal, so only accept it once
+        # a following character (or the end of input) has been seen.
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                if len(buffer) - pos > MAX_ELEMENT_SIZE:
+                    raise json.JSONDecodeError('Array element is too large or malformed', buffer, pos)
+            fill()
+
+        pos = end
+        first = False
+        expect_value = False
+        yield value
+
+    if skip_whitespace():
+        raise json.JSONDecodeError('Extra data', buffer, pos)
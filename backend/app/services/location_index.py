@@ -0,0 +1,152 @@
+import math
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from app.models.location import Location
+
+EARTH_RADIUS_KM = 6371.0
+
+# Matches the loosest tolerance the old bounding-box search used (±1°, ~111 km)
+DEFAULT_MAX_DISTANCE_KM = 111.0
+
+# Grid cell size in degrees; a user's locations are sparse so coarse cells are fine
+CELL_SIZE_DEG = 1.0
+
+# Positions of the normalized fields stored per location
+_NAME, _CITY, _ADDRESS = 0, 1, 2
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def normalize_name(value: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse whitespace so 'São  Paulo' matches 'sao paulo'"""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', value)
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch))
+    return ' '.join(value.lower().split())
+
+class LocationIndex:
+    """In-memory index of one user's locations for matching uploaded records.
+
+    Built once per upload: coordinates go into a lat/lon grid for nearest
+    neighbour lookups, and normalized names and cities into lookup tables.
+    After construction no matching step touches the database.
+    """
+
+    def __init__(self, locations: List[Location], max_distance_km: float = DEFAULT_MAX_DISTANCE_KM):
+        self.max_distance_km = max_distance_km
+        # Keep id order so ties resolve the same way on every upload
+        self.locations = sorted(locations, key=lambda loc: loc.id)
+        self._grid: Dict[Tuple[int, int], List[Location]] = defaultdict(list)
+        self._by_name: Dict[str, List[Location]] = defaultdict(list)
+        self._by_city: Dict[str, List[Location]] = defaultdict(list)
+        self._normalized: Dict[int, Tuple[str, str, str]] = {}
+
+        for location in self.locations:
+            if location.latitude is not None and location.longitude is not None:
+                self._grid[self._cell(location.latitude, location.longitude)].append(location)
+            name, city, address = normalize_name(location.name), normalize_name(location.city), normalize_name(location.address)
+            self._normalized[location.id] = (name, city, address)
+            self._by_name[name].append(location)
+            self._by_city[city].append(location)
+
+    @classmethod
+    def for_user(cls, user_id: int, max_distance_km: float = DEFAULT_MAX_DISTANCE_KM) -> 'LocationIndex':
+        """Load all of a user's locations with a single query"""
+        return cls(Location.query.filter_by(user_id=user_id).all(), max_distance_km)
+
+    @staticmethod
+    def _cell(lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / CELL_SIZE_DEG), math.floor(lon / CELL_SIZE_DEG))
+
+    def nearest(self, lat: float, lon: float) -> Optional[Tuple[Location, float]]:
+        """Closest location within max_distance_km, as (location, distance_km)"""
+        # Only visit the cells that can hold a point within the distance limit
+        lat_cells = math.ceil(self.max_distance_km / 111.0 / CELL_SIZE_DEG)
+        lon_scale = max(math.cos(math.radians(min(abs(lat) + lat_cells * CELL_SIZE_DEG, 89.0))), 0.01)
+        lon_cells = min(math.ceil(self.max_distance_km / (111.0 * lon_scale) / CELL_SIZE_DEG), int(180 / CELL_SIZE_DEG))
+
+        center_lat, center_lon = self._cell(lat, lon)
+        lon_cell_count = int(360 / CELL_SIZE_DEG)
+        best = None
+        best_distance = self.max_distance_km
+
+        for dlat in range(-lat_cells, lat_cells + 1):
+            for dlon in range(-lon_cells, lon_cells + 1):
+                # Wrap around the antimeridian
+                cell_lon = (center_lon + dlon + lon_cell_count // 2) % lon_cell_count - lon_cell_count // 2
+                for location in self._grid.get((center_lat + dlat, cell_lon), ()):
+                    distance = haversine_km(lat, lon, location.latitude, location.longitude)
+                    if distance > self.max_distance_km:
+                        continue
+                    if best is None or distance < best_distance or (distance == best_distance and location.id < best.id):
+                        best, best_distance = location, distance
+
+        return (best, best_distance) if best else None
+
+    def _contains(self, field: int, needle: str) -> Optional[Location]:
+        """First location whose normalized field contains needle (the old ILIKE '%needle%')"""
+        for location in self.locations:
+            if needle in self._normalized[location.id][field]:
+                return location
+        return None
+
+    def _contains_any_part(self, field: int, value: str) -> Optional[Location]:
+        for part in value.split():
+            if len(part) > 2:  # Only try parts longer than 2 characters
+                location = self._contains(field, part)
+                if location:
+                    return location
+        return None
+
+    def _contains_name_and_city(self, name: str, city: str) -> Optional[Location]:
+        for location in self.locations:
+            loc_name, loc_city, _ = self._normalized[location.id]
+            if name in loc_name and city in loc_city:
+                return location
+        return None
+
+    def match(self, location_info: Dict) -> Optional[Location]:
+        """Find the location an uploaded record belongs to.
+
+        Tries, in order: nearest coordinates, name + city, name, city and
+        finally an address containing the city - the same cascade as the old
+        per-record SQL queries, but answered from memory.
+        """
+        if location_info.get('latitude') is not None and location_info.get('longitude') is not None:
+            found = self.nearest(location_info['latitude'], location_info['longitude'])
+            if found:
+                return found[0]
+
+        name = normalize_name(location_info.get('name'))
+        city = normalize_name(location_info.get('city'))
+
+        if name and city:
+            for location in self._by_name.get(name, ()):
+                if self._normalized[location.id][_CITY] == city:
+                    return location
+            location = self._contains_name_and_city(name, city)
+            if location:
+                return location
+            location = self._by_city.get(city, [None])[0] or self._contains(_CITY, city)
+            if location:
+                return location
+
+        if name:
+            location = self._by_name.get(name, [None])[0] or self._contains(_NAME, name) or self._contains_any_part(_NAME, name)
+            if location:
+                return location
+
+        if city:
+            location = (self._by_city.get(city, [None])[0] or self._contains(_CITY, city)
+                        or self._contains_any_part(_CITY, city) or self._contains(_ADDRESS, city))
+            if location:
+                return location
+
+        return None
@@ -0,0 +1,26 @@
+import threading
+from typing import Optional
+from flask import current_app
+from app.services.lru_cache import LRUCache
+
+DEFAULT_PERIOD_STATS_CACHE_SIZE = 2048
+DEFAULT_PERIOD_STATS_CACHE_TTL = 3600
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+def get_period_stats_cache() -> LRUCache:
+    """This process's LRU of period statistics (see daily_summaries.cached_period_stats).
+
+    Entries carry the rollup signature of their window and are recomputed
+    once it no longer matches the database, whichever worker made the write;
+    the TTL only bounds how long windows nobody asks for again take up room.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LRUCache(
+                current_app.config.get('PERIOD_STATS_CACHE_SIZE', DEFAULT_PERIOD_STATS_CACHE_SIZE),
+                current_app.config.get('PERIOD_STATS_CACHE_TTL', DEFAULT_PERIOD_STATS_CACHE_TTL)
+            )
+        return _cache
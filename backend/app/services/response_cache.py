@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from functools import wraps
+from itertools import chain
+from typing import Callable, Iterable, Optional
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models.user import User
+from app.models.location import Location
+from app.models.person import Person
+from app.models.person_location import PersonLocation
+from app.models.weather_record import WeatherRecord
+from app.services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+
+def bump_data_version(executor, user_ids: Iterable[int] = (), location_ids: Iterable[int] = (),
+                      person_ids: Iterable[int] = ()) -> None:
+    """Increment users.data_version for the given users and the owners of the given locations/people.
+
+    Runs inside the caller's transaction, so the bump commits (or rolls back)
+    together with the write it stands for. Bulk weather writes don't call it:
+    they increment locations.weather_version instead, which the response
+    version includes, so parallel ingest batches never contend on a users row.
+    """
+    user_ids, location_ids, person_ids = set(user_ids), set(location_ids), set(person_ids)
+    conditions = []
+    users = User.__table__
+    if user_ids:
+        conditions.append(users.c.id.in_(user_ids))
+    if location_ids:
+        conditions.append(users.c.id.in_(select(Location.user_id).where(Location.id.in_(location_ids))))
+    if person_ids:
+        conditions.append(users.c.id.in_(select(Person.user_id).where(Person.id.in_(person_ids))))
+    if not conditions:
+        return
+    # updated_at is kept as is: the account itself didn't change
+    executor.execute(users.update().where(or_(*conditions)).values(
+        data_version=users.c.data_version + 1, updated_at=users.c.updated_at
+    ))
+
+def _bump_on_flush(session, flush_context, instances):
+    """Bump the owners' data version for every location, person, visit or weather record being written"""
+    user_ids, location_ids, person_ids = set(), set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Location, Person)):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, PersonLocation):
+            person_ids.add(obj.person_id)
+        elif isinstance(obj, WeatherRecord):
+            location_ids.add(obj.location_id)
+    user_ids.discard(None)
+    location_ids.discard(None)
+    person_ids.discard(None)
+    if user_ids or location_ids or person_ids:
+        bump_data_version(session.connection(), user_ids, location_ids, person_ids)
+
+def register_data_version_hooks() -> None:
+    """Bump data versions on ORM flushes (Core weather writes bump locations.weather_version instead)"""
+    if not event.contains(Session, 'before_flush', _bump_on_flush):
+        event.listen(Session, 'before_flush', _bump_on_flush)
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+def _get_cache() -> LRUCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LRUCache(current_app.config.get('RESPONSE_CACHE_SIZE', DEFAULT_RESPONSE_CACHE_SIZE))
+        return _cache
+
+def versioned_response(view: Callable) -> Callable:
+    """Serve a per-user GET endpoint from cache, with an ETag and 304 on If-None-Match.
+
+    Goes below ``@jwt_required()``. The ETag covers the user's data version
+    and the sum of their locations' weather versions, the request path and query string, and the UTC date (responses like
+    days_alive or the last-7-days trend change with the day, not the data).
+    Only 200 responses are cached.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = get_jwt_identity()
+        weather_version = select(func.coalesce(func.sum(Location.weather_version), 0)).where(
+            Location.user_id == User.id
+        ).scalar_subquery()
+        row = db.session.execute(
+            select(User.data_version, weather_version).where(User.id == int(user_id))
+        ).first()
+        if row is None:
+            return view(*args, **kwargs)
+        # data_version moves on every ORM write (including location deletes, which lower the sum)
+        version = f"{row[0]}.{row[1]}"
+
+        key = f"{view.__module__}.{view.__name__}:{user_id}:{version}:{datetime.utcnow().date()}:{request.full_path}"
+        etag = hashlib.sha1(key.encode()).hexdigest()
+        # Weak comparison: compression (app/compression.py) sends the ETag as W/"..."
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            cache = _get_cache()
+            cached = cache.get(etag)
+            if cached is not None:
+                body, mimetype = cached
+                response = current_app.response_class(body, mimetype=mimetype)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                cache.set(etag, (response.get_data(), response.mimetype))
+
+        response.set_etag(etag)
+        # Cached per user; the browser must revalidate each time (which is cheap)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    return wrapper
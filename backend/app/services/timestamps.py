@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+def _parse_epoch(value: Any) -> datetime:
+    return datetime.fromtimestamp(int(value))
+
+def _parse_iso(value: Any) -> datetime:
+    if value.endswith('Z'):
+        value = value[:-1]
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        # Stored timestamps are naive UTC
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def _parse_month_day_year(value: Any) -> datetime:
+    # 01/15/2024 - fixed-width slicing instead of strptime
+    if len(value) != 10 or value[2] != '/' or value[5] != '/':
+        raise ValueError(value)
+    return datetime(int(value[6:10]), int(value[0:2]), int(value[3:5]))
+
+def _parse_day_month_year(value: Any) -> datetime:
+    # 15/01/2024
+    if len(value) != 10 or value[2] != '/' or value[5] != '/':
+        raise ValueError(value)
+    return datetime(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+
+# Candidate formats in the order the general parser tries them, so the
+# format locked in for a file is the one the general parser would have picked
+FAST_PARSERS = (
+    ('epoch', _parse_epoch),
+    ('iso', _parse_iso),
+    ('month_day_year', _parse_month_day_year),
+    ('day_month_year', _parse_day_month_year),
+)
+
+class TimestampParser:
+    """Parse the timestamps of one uploaded file.
+
+    Almost every file uses a single timestamp format, so the format of the
+    first parseable value is locked in and every later value goes straight to
+    that format's parser, without strptime. Values the locked-in parser
+    rejects are handed to ``fallback`` (the general multi-format parser) and
+    counted in ``fallbacks``.
+    """
+
+    def __init__(self, fallback: Callable[[Any], Optional[datetime]]):
+        self.fallback = fallback
+        self.format_name: Optional[str] = None
+        self.fallbacks = 0
+        self._fast: Optional[Callable[[Any], datetime]] = None
+
+    def parse(self, value: Any) -> Optional[datetime]:
+        if self._fast is not None:
+            try:
+                return self._fast(value)
+            except (ValueError, TypeError, OverflowError, OSError, AttributeError):
+                self.fallbacks += 1
+                return self.fallback(value)
+
+        # Still sniffing: lock in the first fast parser that accepts the value
+        for name, parser in FAST_PARSERS:
+            try:
+                parsed = parser(value)
+            except (ValueError, TypeError, OverflowError, OSError, AttributeError):
+                continue
+            self.format_name = name
+            self._fast = parser
+            return parsed
+
+        return self.fallback(value)
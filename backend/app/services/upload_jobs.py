@@ -0,0 +1,122 @@
+import logging
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import IO, Callable, Dict, Optional
+from flask import current_app
+from app import db
+from app.models.upload_job import UploadJob
+from app.services.json_stream import iter_json_array
+
+logger = logging.getLogger(__name__)
+
+class UploadJobQueueFull(Exception):
+    """Raised when the background pool already has the maximum number of pending uploads"""
+
+class UploadJobRunner:
+    """Run historical uploads on a bounded background thread pool.
+
+    The request body is spooled to a temporary file so the HTTP request can
+    return immediately; progress is written to the ``upload_jobs`` table after
+    every inserted batch so any app worker can answer status requests. For
+    multi-location uploads loaded in parallel, progress is committed just
+    after each batch rather than with it (see PartitionedWeatherWriter), so a
+    crashed job may show fewer stored records than it wrote; the final counts
+    are written when the job finishes.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, job: UploadJob, body: IO[bytes],
+               ingest: Callable[..., Dict]) -> None:
+        """Queue ``ingest(records, progress)`` for ``job``, reading records from ``body``"""
+        app = current_app._get_current_object()
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=app.config['UPLOAD_JOB_WORKERS'],
+                    thread_name_prefix='upload-job'
+                )
+            if self._pending >= app.config['UPLOAD_JOB_MAX_PENDING']:
+                raise UploadJobQueueFull()
+            self._pending += 1
+
+        # Copy the body before the request ends; the worker streams it back from disk
+        spool = tempfile.TemporaryFile()
+        try:
+            shutil.copyfileobj(body, spool)
+            spool.seek(0)
+            self._executor.submit(self._run, app, job.id, spool, ingest)
+        except Exception as e:
+            # The worker never got the spool: free its slot and record why the job ended
+            spool.close()
+            with self._lock:
+                self._pending -= 1
+            db.session.rollback()
+            self._update(job.id, status='failed', finished_at=datetime.utcnow(),
+                         error=f'Failed to read upload body: {e}')
+            db.session.commit()
+            raise
+
+    def _run(self, app, job_id: str, spool: IO[bytes], ingest) -> None:
+        try:
+            with app.app_context():
+                self._update(job_id, status='running', started_at=datetime.utcnow())
+                db.session.commit()
+
+                try:
+                    result = ingest(iter_json_array(spool), lambda counts: self._update(job_id, **counts))
+                except Exception as e:
+                    db.session.rollback()
+                    result = {'success': False, 'error': str(e)}
+
+                if result['success']:
+                    self._update(
+                        job_id,
+                        status='completed',
+                        finished_at=datetime.utcnow(),
+                        rows_processed=result['total_records'],
+                        stored_records=result['stored_records'],
+                        skipped_records=result['skipped_records'],
+                        errors_count=len(result['errors']),
+                        locations_processed=result.get('locations_processed'),
+                        date_fallbacks=result.get('date_fallbacks')
+                    )
+                else:
+                    self._update(job_id, status='failed', finished_at=datetime.utcnow(), error=result['error'])
+                db.session.commit()
+        except Exception as e:
+            logger.exception("❌ Upload job %s crashed: %s", job_id, e)
+        finally:
+            spool.close()
+            with self._lock:
+                self._pending -= 1
+
+    def _update(self, job_id: str, **values) -> None:
+        """Write job progress; committed with the batch (serial writer) or right after it (partitioned writer)"""
+        db.session.execute(db.update(UploadJob).where(UploadJob.id == job_id).values(**values))
+
+# Global upload job runner instance
+upload_job_runner = UploadJobRunner()
+
+def create_upload_job(user_id: int, location_id: Optional[int], body: IO[bytes],
+                      ingest: Callable[..., Dict]) -> UploadJob:
+    """Create an upload job and start it in the background"""
+    job = UploadJob(user_id=user_id, location_id=location_id)
+    db.session.add(job)
+    db.session.commit()
+
+    try:
+        upload_job_runner.submit(job, body, ingest)
+    except UploadJobQueueFull:
+        db.session.delete(job)
+        db.session.commit()
+        raise
+
+    return job
@@ -0,0 +1,87 @@
+import logging
+from datetime import datetime
+from typing import IO, Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.upload_session import UploadSession
+from app.models.upload_chunk import UploadChunk
+from app.services.json_stream import iter_json_array
+from app.services.weather_service import upload_historical_weather_data, upload_multi_location_historical_data
+
+logger = logging.getLogger(__name__)
+
+def create_upload_session(user_id: int, location_id: Optional[int] = None,
+                          total_chunks: Optional[int] = None) -> UploadSession:
+    """Open a resumable upload session; location_id=None matches records to locations like the multi-location upload"""
+    session = UploadSession(user_id=user_id, location_id=location_id, total_chunks=total_chunks)
+    db.session.add(session)
+    db.session.commit()
+    return session
+
+def _find_chunk(session_id: str, chunk_index: int) -> Optional[UploadChunk]:
+    return UploadChunk.query.filter_by(session_id=session_id, chunk_index=chunk_index).first()
+
+def store_upload_chunk(session: UploadSession, chunk_index: int, body: IO[bytes]) -> Dict:
+    """Ingest one numbered chunk (a JSON array of records) of an upload session.
+
+    The chunk's records and its ``upload_chunks`` row are committed in one
+    transaction, so a chunk is either fully stored and marked committed or not
+    at all. Sending a chunk that is already committed is a no-op that only
+    costs one indexed lookup; the body is not read.
+    """
+    existing = _find_chunk(session.id, chunk_index)
+    if existing:
+        return {'success': True, 'replayed': True, 'chunk': existing, 'errors': []}
+
+    records = iter_json_array(body)
+    if session.location_id is not None:
+        result = upload_historical_weather_data(session.location_id, records, commit=False)
+    else:
+        result = upload_multi_location_historical_data(session.user_id, records, commit=False)
+
+    if not result['success']:
+        return result
+
+    chunk = UploadChunk(
+        session_id=session.id,
+        chunk_index=chunk_index,
+        total_records=result['total_records'],
+        stored_records=result['stored_records'],
+        skipped_records=result['skipped_records'],
+        errors_count=len(result['errors'])
+    )
+    db.session.add(chunk)
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent retry committed the same chunk first; ours is rolled back with its records
+        db.session.rollback()
+        existing = _find_chunk(session.id, chunk_index)
+        if existing is None:
+            raise
+        return {'success': True, 'replayed': True, 'chunk': existing, 'errors': []}
+
+    logger.info("📦 Committed chunk %d of upload session %s: %d records stored", chunk_index, session.id, chunk.stored_records)
+
+    return {'success': True, 'replayed': False, 'chunk': chunk, 'errors': result['errors']}
+
+def finalize_upload_session(session: UploadSession) -> Dict:
+    """Close an upload session once every expected chunk is committed"""
+    if session.status == 'finalized':
+        return {'success': True}
+
+    if not session.chunks:
+        return {'success': False, 'error': 'No chunks have been uploaded'}
+
+    missing = session.missing_chunks()
+    if missing:
+        return {'success': False, 'error': 'Upload is missing chunks', 'missing_chunks': missing}
+
+    session.status = 'finalized'
+    session.finalized_at = datetime.utcnow()
+    db.session.commit()
+
+    logger.info("✅ Finalized upload session %s with %d chunks", session.id, len(session.chunks))
+
+    return {'success': True}
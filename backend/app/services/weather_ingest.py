@@ -0,0 +1,283 @@
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models.weather_record import WeatherRecord
+from app.services.daily_summaries import refresh_daily_summaries
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement. 1000 rows x 9 columns stays well below the
+# bind parameter limits of both PostgreSQL and SQLite.
+DEFAULT_BATCH_SIZE = 1000
+
+INSERT_COLUMNS = (
+    'location_id', 'temperature', 'humidity', 'pressure', 'wind_speed',
+    'wind_direction', 'description', 'icon', 'recorded_at'
+)
+
+def find_existing_weather_keys(executor, keys: List[Tuple[int, datetime]]) -> Set[Tuple[int, datetime]]:
+    """Return which (location_id, recorded_at) keys are already stored, with one query"""
+    table = WeatherRecord.__table__
+    result = executor.execute(
+        db.select(table.c.location_id, table.c.recorded_at).where(
+            tuple_(table.c.location_id, table.c.recorded_at).in_(keys)
+        )
+    )
+    return {tuple(row) for row in result}
+
+def insert_weather_rows(executor, dialect: str, rows: List[Dict]) -> int:
+    """Insert a batch of rows, skipping existing (location_id, recorded_at) keys.
+
+    ``executor`` is anything with SQLAlchemy's ``execute`` - the ORM session or
+    a Connection. The daily summaries of the days that received rows are
+    refreshed in the same transaction. Returns the number of rows actually inserted.
+    """
+    table = WeatherRecord.__table__
+
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(table).on_conflict_do_nothing(
+            index_elements=['location_id', 'recorded_at']
+        ).returning(table.c.location_id, table.c.recorded_at)
+        # Executed with a parameter list, SQLAlchemy renders this as multi-row
+        # VALUES ("insertmanyvalues") while reusing the cached compiled statement
+        inserted = [tuple(row) for row in executor.execute(stmt, rows)]
+    else:
+        # Other backends: look up the existing keys for the whole batch in one
+        # query, then insert only the new rows.
+        existing = find_existing_weather_keys(executor, [(row['location_id'], row['recorded_at']) for row in rows])
+        new_rows = [row for row in rows if (row['location_id'], row['recorded_at']) not in existing]
+        if new_rows:
+            executor.execute(table.insert(), new_rows)
+        inserted = [(row['location_id'], row['recorded_at']) for row in new_rows]
+
+    refresh_daily_summaries(executor, inserted)
+    return len(inserted)
+
+class BulkWeatherWriter:
+    """Buffer weather rows and insert them in multi-row batches.
+
+    Duplicates are detected by the (location_id, recorded_at) unique
+    constraint rather than a SELECT per row: on PostgreSQL and SQLite every
+    batch is a single INSERT ... ON CONFLICT DO NOTHING, and rows that the
+    database refused are counted as skipped.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, autocommit: bool = True,
+                 on_flush: Optional[Callable[[], None]] = None):
+        self.batch_size = batch_size
+        self.autocommit = autocommit
+        self.on_flush = on_flush  # called after each batch, inside the same transaction (unlike PartitionedWeatherWriter)
+        self.stored_records = 0
+        self.skipped_records = 0
+        self._pending: Dict[Tuple[int, datetime], Dict] = {}
+        self._dialect = db.session.get_bind().dialect.name
+
+    def add(self, row: Dict) -> None:
+        """Queue a row (a dict keyed by INSERT_COLUMNS) for insertion"""
+        key = (row['location_id'], row['recorded_at'])
+        if key in self._pending:
+            # Same timestamp twice in one file - keep the first one
+            self.skipped_records += 1
+            return
+
+        self._pending[key] = row
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, rows: List[Dict]) -> None:
+        """Insert a whole batch of rows at once, ``batch_size`` rows per statement.
+
+        The rows' (location_id, recorded_at) keys must already be unique among
+        themselves (e.g. deduplicated in a DataFrame); keys stored earlier are
+        skipped by the database as usual.
+        """
+        self.flush()
+        for start in range(0, len(rows), self.batch_size):
+            self._insert(rows[start:start + self.batch_size])
+
+    def flush(self) -> int:
+        """Insert all queued rows and return how many were actually stored"""
+        if not self._pending:
+            return 0
+
+        rows = list(self._pending.values())
+        self._pending = {}
+        return self._insert(rows)
+
+    def _insert(self, rows: List[Dict]) -> int:
+        inserted = insert_weather_rows(db.session, self._dialect, rows)
+        self.stored_records += inserted
+        self.skipped_records += len(rows) - inserted
+
+        if self.on_flush:
+            self.on_flush()
+        if self.autocommit:
+            db.session.commit()
+        logger.info("💾 Inserted %d of %d records (%d stored so far)", inserted, len(rows), self.stored_records)
+
+        return inserted
+
+_insert_executor_lock = threading.Lock()
+
+def _get_insert_executor() -> ThreadPoolExecutor:
+    """The current app's pool for partitioned inserts, sized by its INGEST_PARALLELISM.
+
+    Shared across uploads so concurrent uploads can't exhaust the connection
+    pool; kept in ``app.extensions`` so every app gets one from its own config.
+    """
+    app = current_app._get_current_object()
+    with _insert_executor_lock:
+        executor = app.extensions.get('weather_insert_executor')
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=app.config['INGEST_PARALLELISM'], thread_name_prefix='weather-insert')
+            app.extensions['weather_insert_executor'] = executor
+        return executor
+
+class PartitionedWeatherWriter:
+    """Bulk writer that loads each location's rows concurrently.
+
+    Rows are buffered per location_id. A full buffer is inserted on the app's
+    insert pool in its own connection and transaction, so batches for
+    different locations load in parallel. At most one batch per location is in
+    flight at a time: partitions never touch the same keys, which keeps
+    concurrent transactions from waiting on (or deadlocking over) each other.
+
+    Every batch commits on its own, like ``BulkWeatherWriter(autocommit=True)``;
+    counters and ``on_flush`` are only updated on the calling thread. Unlike
+    BulkWeatherWriter, ``on_flush`` runs in a transaction of its own after the
+    batch has committed (writing progress inside each partition's transaction
+    would make every batch wait on the same progress row), so after a crash
+    the reported progress can lag the stored rows, but never exceed them.
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE,
+                 on_flush: Optional[Callable[[], None]] = None):
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self.stored_records = 0
+        self.skipped_records = 0
+        self._engine = db.engine
+        self._dialect = self._engine.dialect.name
+        self._executor = _get_insert_executor()
+        self._partitions: Dict[int, Dict[datetime, Dict]] = {}
+        self._in_flight: Dict[int, Future] = {}
+
+    def add(self, row: Dict) -> None:
+        """Queue a row (a dict keyed by INSERT_COLUMNS) in its location's partition"""
+        partition = self._partitions.setdefault(row['location_id'], {})
+        if row['recorded_at'] in partition:
+            # Same timestamp twice in one file - keep the first one
+            self.skipped_records += 1
+            return
+
+        partition[row['recorded_at']] = row
+        if len(partition) >= self.batch_size:
+            self._submit(row['location_id'])
+        self._collect(wait=False)
+
+    def add_many(self, rows: List[Dict]) -> None:
+        """Insert a whole batch of rows at once (keys unique among themselves, see BulkWeatherWriter.add_many)"""
+        by_location = defaultdict(list)
+        for row in rows:
+            by_location[row['location_id']].append(row)
+        for location_id, location_rows in by_location.items():
+            # Queued rows of the location go first, so a batch never repeats a key
+            self._submit(location_id)
+            for start in range(0, len(location_rows), self.batch_size):
+                self._submit_rows(location_id, location_rows[start:start + self.batch_size])
+            self._collect(wait=False)
+
+    def flush(self) -> int:
+        """Insert every queued row, wait for all batches and return how many rows this call stored"""
+        stored_before = self.stored_records
+        for location_id in list(self._partitions):
+            self._submit(location_id)
+        self._collect(wait=True)
+        return self.stored_records - stored_before
+
+    def _submit(self, location_id: int) -> None:
+        rows = list(self._partitions.pop(location_id, {}).values())
+        if rows:
+            self._submit_rows(location_id, rows)
+
+    def _submit_rows(self, location_id: int, rows: List[Dict]) -> None:
+        if location_id in self._in_flight:
+            # Keep one batch per location in flight; this also bounds buffered rows
+            self._finish(location_id)
+        self._in_flight[location_id] = self._executor.submit(self._insert_batch, rows)
+
+    def _insert_batch(self, rows: List[Dict]) -> Tuple[int, int]:
+        with self._engine.begin() as connection:
+            return insert_weather_rows(connection, self._dialect, rows), len(rows)
+
+    def _collect(self, wait: bool) -> None:
+        for location_id, future in list(self._in_flight.items()):
+            if wait or future.done():
+                self._finish(location_id)
+
+    def _finish(self, location_id: int) -> None:
+        """Count a batch once it has committed; a failed batch stops the whole writer"""
+        future = self._in_flight.pop(location_id)
+        try:
+            inserted, batch_rows = future.result()
+        except Exception:
+            self._abort()
+            raise
+        self.stored_records += inserted
+        self.skipped_records += batch_rows - inserted
+
+        if self.on_flush:
+            self.on_flush()
+            db.session.commit()
+        logger.info("💾 Inserted %d of %d records for location %s (%d stored so far)", inserted, batch_rows, location_id, self.stored_records)
+
+    def _abort(self) -> None:
+        """After a failed batch: drop queued rows, cancel batches not started yet and wait for the rest.
+
+        Batches already running still commit on their own, so they are waited
+        for and counted; the caller's error is raised only once nothing is
+        left writing behind its back.
+        """
+        self._partitions.clear()
+        in_flight, self._in_flight = self._in_flight, {}
+        committed = 0
+        for location_id, future in in_flight.items():
+            if future.cancel():
+                continue
+            try:
+                inserted, batch_rows = future.result()
+            except Exception as e:
+                logger.error("❌ Batch for location %s failed too: %s", location_id, e)
+                continue
+            committed += 1
+            self.stored_records += inserted
+            self.skipped_records += batch_rows - inserted
+
+        if committed and self.on_flush:
+            try:
+                self.on_flush()
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error("❌ Could not report progress of the committed batches: %s", e)
+
+def create_weather_writer(autocommit: bool = True, on_flush: Optional[Callable[[], None]] = None):
+    """Writer for a multi-location ingest.
+
+    Uses the partitioned parallel writer when INGEST_PARALLELISM > 1 and every
+    batch may commit on its own. SQLite serializes writers anyway, and callers
+    that own the transaction (autocommit=False) need all rows in their
+    session, so those get the serial BulkWeatherWriter. ``on_flush`` is only
+    guaranteed to share the batch's transaction with the serial writer.
+    """
+    if autocommit and current_app.config['INGEST_PARALLELISM'] > 1 and db.engine.dialect.name != 'sqlite':
+        return PartitionedWeatherWriter(on_flush=on_flush)
+    return BulkWeatherWriter(autocommit=autocommit, on_flush=on_flush)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from sqlalchemy import and_, func, select
+from app import db
+from app.models.location import Location
+from app.models.weather_record import WeatherRecord
+
+# The WeatherRecord.to_dict keys, in order; the read queries select exactly these
+RECORD_COLUMNS = (
+    'id', 'location_id', 'temperature', 'humidity', 'pressure', 'wind_speed',
+    'wind_direction', 'description', 'icon', 'recorded_at'
+)
+RECORDED_AT_INDEX = RECORD_COLUMNS.index('recorded_at')
+
+def record_query(location_id: int, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Core SELECT of a location's records (RECORD_COLUMNS), newest first"""
+    table = WeatherRecord.__table__
+    query = select(*(table.c[column] for column in RECORD_COLUMNS)).where(table.c.location_id == location_id)
+    if start is not None:
+        query = query.where(table.c.recorded_at >= start)
+    if end is not None:
+        query = query.where(table.c.recorded_at <= end)
+    return query.order_by(table.c.recorded_at.desc())
+
+def record_row(row: Sequence) -> list:
+    """A RECORD_COLUMNS row as a JSON-ready list (recorded_at in ISO format)"""
+    values = list(row)
+    recorded_at = values[RECORDED_AT_INDEX]
+    values[RECORDED_AT_INDEX] = recorded_at.isoformat() if recorded_at else None
+    return values
+
+def record_dict(row: Sequence) -> Dict:
+    """Same dict as WeatherRecord.to_dict(), from a plain RECORD_COLUMNS row"""
+    return dict(zip(RECORD_COLUMNS, record_row(row)))
+
+def iter_record_dicts(rows: Iterable[Sequence]) -> Iterator[Dict]:
+    for row in rows:
+        yield record_dict(row)
+
+def fetch_records(query) -> List[tuple]:
+    """Run a RECORD_COLUMNS query and return bare tuples, no ORM objects involved"""
+    return db.session.execute(query).tuples().all()
+
+def latest_records(location_ids: Iterable[int]) -> Dict[int, Dict]:
+    """Newest record of each location as a to_dict() dict, in one Core query: {location_id: record}
+
+    The per-location MAX(recorded_at) runs once per location as a backward
+    scan of the (location_id, recorded_at) unique index, and the records are
+    joined back through the same index, so the cost doesn't grow with history size.
+    """
+    location_ids = list(location_ids)
+    if not location_ids:
+        return {}
+
+    table = WeatherRecord.__table__
+    locations = Location.__table__
+    latest = select(
+        locations.c.id.label('location_id'),
+        select(func.max(table.c.recorded_at))
+        .where(table.c.location_id == locations.c.id)
+        .scalar_subquery().label('recorded_at')
+    ).where(locations.c.id.in_(location_ids)).subquery()
+
+    query = select(*(table.c[column] for column in RECORD_COLUMNS)).join(latest, and_(
+        table.c.location_id == latest.c.location_id,
+        table.c.recorded_at == latest.c.recorded_at
+    ))
+    return {record['location_id']: record for record in iter_record_dicts(fetch_records(query))}
@@ -1,284 +1,183 @@
 import requests
 import os
 import json
+import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Tuple
+from flask import current_app
 from app import db
-from app.models.weather_record import WeatherRecord
+from app.services.json_stream import JSONArrayExpected
+from app.services.location_index import LocationIndex
+from app.services.timestamps import TimestampParser
+from app.services.weather_ingest import DEFAULT_BATCH_SIZE, BulkWeatherWriter, create_weather_writer, find_existing_weather_keys
+from app.log import SampledLogger
+
+logger = logging.getLogger(__name__)
 
 class WeatherService:
     def __init__(self):
         self.api_key = os.environ.get('OPENWEATHER_API_KEY')
         self.base_url = 'https://api.openweathermap.org/data/2.5'
         
-    def upload_historical_data(self, location_id: int, json_data: str) -> Dict:
-        """Parse and store historical weather data from uploaded JSON file"""
+    def upload_historical_data(self, location_id: int, records: Iterable[Dict],
+                               progress: Optional[Callable[[Dict], None]] = None, commit: bool = True) -> Dict:
+        """Parse and store historical weather data from an uploaded JSON file.
+
+        ``records`` is consumed one record at a time (see ``iter_json_array``),
+        so the upload is never held in memory as a whole. ``progress`` is
+        called with the running counts after every inserted batch. With
+        ``commit=False`` nothing is committed and the caller owns the transaction.
+        """
         try:
-            # Parse JSON data
-            weather_data = json.loads(json_data)
-            
-            if not isinstance(weather_data, list):
-                return {'success': False, 'error': 'JSON data must be a list of weather records'}
-            
             # Track statistics
-            total_records = len(weather_data)
+            total_records = 0
             stored_records = 0
             skipped_records = 0
             errors = []
             
-            print(f"📊 Processing {total_records} historical weather records for location {location_id}")
+            def report_progress():
+                if progress:
+                    progress({
+                        'rows_processed': total_records,
+                        'stored_records': writer.stored_records,
+                        'skipped_records': skipped_records + writer.skipped_records,
+                        'errors_count': len(errors)
+                    })
+            
+            writer = BulkWeatherWriter(autocommit=commit, on_flush=report_progress)
+            timestamps = TimestampParser(self._parse_date_string)
             
-            for i, record in enumerate(weather_data):
+            logger.info("📊 Processing historical weather records for location %s", location_id)
+            
+            for i, record in enumerate(records):
+                total_records += 1
                 try:
-                    # Validate required fields (check for multiple possible date field names)
-                    date_field = None
-                    for possible_date_field in ['date', 'dt', 'dt_iso']:
-                        if possible_date_field in record:
-                            date_field = possible_date_field
-                            break
-                    
-                    if not date_field or 'temperature' not in record:
-                        errors.append(f"Record {i}: Missing required fields (date/dt/dt_iso, temperature)")
-                        skipped_records += 1
-                        continue
-                    
-                    # Parse date (handle multiple possible formats)
-                    date_str = record[date_field]
-                    parsed_date = self._parse_date_string(date_str)
-                    
-                    if not parsed_date:
-                        errors.append(f"Record {i}: Invalid date format: {date_str}")
-                        skipped_records += 1
-                        continue
-                    
-                    # Check if record already exists for this date and location
-                    existing_record = WeatherRecord.query.filter_by(
-                        location_id=location_id,
-                        recorded_at=parsed_date
-                    ).first()
-                    
-                    if existing_record:
-                        print(f"⏭️ Skipping duplicate record for {parsed_date.date()}")
-                        skipped_records += 1
-                        continue
-                    
-                    # Create new weather record
-                    weather_record = WeatherRecord(
-                        location_id=location_id,
-                        temperature=float(record['temperature']),
-                        humidity=float(record.get('humidity', 0)) if record.get('humidity') else None,
-                        pressure=float(record.get('pressure', 0)) if record.get('pressure') else None,
-                        wind_speed=float(record.get('wind_speed', 0)) if record.get('wind_speed') else None,
-                        wind_direction=float(record.get('wind_direction', 0)) if record.get('wind_direction') else None,
-                        description=record.get('description', 'Historical data'),
-                        icon=record.get('icon', '01d')
-                    )
-                    
-                    # Set the recorded_at timestamp after creation
-                    weather_record.recorded_at = parsed_date
-                    
-                    db.session.add(weather_record)
-                    stored_records += 1
-                    
-                    # Commit every 100 records to avoid memory issues
-                    if stored_records % 100 == 0:
-                        db.session.commit()
-                        print(f"💾 Committed {stored_records} records so far...")
-                    
+                    row, error = self._parse_location_record(record, location_id, timestamps)
                 except Exception as e:
-                    errors.append(f"Record {i}: {str(e)}")
+                    row, error = None, str(e)
+                
+                if error:
+                    errors.append(f"Record {i}: {error}")
                     skipped_records += 1
                     continue
+                
+                # Duplicates are resolved by the database when the batch is flushed
+                writer.add(row)
             
-            # Final commit for remaining records
-            db.session.commit()
+            if total_records == 0:
+                db.session.rollback()
+                return {'success': False, 'error': 'No weather records provided'}
             
-            print(f"✅ Successfully stored {stored_records} historical weather records")
-            print(f"⏭️ Skipped {skipped_records} records")
+            # Insert (and, unless the caller owns the transaction, commit) the remaining records
+            writer.flush()
+            stored_records = writer.stored_records
+            skipped_records += writer.skipped_records
+            
+            logger.info("✅ Stored %d of %d historical weather records, skipped %d",
+                        stored_records, total_records, skipped_records)
+            if timestamps.fallbacks:
+                logger.info("🕒 %d timestamps did not match the detected '%s' format",
+                            timestamps.fallbacks, timestamps.format_name)
             
             if errors:
-                print(f"⚠️ {len(errors)} errors encountered:")
-                for error in errors[:5]:  # Show first 5 errors
-                    print(f"  - {error}")
-                if len(errors) > 5:
-                    print(f"  ... and {len(errors) - 5} more errors")
+                # Show first 5 errors
+                logger.warning("⚠️ %d errors encountered, first: %s", len(errors), '; '.join(errors[:5]))
             
             return {
                 'success': True,
                 'total_records': total_records,
                 'stored_records': stored_records,
                 'skipped_records': skipped_records,
+                'date_format': timestamps.format_name,
+                'date_fallbacks': timestamps.fallbacks,
                 'errors': errors
             }
             
+        except JSONArrayExpected as e:
+            db.session.rollback()
+            return {'success': False, 'error': str(e)}
         except json.JSONDecodeError as e:
+            db.session.rollback()
             return {'success': False, 'error': f'Invalid JSON format: {str(e)}'}
         except Exception as e:
             db.session.rollback()
             return {'success': False, 'error': f'Failed to process historical data: {str(e)}'}
     
-    def upload_multi_location_historical_data(self, user_id: int, json_data: str) -> Dict:
-        """Parse and store historical weather data from uploaded JSON file for multiple locations"""
+    def upload_multi_location_historical_data(self, user_id: int, records: Iterable[Dict],
+                                              progress: Optional[Callable[[Dict], None]] = None, commit: bool = True) -> Dict:
+        """Parse and store historical weather data from an uploaded JSON file for multiple locations.
+
+        Records are matched to locations and queued for insertion in a single
+        pass over ``records``; location lookups are cached per unique location key.
+        Rows are partitioned by location and the partitions are inserted
+        concurrently (see ``create_weather_writer``).
+        """
         try:
-            # Parse JSON data
-            weather_data = json.loads(json_data)
-            
-            if not isinstance(weather_data, list):
-                return {'success': False, 'error': 'JSON data must be a list of weather records'}
-            
             # Track statistics
-            total_records = len(weather_data)
+            total_records = 0
             stored_records = 0
             skipped_records = 0
             errors = []
             location_mapping = {}
             
-            print(f"📊 Processing {total_records} historical weather records for multiple locations")
-            print(f"🔍 Sample record structure: {list(weather_data[0].keys()) if weather_data else 'No records'}")
-            
-            # First pass: analyze location information and create mapping
-            from app.models.location import Location
-            
-            for i, record in enumerate(weather_data):
+            def report_progress():
+                if progress:
+                    progress({
+                        'rows_processed': total_records,
+                        'stored_records': writer.stored_records,
+                        'skipped_records': skipped_records + writer.skipped_records,
+                        'errors_count': len(errors),
+                        'locations_processed': len(location_mapping)
+                    })
+            
+            writer = create_weather_writer(autocommit=commit, on_flush=report_progress)
+            timestamps = TimestampParser(self._parse_date_string)
+            
+            # Load the user's locations once; matching below never queries the database
+            location_index = LocationIndex.for_user(
+                user_id, max_distance_km=current_app.config['LOCATION_MATCH_MAX_KM']
+            )
+            
+            record_log = SampledLogger(logger)
+            logger.info("📊 Processing historical weather records for multiple locations")
+            
+            for i, record in enumerate(records):
+                total_records += 1
                 try:
-                    # Extract location information from record
-                    location_info = self._extract_location_info(record)
-                    if not location_info:
-                        print(f"❌ Record {i}: Missing location information. Record keys: {list(record.keys())}")
-                        errors.append(f"Record {i}: Missing location information")
-                        skipped_records += 1
-                        continue
-                    
-                    print(f"📍 Record {i}: Extracted location info: {location_info}")
-                    
-                    # Try to find matching location in database
-                    location_key = self._create_location_key(location_info)
-                    print(f"🔑 Record {i}: Created location key: {location_key}")
-                    
-                    if location_key not in location_mapping:
-                        location_mapping[location_key] = self._find_matching_location(user_id, location_info)
-                    
-                    if not location_mapping[location_key]:
-                        print(f"❌ Record {i}: No matching location found for {location_info.get('name', 'Unknown')}")
-                        errors.append(f"Record {i}: No matching location found for {location_info.get('name', 'Unknown')}")
-                        skipped_records += 1
-                        continue
-                    else:
-                        print(f"✅ Record {i}: Matched to location: {location_mapping[location_key].name}")
-                        
-                except Exception as e:
-                    print(f"❌ Record {i}: Error processing location info: {str(e)}")
-                    errors.append(f"Record {i}: Error processing location info: {str(e)}")
-                    skipped_records += 1
-                    continue
-            
-            print(f"📍 Found {len(location_mapping)} unique locations in data")
-            print(f"📍 Location mapping: {[(k, v.name if v else 'None') for k, v in location_mapping.items()]}")
-            
-            # Second pass: process weather records
-            for i, record in enumerate(weather_data):
-                try:
-                    # Validate required fields (check for multiple possible date field names)
-                    date_field = None
-                    for possible_date_field in ['date', 'dt', 'dt_iso']:
-                        if possible_date_field in record:
-                            date_field = possible_date_field
-                            break
-                    
-                    # Check for temperature field (temp, temperature, or temp_min) - handle nested main object
-                    temperature = None
-                    if 'main' in record and isinstance(record['main'], dict):
-                        # Check nested main object first
-                        if 'temp' in record['main']:
-                            temperature = record['main']['temp']
-                        elif 'temp_min' in record['main']:
-                            temperature = record['main']['temp_min']
-                    # Check top level fields
-                    if temperature is None:
-                        if 'temp' in record:
-                            temperature = record['temp']
-                        elif 'temperature' in record:
-                            temperature = record['temperature']
-                        elif 'temp_min' in record:
-                            temperature = record['temp_min']
-                    
-                    if not date_field or temperature is None:
-                        errors.append(f"Record {i}: Missing required fields (date/dt/dt_iso, temp/temperature/temp_min)")
-                        skipped_records += 1
-                        continue
-                    
-                    # Extract location information
-                    location_info = self._extract_location_info(record)
-                    location_key = self._create_location_key(location_info)
-                    location = location_mapping[location_key]
-                    
-                    if not location:
-                        continue  # Already counted as skipped above
-                    
-                    # Parse date
-                    date_str = record[date_field]
-                    parsed_date = self._parse_date_string(date_str)
-                    
-                    if not parsed_date:
-                        errors.append(f"Record {i}: Invalid date format: {date_str}")
-                        skipped_records += 1
-                        continue
-                    
-                    # Check if record already exists for this date and location
-                    existing_record = WeatherRecord.query.filter_by(
-                        location_id=location.id,
-                        recorded_at=parsed_date
-                    ).first()
-                    
-                    if existing_record:
-                        print(f"⏭️ Skipping duplicate record for {location.name} on {parsed_date.date()}")
-                        skipped_records += 1
-                        continue
-                    
-                    # Create new weather record - handle nested main and wind objects
-                    # Convert Fahrenheit to Celsius: (F - 32) * 5/9
-                    temp_celsius = (float(temperature) - 32) * 5/9 if temperature else None
-                    
-                    weather_record = WeatherRecord(
-                        location_id=location.id,
-                        temperature=temp_celsius,
-                        humidity=float(record.get('humidity', record.get('main', {}).get('humidity', 0))) if record.get('humidity') or record.get('main', {}).get('humidity') else None,
-                        pressure=float(record.get('pressure', record.get('main', {}).get('pressure', 0))) if record.get('pressure') or record.get('main', {}).get('pressure') else None,
-                        wind_speed=float(record.get('wind_speed', record.get('wind', {}).get('speed', 0))) if record.get('wind_speed') or record.get('wind', {}).get('speed') else None,
-                        wind_direction=float(record.get('wind_direction', record.get('wind', {}).get('deg', 0))) if record.get('wind_direction') or record.get('wind', {}).get('deg') else None,
-                        description=record.get('description', record.get('weather', [{}])[0].get('description', 'Historical data') if record.get('weather') else 'Historical data'),
-                        icon=record.get('icon', record.get('weather', [{}])[0].get('icon', '01d') if record.get('weather') else '01d')
+                    row, error = self._parse_multi_location_record(
+                        i, record, location_index, location_mapping, timestamps, record_log
                     )
-                    
-                    # Set the recorded_at timestamp after creation
-                    weather_record.recorded_at = parsed_date
-                    
-                    db.session.add(weather_record)
-                    stored_records += 1
-                    
-                    # Commit every 100 records to avoid memory issues
-                    if stored_records % 100 == 0:
-                        db.session.commit()
-                        print(f"💾 Committed {stored_records} records so far...")
-                    
                 except Exception as e:
-                    errors.append(f"Record {i}: {str(e)}")
+                    row, error = None, str(e)
+                
+                if error:
+                    errors.append(f"Record {i}: {error}")
                     skipped_records += 1
                     continue
+                
+                # Duplicates are resolved by the database when the batch is flushed
+                writer.add(row)
+            
+            if total_records == 0:
+                db.session.rollback()
+                return {'success': False, 'error': 'No weather records provided'}
             
-            # Final commit for remaining records
-            db.session.commit()
+            # Insert (and, unless the caller owns the transaction, commit) the remaining records
+            writer.flush()
+            stored_records = writer.stored_records
+            skipped_records += writer.skipped_records
             
-            print(f"✅ Successfully stored {stored_records} historical weather records")
-            print(f"⏭️ Skipped {skipped_records} records")
-            print(f"📍 Processed data for {len(location_mapping)} locations")
+            logger.info("✅ Stored %d of %d historical weather records, skipped %d",
+                        stored_records, total_records, skipped_records)
+            if timestamps.fallbacks:
+                logger.info("🕒 %d timestamps did not match the detected '%s' format",
+                            timestamps.fallbacks, timestamps.format_name)
+            logger.info("📍 Processed data for %d locations", len(location_mapping))
             
             if errors:
-                print(f"⚠️ {len(errors)} errors encountered:")
-                for error in errors[:5]:  # Show first 5 errors
-                    print(f"  - {error}")
-                if len(errors) > 5:
-                    print(f"  ... and {len(errors) - 5} more errors")
+                # Show first 5 errors
+                logger.warning("⚠️ %d errors encountered, first: %s", len(errors), '; '.join(errors[:5]))
             
             return {
                 'success': True,
@@ -286,15 +185,249 @@ class WeatherService:
                 'stored_records': stored_records,
                 'skipped_records': skipped_records,
                 'locations_processed': len(location_mapping),
+                'date_format': timestamps.format_name,
+                'date_fallbacks': timestamps.fallbacks,
                 'errors': errors
             }
             
+        except JSONArrayExpected as e:
+            db.session.rollback()
+            return {'success': False, 'error': str(e)}
         except json.JSONDecodeError as e:
+            db.session.rollback()
             return {'success': False, 'error': f'Invalid JSON format: {str(e)}'}
         except Exception as e:
             db.session.rollback()
             return {'success': False, 'error': f'Failed to process historical data: {str(e)}'}
     
+    def _parse_location_record(self, record, location_id: int,
+                               timestamps: TimestampParser) -> Tuple[Optional[Dict], Optional[str]]:
+        """Turn one record of a single-location upload into a weather_records row.
+
+        Returns ``(row, None)``, or ``(None, error)`` when the record is invalid.
+        """
+        if not isinstance(record, dict):
+            return None, "Expected a JSON object"
+        
+        # Validate required fields (check for multiple possible date field names)
+        date_field = None
+        for possible_date_field in ['date', 'dt', 'dt_iso']:
+            if possible_date_field in record:
+                date_field = possible_date_field
+                break
+        
+        if not date_field or 'temperature' not in record:
+            return None, "Missing required fields (date/dt/dt_iso, temperature)"
+        
+        # Parse date (handle multiple possible formats)
+        date_str = record[date_field]
+        parsed_date = timestamps.parse(date_str)
+        
+        if not parsed_date:
+            return None, f"Invalid date format: {date_str}"
+        
+        return {
+            'location_id': location_id,
+            'temperature': float(record['temperature']),
+            'humidity': float(record.get('humidity', 0)) if record.get('humidity') else None,
+            'pressure': float(record.get('pressure', 0)) if record.get('pressure') else None,
+            'wind_speed': float(record.get('wind_speed', 0)) if record.get('wind_speed') else None,
+            'wind_direction': float(record.get('wind_direction', 0)) if record.get('wind_direction') else None,
+            'description': record.get('description', 'Historical data'),
+            'icon': record.get('icon', '01d'),
+            'recorded_at': parsed_date
+        }, None
+    
+    def _parse_multi_location_record(self, i: int, record, location_index: LocationIndex, location_mapping: Dict,
+                                     timestamps: TimestampParser,
+                                     record_log: SampledLogger) -> Tuple[Optional[Dict], Optional[str]]:
+        """Turn one record of a multi-location upload into a weather_records row.
+
+        Location matches are cached in ``location_mapping`` per unique location
+        key. Returns ``(row, None)``, or ``(None, error)`` when the record is invalid.
+        """
+        if not isinstance(record, dict):
+            return None, "Expected a JSON object"
+        
+        if i == 0:
+            logger.debug("🔍 Sample record structure: %s", list(record.keys()))
+        
+        # Extract location information from record
+        location_info = self._extract_location_info(record)
+        if not location_info:
+            record_log.debug('missing_location', "❌ Record %d: Missing location information. Record keys: %s",
+                             i, record.keys())
+            return None, "Missing location information"
+        
+        # Match the record to one of the user's locations (once per unique location key)
+        location_key = self._create_location_key(location_info)
+        if location_key not in location_mapping:
+            location_mapping[location_key] = self._find_matching_location(location_index, location_info)
+        
+        location = location_mapping[location_key]
+        if not location:
+            record_log.debug('no_match', "❌ Record %d: No matching location found for %s", i, location_info)
+            return None, f"No matching location found for {location_info.get('name', 'Unknown')}"
+        
+        # Validate required fields (check for multiple possible date field names)
+        date_field = None
+        for possible_date_field in ['date', 'dt', 'dt_iso']:
+            if possible_date_field in record:
+                date_field = possible_date_field
+                break
+        
+        # Check for temperature field (temp, temperature, or temp_min) - handle nested main object
+        temperature = None
+        if 'main' in record and isinstance(record['main'], dict):
+            # Check nested main object first
+            if 'temp' in record['main']:
+                temperature = record['main']['temp']
+            elif 'temp_min' in record['main']:
+                temperature = record['main']['temp_min']
+        # Check top level fields
+        if temperature is None:
+            if 'temp' in record:
+                temperature = record['temp']
+            elif 'temperature' in record:
+                temperature = record['temperature']
+            elif 'temp_min' in record:
+                temperature = record['temp_min']
+        
+        if not date_field or temperature is None:
+            return None, "Missing required fields (date/dt/dt_iso, temp/temperature/temp_min)"
+        
+        # Parse date
+        date_str = record[date_field]
+        parsed_date = timestamps.parse(date_str)
+        
+        if not parsed_date:
+            return None, f"Invalid date format: {date_str}"
+        
+        # Create new weather record - handle nested main and wind objects
+        # Convert Fahrenheit to Celsius: (F - 32) * 5/9
+        temp_celsius = (float(temperature) - 32) * 5/9 if temperature else None
+        
+        return {
+            'location_id': location.id,
+            'temperature': temp_celsius,
+            'humidity': float(record.get('humidity', record.get('main', {}).get('humidity', 0))) if record.get('humidity') or record.get('main', {}).get('humidity') else None,
+            'pressure': float(record.get('pressure', record.get('main', {}).get('pressure', 0))) if record.get('pressure') or record.get('main', {}).get('pressure') else None,
+            'wind_speed': float(record.get('wind_speed', record.get('wind', {}).get('speed', 0))) if record.get('wind_speed') or record.get('wind', {}).get('speed') else None,
+            'wind_direction': float(record.get('wind_direction', record.get('wind', {}).get('deg', 0))) if record.get('wind_direction') or record.get('wind', {}).get('deg') else None,
+            'description': record.get('description', record.get('weather', [{}])[0].get('description', 'Historical data') if record.get('weather') else 'Historical data'),
+            'icon': record.get('icon', record.get('weather', [{}])[0].get('icon', '01d') if record.get('weather') else '01d'),
+            'recorded_at': parsed_date
+        }, None
+    
+    def dry_run_historical_data(self, location_id: int, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Validate a single-location upload without writing anything (see ``_dry_run``)"""
+        timestamps = TimestampParser(self._parse_date_string)
+        return self._dry_run(
+            records, lambda i, record: self._parse_location_record(record, location_id, timestamps), timestamps
+        )
+    
+    def dry_run_multi_location_historical_data(self, user_id: int, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Validate a multi-location upload without writing anything (see ``_dry_run``)"""
+        timestamps = TimestampParser(self._parse_date_string)
+        location_index = LocationIndex.for_user(
+            user_id, max_distance_km=current_app.config['LOCATION_MATCH_MAX_KM']
+        )
+        location_mapping = {}
+        record_log = SampledLogger(logger)
+        return self._dry_run(
+            records,
+            lambda i, record: self._parse_multi_location_record(
+                i, record, location_index, location_mapping, timestamps, record_log
+            ),
+            timestamps
+        )
+    
+    def _dry_run(self, records: Iterable[Dict], parse_record: Callable, timestamps: TimestampParser) -> Iterator[Dict]:
+        """Report what an upload would do, one dict per record, without writing.
+
+        Records are validated exactly like the real upload. Report lines are
+        yielded in record order, DEFAULT_BATCH_SIZE at a time, after one
+        duplicate query for the valid rows among them. The last line is ``{'summary': ...}`` with aggregate counts; a
+        file that can't be parsed ends with ``{'error': ...}`` instead.
+        """
+        counts = Counter()
+        records_by_location = Counter()
+        seen_keys = set()
+        batch = []  # report lines waiting for the duplicate check
+        pending = {}  # key -> report line, for the valid rows in batch
+        
+        def drain():
+            existing = find_existing_weather_keys(db.session, list(pending)) if pending else set()
+            for key in existing:
+                pending[key].update(status='duplicate', reason='Already stored')
+            pending.clear()
+            
+            for line in batch:
+                counts[line['status']] += 1
+                if line['status'] == 'valid':
+                    records_by_location[line['location_id']] += 1
+            lines = list(batch)
+            batch.clear()
+            return lines
+        
+        try:
+            for i, record in enumerate(records):
+                counts['total'] += 1
+                try:
+                    row, error = parse_record(i, record)
+                except Exception as e:
+                    row, error = None, str(e)
+                
+                if error:
+                    batch.append({'record': i, 'status': 'error', 'error': error})
+                else:
+                    key = (row['location_id'], row['recorded_at'])
+                    line = {
+                        'record': i,
+                        'status': 'valid',
+                        'location_id': row['location_id'],
+                        'recorded_at': row['recorded_at'].isoformat()
+                    }
+                    if key in seen_keys:
+                        line.update(status='duplicate', reason='Duplicate timestamp in file')
+                    else:
+                        seen_keys.add(key)
+                        pending[key] = line
+                    batch.append(line)
+                
+                # Bounded by report lines, not valid rows, so error/duplicate runs stream too
+                if len(batch) >= DEFAULT_BATCH_SIZE:
+                    yield from drain()
+            
+            yield from drain()
+        
+        except JSONArrayExpected as e:
+            yield {'error': str(e)}
+            return
+        except json.JSONDecodeError as e:
+            yield {'error': f'Invalid JSON format: {str(e)}'}
+            return
+        
+        if counts['total'] == 0:
+            yield {'error': 'No weather records provided'}
+            return
+        
+        logger.info("🔎 Dry run: %d records, %d valid, %d duplicates, %d errors",
+                    counts['total'], counts['valid'], counts['duplicate'], counts['error'])
+        
+        yield {
+            'summary': {
+                'dry_run': True,
+                'total_records': counts['total'],
+                'valid_records': counts['valid'],
+                'duplicate_records': counts['duplicate'],
+                'error_records': counts['error'],
+                'records_by_location': {str(location_id): count for location_id, count in records_by_location.items()},
+                'date_format': timestamps.format_name,
+                'date_fallbacks': timestamps.fallbacks
+            }
+        }
+    
     def _extract_location_info(self, record: Dict) -> Optional[Dict]:
         """Extract location information from a weather record"""
         # Try different possible field names for location information
@@ -302,26 +435,21 @@ class WeatherService:
         
         location_info = {}
         
-        print(f"🔍 Extracting location info from record with keys: {list(record.keys())}")
-        
         # Look for location name
         for field in location_fields:
             if field in record and record[field]:
                 location_info['name'] = str(record[field])
-                print(f"  ✅ Found name from field '{field}': {location_info['name']}")
                 break
         
         # If no name found but we have city_name, use that as the nam
         if not location_info.get('name') and 'city_name' in record and record['city_name']:
             location_info['name'] = str(record['city_name'])
-            print(f"  ✅ Using city_name as name: {location_info['name']}")
         
         # Look for city (try multiple field names)
         city_fields = ['city', 'city_name']
         for field in city_fields:
             if field in record and record[field]:
                 location_info['city'] = str(record[field])
-                print(f"  ✅ Found city from field '{field}': {location_info['city']}")
                 break
         
         # Look for coordinates (try multiple field names)
@@ -335,33 +463,27 @@ class WeatherService:
             if field in record and record[field]:
                 try:
                     lat_value = float(record[field])
-                    print(f"  ✅ Found latitude from field '{field}': {lat_value}")
                     break
                 except (ValueError, TypeError):
-                    print(f"  ❌ Invalid latitude from field '{field}': {record[field]}")
+                    logger.debug("  ❌ Invalid latitude from field '%s': %s", field, record[field])
                     continue
         
         for field in lon_fields:
             if field in record and record[field]:
                 try:
                     lon_value = float(record[field])
-                    print(f"  ✅ Found longitude from field '{field}': {lon_value}")
                     break
                 except (ValueError, TypeError):
-                    print(f"  ❌ Invalid longitude from field '{field}': {record[field]}")
+                    logger.debug("  ❌ Invalid longitude from field '%s': %s", field, record[field])
                     continue
         
         if lat_value is not None and lon_value is not None:
             location_info['latitude'] = lat_value
             location_info['longitude'] = lon_value
-            print(f"  ✅ Final coordinates: {lat_value}, {lon_value}")
-        else:
-            print(f"  ❌ Debug: lat_value={lat_value}, lon_value={lon_value}")
         
         # Look for address
         if 'address' in record and record['address']:
             location_info['address'] = str(record['address'])
-            print(f"  ✅ Found address: {location_info['address']}")
         
         # If we have coordinates but no name, create a name from city or coordinates
         if not location_info.get('name') and (location_info.get('latitude') and location_info.get('longitude')):
@@ -369,15 +491,11 @@ class WeatherService:
                 location_info['name'] = f"{location_info['city']} ({location_info['latitude']:.4f}, {location_info['longitude']:.4f})"
             else:
                 location_info['name'] = f"Location ({location_info['latitude']:.4f}, {location_info['longitude']:.4f})"
-            print(f"  ✅ Created name from coordinates: {location_info['name']}")
         
         # Must have at least a name or coordinates
-        print(f"  🔍 Debug: name={location_info.get('name')}, lat={location_info.get('latitude')}, lon={location_info.get('longitude')}")
         if not location_info.get('name') and not (location_info.get('latitude') and location_info.get('longitude')):
-            print(f"  ❌ No valid location info found. Have: {location_info}")
             return None
         
-        print(f"  ✅ Final location info: {location_info}")
         return location_info
     
     def _create_location_key(self, location_info: Dict) -> str:
@@ -395,144 +513,20 @@ class WeatherService:
             # Fallback to coordinates if available
             return f"coord_{location_info.get('latitude', 0):.6f}_{location_info.get('longitude', 0):.6f}"
     
-    def _find_matching_location(self, user_id: int, location_info: Dict) -> Optional[object]:
-        """Find a matching location in the database"""
-        from app.models.location import Location
+    def _find_matching_location(self, location_index: LocationIndex, location_info: Dict) -> Optional[object]:
+        """Find a matching location using the in-memory index of the user's locations"""
+        location = location_index.match(location_info)
         
-        # First try to match by coordinates with flexible tolerance
-        if location_info.get('latitude') and location_info.get('longitude'):
-            lat, lon = location_info['latitude'], location_info['longitude']
-            
-            # Try multiple tolerance levels for coordinate matching
-            tolerances = [
-                0.001,   # ~111 meters (very precise)
-                0.01,    # ~1.1 km (precise)
-                0.022,   # ~2.4 km (1.5 miles - target tolerance)
-                0.1,     # ~11 km (moderate)
-                0.5,     # ~55 km (loose)
-                1.0      # ~111 km (very loose)
-            ]
-            
-            for tolerance in tolerances:
-                print(f"  🔍 Trying coordinate tolerance: ±{tolerance}° (~{tolerance * 111:.0f} km)")
-                
-                location = Location.query.filter(
-                    Location.user_id == user_id,
-                    Location.latitude.between(lat - tolerance, lat + tolerance),
-                    Location.longitude.between(lon - tolerance, lon + tolerance)
-                ).first()
-                
-                if location:
-                    distance_km = ((lat - location.latitude) ** 2 + (lon - location.longitude) ** 2) ** 0.5 * 111
-                    print(f"📍 Matched location by coordinates (tolerance ±{tolerance}°): {location.name}")
-                    print(f"  📏 Distance: {distance_km:.1f} km")
-                    return location
-            
-            print(f"  ❌ No coordinate match found even with ±1.0° tolerance (~111 km)")
-            print(f"  🎯 Target tolerance: ±0.022° (~1.5 miles)")
-            print(f"  📍 Your coordinates: {lat}, {lon}")
-            print(f"  🗺️ Available locations:")
-            all_locations = Location.query.filter_by(user_id=user_id).all()
-            for loc in all_locations:
-                distance = ((lat - loc.latitude) ** 2 + (lon - loc.longitude) ** 2) ** 0.5 * 111
-                print(f"    - {loc.name}: {loc.latitude}, {loc.longitude} ({distance:.1f} km away)")
-        
-        # Try to match by name and city (more flexible)
-        if location_info.get('name') and location_info.get('city'):
-            print(f"  🔍 Trying name+city match: '{location_info['name']}' + '{location_info['city']}'")
-            
-            # Try exact match first
-            location = Location.query.filter(
-                Location.user_id == user_id,
-                Location.name.ilike(f"%{location_info['name']}%"),
-                Location.city.ilike(f"%{location_info['city']}%")
-            ).first()
-            
-            if location:
-                print(f"📍 Matched location by name+city: {location.name}")
-                return location
-            
-            # Try partial matches if exact didn't work
-            location = Location.query.filter(
-                Location.user_id == user_id,
-                Location.city.ilike(f"%{location_info['city']}%")
-            ).first()
-            
-            if location:
-                print(f"📍 Matched location by city only (name partial match failed): {location.name}")
-                return location
-        
-        # Try to match by name only (more flexible)
-        if location_info.get('name'):
-            print(f"  🔍 Trying name match: '{location_info['name']}'")
-            
-            # Try exact name match
-            location = Location.query.filter(
-                Location.user_id == user_id,
-                Location.name.ilike(f"%{location_info['name']}%")
-            ).first()
-            
-            if location:
-                print(f"📍 Matched location by name: {location.name}")
-                return location
-            
-            # Try partial name matches
-            name_parts = location_info['name'].split()
-            for part in name_parts:
-                if len(part) > 2:  # Only try parts longer than 2 characters
-                    location = Location.query.filter(
-                        Location.user_id == user_id,
-                        Location.name.ilike(f"%{part}%")
-                    ).first()
-                    
-                    if location:
-                        print(f"📍 Matched location by name part '{part}': {location.name}")
-                        return location
-        
-        # Try to match by city only (more flexible)
-        if location_info.get('city'):
-            print(f"  🔍 Trying city match: '{location_info['city']}'")
-            
-            # Try exact city match
-            location = Location.query.filter(
-                Location.user_id == user_id,
-                Location.city.ilike(f"%{location_info['city']}%")
-            ).first()
-            
-            if location:
-                print(f"📍 Matched location by city: {location.name}")
-                return location
-            
-            # Try partial city matches
-            city_parts = location_info['city'].split()
-            for part in city_parts:
-                if len(part) > 2:  # Only try parts longer than 2 characters
-                    location = Location.query.filter(
-                        Location.user_id == user_id,
-                        Location.city.ilike(f"%{part}%")
-                    ).first()
-                    
-                    if location:
-                        print(f"📍 Matched location by city part '{part}': {location.name}")
-                        return location
-            
-            # Try matching by address if city doesn't work
-            if location_info.get('city') == 'Healdsburg':
-                print(f"  🔍 Trying address match for Healdsburg...")
-                location = Location.query.filter(
-                    Location.user_id == user_id,
-                    Location.address.ilike('%Healdsburg%')
-                ).first()
-                
-                if location:
-                    print(f"📍 Matched location by address containing 'Healdsburg': {location.name}")
-                    return location
-        
-        print(f"❌ No matching location found for: {location_info}")
-        return None
+        if location:
+            logger.debug("📍 Matched location: %s", location.name)
+        return location
 
     def _parse_date_string(self, date_str: str) -> Optional[datetime]:
-        """Parse date string in various formats including Unix timestamp"""
+        """Parse date string in various formats including Unix timestamp.
+
+        Uploads go through TimestampParser, which only falls back to this
+        for values that don't match the format detected for the file.
+        """
         # First try to parse as Unix timestamp (integer)
         try:
             timestamp = int(date_str)
@@ -589,10 +583,10 @@ class WeatherService:
             }
             
         except requests.RequestException as e:
-            print(f"Weather API error: {e}")
+            logger.error("Weather API error: %s", e)
             return self._get_mock_weather_data(lat, lon)
         except Exception as e:
-            print(f"Unexpected error in weather service: {e}")
+            logger.exception("Unexpected error in weather service: %s", e)
             return self._get_mock_weather_data(lat, lon)
     
     def get_weather_forecast(self, lat: float, lon: float, days: int = 5) -> List[Dict]:
@@ -631,10 +625,10 @@ class WeatherService:
             return forecasts
             
         except requests.RequestException as e:
-            print(f"Weather forecast API error: {e}")
+            logger.error("Weather forecast API error: %s", e)
             return self._get_mock_forecast_data(lat, lon, days)
         except Exception as e:
-            print(f"Unexpected error in weather forecast service: {e}")
+            logger.exception("Unexpected error in weather forecast service: %s", e)
             return self._get_mock_forecast_data(lat, lon, days)
     
     def get_historical_weather(self, lat: float, lon: float, start_date: datetime, end_date: datetime) -> List[Dict]:
@@ -642,7 +636,7 @@ class WeatherService:
         # Check if dates are in the future
         now = datetime.utcnow()
         if start_date > now or end_date > now:
-            print(f"⚠️ Requested dates are in the future: {start_date.date()} to {end_date.date()}")
+            logger.warning("⚠️ Requested dates are in the future: %s to %s", start_date.date(), end_date.date())
             return []  # Return empty list for future dates
         
         if not self.api_key:
@@ -658,7 +652,7 @@ class WeatherService:
             # For now, we'll use the free 5-day forecast and generate realistic historical data
             # In production, you'd use their historical data endpoint
             
-            print(f"🌤️ Fetching historical weather for {start_date.date()} to {end_date.date()}")
+            logger.info("🌤️ Fetching historical weather for %s to %s", start_date.date(), end_date.date())
             
             # Calculate days difference
             days_diff = (end_date - start_date).days
@@ -671,7 +665,7 @@ class WeatherService:
                 return self._get_realistic_historical_data(lat, lon, start_date, end_date)
                 
         except Exception as e:
-            print(f"Historical weather API error: {e}")
+            logger.error("Historical weather API error: %s", e)
             return self._get_mock_historical_data(lat, lon, start_date, end_date)
     
     def _get_realistic_historical_data(self, lat: float, lon: float, start_date: datetime, end_date: datetime) -> List[Dict]:
@@ -679,7 +673,7 @@ class WeatherService:
         import random
         from datetime import timedelta
         
-        print(f"🎯 Generating realistic historical data for {start_date.date()} to {end_date.date()}")
+        logger.info("🎯 Generating realistic historical data for %s to %s", start_date.date(), end_date.date())
         
         # Get current weather to use as a baseline
         current_weather = self.get_current_weather(lat, lon)
@@ -818,9 +812,9 @@ class WeatherService:
         """Generate mock historical weather data for development"""
         from datetime import timedelta
         
-        print(f"⚠️ Generating mock historical data for {start_date.date()} to {end_date.date()}")
-        print(f"   This is NOT real weather data - it's simulated for development purposes")
-        print(f"   ⚠️ IMPORTANT: Mock data should NOT be stored in the database!")
+        logger.warning("⚠️ Generating mock historical data for %s to %s. This is NOT real weather data - "
+                       "it's simulated for development purposes and should NOT be stored in the database!",
+                       start_date.date(), end_date.date())
         
         historical_data = []
         current_date = start_date
@@ -850,10 +844,20 @@ def get_historical_weather_data(lat: float, lon: float, start_date: datetime, en
     """Get historical weather data for given coordinates and date range"""
     return weather_service.get_historical_weather(lat, lon, start_date, end_date)
 
-def upload_historical_weather_data(location_id: int, json_data: str) -> Dict:
+def upload_historical_weather_data(location_id: int, records: Iterable[Dict], progress: Optional[Callable[[Dict], None]] = None,
+                                   commit: bool = True) -> Dict:
     """Upload and store historical weather data from JSON file"""
-    return weather_service.upload_historical_data(location_id, json_data)
+    return weather_service.upload_historical_data(location_id, records, progress, commit)
 
-def upload_multi_location_historical_data(user_id: int, json_data: str) -> Dict:
+def upload_multi_location_historical_data(user_id: int, records: Iterable[Dict], progress: Optional[Callable[[Dict], None]] = None,
+                                          commit: bool = True) -> Dict:
     """Upload and store historical weather data from JSON file for multiple locations"""
-    return weather_service.upload_multi_location_historical_data(user_id, json_data) 
\ No newline at end of file
+    return weather_service.upload_multi_location_historical_data(user_id, records, progress, commit) 
+
+def dry_run_historical_weather_data(location_id: int, records: Iterable[Dict]) -> Iterator[Dict]:
+    """Validate historical weather data from JSON file without storing it"""
+    return weather_service.dry_run_historical_data(location_id, records)
+
+def dry_run_multi_location_historical_data(user_id: int, records: Iterable[Dict]) -> Iterator[Dict]:
+    """Validate multi-location historical weather data from JSON file without storing it"""
+    return weather_service.dry_run_multi_location_historical_data(user_id, records)
@@ -22,6 +22,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from app import create_app, db
 from app.models.weather_record import WeatherRecord
 from app.models.location import Location
+from app.services.daily_summaries import rebuild_daily_summaries
 
 def backup_weather_data():
     """Create a backup of all weather records"""
@@ -130,8 +131,13 @@ def restore_weather_data(backup_filename):
                 db.session.add(record)
                 restored_count += 1
             
+            # Rebuild the daily rollup from the restored records
+            db.session.flush()
+            summary_count = rebuild_daily_summaries(db.session)
+            
             db.session.commit()
             print(f"✅ Successfully restored {restored_count} weather records")
+            print(f"📅 Rebuilt {summary_count} daily summaries")
             
         except Exception as e:
             print(f"❌ Error restoring backup: {e}")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+JSON Provider Benchmark
+
+Serializes synthetic response payloads shaped like the largest endpoints
+(/weather/history, /weather/history?format=rows, /people/homepage-stats) with
+Flask's stdlib provider and with the orjson provider the app registers
+(app/json_provider.py), checks that both produce the same bytes, and reports
+the median time of each.
+
+No database is needed.
+
+Usage:
+    python3 benchmark_json.py
+    python3 benchmark_json.py --records 50000 --runs 9 --output json_benchmark.json
+"""
+
+import sys
+import os
+import json
+import random
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import OrjsonProvider, orjson
+from app.services.weather_reads import RECORD_COLUMNS
+
+def _location(location_id):
+    return {
+        'id': location_id, 'user_id': 1, 'name': f'Location {location_id}', 'address': None,
+        'city': 'San Francisco', 'country': 'US', 'latitude': 37.7547447, 'longitude': -122.4982381,
+        'description': None, 'created_at': '2025-08-27T10:00:00', 'updated_at': '2025-08-27T10:00:00',
+        'weather_records_count': 20454
+    }
+
+def build_payloads(records):
+    """The benchmark payloads: {name: object passed to jsonify}"""
+    random.seed(42)
+    start = datetime(2024, 1, 1)
+    history = [
+        {
+            'id': i, 'location_id': 1, 'temperature': round(random.uniform(-5, 40), 2),
+            'humidity': float(random.randint(10, 100)), 'pressure': float(random.randint(990, 1030)),
+            'wind_speed': round(random.uniform(0, 15), 2), 'wind_direction': float(random.randint(0, 359)),
+            'description': random.choice(('clear sky', 'few clouds', 'light rain')), 'icon': '01d',
+            'recorded_at': (start + timedelta(hours=i)).isoformat()
+        }
+        for i in range(records)
+    ]
+    people = [
+        {
+            'id': p, 'first_name': f'Person {p}', 'last_name': 'Bench', 'birth_date': '1990-01-01',
+            'days_alive': 12000 + p, 'visit_count': 40, 'highest_temperature': 38.5, 'lowest_temperature': 1.5,
+            'locations_visited': [_location(l) for l in range(1, 6)]
+        }
+        for p in range(200)
+    ]
+    return {
+        'history (records)': {'location': _location(1), 'weather_history': history},
+        'history (format=rows)': {
+            'location': _location(1), 'columns': list(RECORD_COLUMNS),
+            'rows': [tuple(record[column] for column in RECORD_COLUMNS) for record in history]
+        },
+        'homepage-stats': {'people': people, 'total_people': len(people), 'total_locations': 5},
+    }
+
+def measure(provider, payload, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = provider.response(payload).get_data()
+        timings.append((time.perf_counter() - started) * 1000)
+    return body, statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the stdlib and orjson JSON providers on response-sized payloads')
+    parser.add_argument('--records', type=int, default=20000, help='Weather records in the history payloads')
+    parser.add_argument('--runs', type=int, default=7, help='Runs per payload; the median is reported')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("❌ orjson is not installed (pip install -r requirements.txt)")
+        sys.exit(1)
+
+    app = Flask(__name__)
+    stdlib, fast = DefaultJSONProvider(app), OrjsonProvider(app)
+
+    report = []
+    for name, payload in build_payloads(args.records).items():
+        before_body, before_ms = measure(stdlib, payload, args.runs)
+        after_body, after_ms = measure(fast, payload, args.runs)
+        identical = before_body == after_body
+        report.append({'payload': name, 'bytes': len(before_body), 'before_ms': round(before_ms, 3),
+                       'after_ms': round(after_ms, 3), 'identical': identical})
+        print(f"\n{name} ({len(before_body):,} bytes)")
+        print(f"  stdlib: {before_ms:9.3f} ms")
+        print(f"  orjson: {after_ms:9.3f} ms  ({before_ms / after_ms:.1f}x)  {'✅ identical' if identical else '❌ output differs'}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if not all(row['identical'] for row in report):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
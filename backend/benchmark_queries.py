@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Query Plan Benchmark
+
+Generates a synthetic dataset in a scratch database and records the plans and
+timings of the main endpoint queries twice: without the lookup indexes, and
+with them (as created by migration e2a7c4d91b58). On PostgreSQL the timings come from
+EXPLAIN ANALYZE; on SQLite from the median of repeated runs, with the plan from
+EXPLAIN QUERY PLAN.
+
+⚠️ The target database is wiped (all tables dropped and recreated). Never point
+this at a database holding real weather data.
+
+Usage:
+    python3 benchmark_queries.py --database-url postgresql://localhost/weather_bench
+    python3 benchmark_queries.py --database-url sqlite:////tmp/weather_bench.db --users 50 --days 30
+"""
+
+import sys
+import os
+import json
+import random
+import argparse
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import DateTime, bindparam, text
+
+# Indexes measured by the benchmark: (name, table, column)
+LOOKUP_INDEXES = (
+    ('ix_locations_user_id', 'locations', 'user_id'),
+    ('ix_people_user_id', 'people', 'user_id'),
+    ('ix_person_locations_person_id', 'person_locations', 'person_id'),
+    ('ix_person_locations_location_id', 'person_locations', 'location_id'),
+)
+WEATHER_CONSTRAINT = 'uq_weather_records_location_recorded_at'
+
+# The queries behind the main endpoints
+QUERIES = (
+    ('locations of a user (/api/locations)',
+     "SELECT * FROM locations WHERE user_id = :user_id"),
+    ('people of a user (/api/people)',
+     "SELECT * FROM people WHERE user_id = :user_id"),
+    ('visits of a person (/api/people/<id>)',
+     "SELECT * FROM person_locations WHERE person_id = :person_id"),
+    ('visitors of a location',
+     "SELECT * FROM person_locations WHERE location_id = :location_id"),
+    ('history page (/weather/history)',
+     "SELECT * FROM weather_records WHERE location_id = :location_id ORDER BY recorded_at DESC LIMIT 500"),
+    ('period aggregate (/weather/period-stats edges)',
+     "SELECT COUNT(*), AVG(temperature), MIN(temperature), MAX(temperature) FROM weather_records "
+     "WHERE location_id = :location_id AND recorded_at >= :start AND recorded_at <= :end"),
+    ('latest per location (/weather/dashboard)',
+     "SELECT l.id, (SELECT MAX(w.recorded_at) FROM weather_records w WHERE w.location_id = l.id) "
+     "FROM locations l WHERE l.user_id = :user_id"),
+)
+
+def generate_dataset(db, users, locations_per_user, people_per_user, visits_per_person, days):
+    """Fill the empty schema with users, locations, people, visits and hourly weather"""
+    from app.models.user import User
+    from app.models.location import Location
+    from app.models.person import Person
+    from app.models.person_location import PersonLocation
+    from app.models.weather_record import WeatherRecord
+    from app.services.daily_summaries import rebuild_daily_summaries
+
+    random.seed(42)
+    user_ids, location_ids = [], []
+    for u in range(users):
+        user = User(f'bench{u}', f'bench{u}@example.com', 'benchmark')
+        db.session.add(user)
+        db.session.flush()
+        user_ids.append(user.id)
+
+        own_locations = []
+        for l in range(locations_per_user):
+            location = Location(user.id, f'Location {u}-{l}', city='Bench', country='US',
+                                latitude=random.uniform(-60, 60), longitude=random.uniform(-180, 180))
+            db.session.add(location)
+            db.session.flush()
+            own_locations.append(location.id)
+        location_ids.extend(own_locations)
+
+        for p in range(people_per_user):
+            person = Person(user.id, f'Person {p}', f'Bench {u}')
+            db.session.add(person)
+            db.session.flush()
+            for v in range(visits_per_person):
+                start = date(2024, 1, 1) + timedelta(days=random.randint(0, days))
+                db.session.add(PersonLocation(person.id, random.choice(own_locations), start, start + timedelta(days=7)))
+    db.session.commit()
+    print(f"👥 {users} users, {len(location_ids)} locations, {users * people_per_user} people")
+
+    table = WeatherRecord.__table__
+    start = datetime(2024, 1, 1)
+    total = 0
+    for location_id in location_ids:
+        rows = [
+            {'location_id': location_id, 'temperature': random.uniform(-5, 40),
+             'description': random.choice(('clear sky', 'few clouds', 'light rain')),
+             'recorded_at': start + timedelta(hours=h)}
+            for h in range(days * 24)
+        ]
+        db.session.execute(table.insert(), rows)
+        total += len(rows)
+    db.session.commit()
+    print(f"🌤️ {total} weather records")
+
+    rebuild_daily_summaries(db.session)
+    db.session.commit()
+    return user_ids, location_ids
+
+def drop_lookup_indexes(db, dialect):
+    for name, table, _ in LOOKUP_INDEXES:
+        db.session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    if dialect == 'postgresql':
+        db.session.execute(text(f"ALTER TABLE weather_records DROP CONSTRAINT {WEATHER_CONSTRAINT}"))
+    db.session.commit()
+
+def create_lookup_indexes(db, dialect):
+    for name, table, column in LOOKUP_INDEXES:
+        db.session.execute(text(f"CREATE INDEX {name} ON {table} ({column})"))
+    if dialect == 'postgresql':
+        db.session.execute(text(
+            f"ALTER TABLE weather_records ADD CONSTRAINT {WEATHER_CONSTRAINT} UNIQUE (location_id, recorded_at)"
+        ))
+    db.session.commit()
+
+def _plan_nodes(node):
+    """Flatten a PostgreSQL JSON plan into 'Node Type [using index]' strings"""
+    label = node['Node Type'] + (f" using {node['Index Name']}" if 'Index Name' in node else '')
+    return [label] + [child_label for child in node.get('Plans', []) for child_label in _plan_nodes(child)]
+
+def _statement(sql):
+    # Typed datetime parameters, so SQLite compares them in its stored format
+    if ':start' in sql:
+        return text(sql).bindparams(bindparam('start', type_=DateTime), bindparam('end', type_=DateTime))
+    return text(sql)
+
+def measure(db, dialect, params, runs):
+    """(plan, milliseconds) for every benchmark query"""
+    results = []
+    for name, sql in QUERIES:
+        used = {key: value for key, value in params.items() if f':{key}' in sql}
+
+        if dialect == 'postgresql':
+            timings, plan = [], None
+            for _ in range(runs):
+                output = db.session.execute(_statement('EXPLAIN (ANALYZE, FORMAT JSON) ' + sql), used).scalar()
+                output = json.loads(output) if isinstance(output, str) else output
+                timings.append(output[0]['Execution Time'])
+                plan = ', '.join(_plan_nodes(output[0]['Plan']))
+        else:
+            plan = '; '.join(row[-1] for row in db.session.execute(_statement('EXPLAIN QUERY PLAN ' + sql), used))
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                db.session.execute(_statement(sql), used).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+
+        results.append((name, plan, statistics.median(timings)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE the main endpoint queries without and with the lookup indexes')
+    parser.add_argument('--database-url', required=True, help='Scratch database; it is wiped')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--locations-per-user', type=int, default=3)
+    parser.add_argument('--people-per-user', type=int, default=2)
+    parser.add_argument('--visits-per-person', type=int, default=10)
+    parser.add_argument('--days', type=int, default=60, help='Days of hourly weather per location')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per query; the median is reported')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    from app import create_app, db
+
+    app = create_app()
+    with app.app_context():
+        dialect = db.engine.dialect.name
+        print(f"🧪 Benchmarking on {dialect}")
+
+        db.drop_all()
+        db.create_all()
+        user_ids, location_ids = generate_dataset(
+            db, args.users, args.locations_per_user, args.people_per_user, args.visits_per_person, args.days
+        )
+
+        params = {
+            'user_id': user_ids[len(user_ids) // 2],
+            'person_id': args.users * args.people_per_user // 2 or 1,
+            'location_id': location_ids[len(location_ids) // 2],
+            'start': datetime(2024, 1, 1) + timedelta(days=args.days // 3),
+            'end': datetime(2024, 1, 1) + timedelta(days=args.days // 3 + 7),
+        }
+
+        drop_lookup_indexes(db, dialect)
+        db.session.execute(text('ANALYZE'))
+        before = measure(db, dialect, params, args.runs)
+
+        create_lookup_indexes(db, dialect)
+        db.session.execute(text('ANALYZE'))
+        after = measure(db, dialect, params, args.runs)
+        db.session.commit()
+
+    if dialect != 'postgresql':
+        print(f"ℹ️ SQLite can't drop {WEATHER_CONSTRAINT}; weather_records queries keep its index in both runs")
+
+    report = []
+    for (name, plan_before, ms_before), (_, plan_after, ms_after) in zip(before, after):
+        report.append({'query': name, 'before_ms': round(ms_before, 3), 'after_ms': round(ms_after, 3),
+                       'plan_before': plan_before, 'plan_after': plan_after})
+        print(f"\n{name}")
+        print(f"  before: {ms_before:9.3f} ms  {plan_before}")
+        print(f"  after:  {ms_after:9.3f} ms  {plan_after}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Add unique (location_id, recorded_at) constraint to weather_records
+
+Revision ID: 3c1f7a9d2e84
+Revises: 9f24e656ea3f
+Create Date: 2025-09-02 10:14:22.418305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f7a9d2e84'
+down_revision = '9f24e656ea3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove duplicate observations left behind by earlier uploads, keeping the oldest row
+    op.execute("""
+        DELETE FROM weather_records
+        WHERE recorded_at IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM weather_records
+              WHERE recorded_at IS NOT NULL
+              GROUP BY location_id, recorded_at
+          )
+    """)
+
+    with op.batch_alter_table('weather_records', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_weather_records_location_recorded_at', ['location_id', 'recorded_at'])
+
+
+def downgrade():
+    with op.batch_alter_table('weather_records', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_weather_records_location_recorded_at', type_='unique')
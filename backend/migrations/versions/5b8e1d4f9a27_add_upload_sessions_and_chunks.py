@@ -0,0 +1,49 @@
+"""Add upload_sessions and upload_chunks tables
+
+Revision ID: 5b8e1d4f9a27
+Revises: a7d2e5c81f36
+Create Date: 2025-09-05 10:17:43.215908
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e1d4f9a27'
+down_revision = 'a7d2e5c81f36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upload_sessions',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.Column('total_chunks', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('finalized_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('upload_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.String(length=32), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('total_records', sa.Integer(), nullable=False),
+    sa.Column('stored_records', sa.Integer(), nullable=False),
+    sa.Column('skipped_records', sa.Integer(), nullable=False),
+    sa.Column('errors_count', sa.Integer(), nullable=False),
+    sa.Column('committed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['upload_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id', 'chunk_index', name='uq_upload_chunks_session_chunk')
+    )
+
+
+def downgrade():
+    op.drop_table('upload_chunks')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,26 @@
+"""Add weather_version to locations
+
+Revision ID: a7c3e5f1b829
+Revises: f5b1d8e3a604
+Create Date: 2025-09-12 09:41:17.502664
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e5f1b829'
+down_revision = 'f5b1d8e3a604'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weather_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.drop_column('weather_version')
@@ -0,0 +1,41 @@
+"""Add upload_jobs table
+
+Revision ID: a7d2e5c81f36
+Revises: 3c1f7a9d2e84
+Create Date: 2025-09-03 14:52:08.731662
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d2e5c81f36'
+down_revision = '3c1f7a9d2e84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upload_jobs',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('stored_records', sa.Integer(), nullable=False),
+    sa.Column('skipped_records', sa.Integer(), nullable=False),
+    sa.Column('errors_count', sa.Integer(), nullable=False),
+    sa.Column('locations_processed', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('upload_jobs')
@@ -0,0 +1,26 @@
+"""Add date_fallbacks to upload_jobs
+
+Revision ID: c4e8a1f7d392
+Revises: a7c3e5f1b829
+Create Date: 2025-09-15 14:22:08.913375
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1f7d392'
+down_revision = 'a7c3e5f1b829'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('date_fallbacks', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.drop_column('date_fallbacks')
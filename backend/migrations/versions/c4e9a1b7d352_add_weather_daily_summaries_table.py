@@ -0,0 +1,76 @@
+"""Add weather_daily_summaries table
+
+Revision ID: c4e9a1b7d352
+Revises: 5b8e1d4f9a27
+Create Date: 2025-09-08 09:41:26.508113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e9a1b7d352'
+down_revision = '5b8e1d4f9a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('weather_daily_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('record_count', sa.Integer(), nullable=False),
+    sa.Column('temperature_min', sa.Float(), nullable=False),
+    sa.Column('temperature_max', sa.Float(), nullable=False),
+    sa.Column('temperature_sum', sa.Float(), nullable=False),
+    sa.Column('valid_count', sa.Integer(), nullable=False),
+    sa.Column('valid_min', sa.Float(), nullable=True),
+    sa.Column('valid_max', sa.Float(), nullable=True),
+    sa.Column('valid_sum', sa.Float(), nullable=True),
+    sa.Column('condition_counts', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id', 'day', name='uq_weather_daily_summaries_location_day')
+    )
+
+    # Backfill from the existing records (same as `flask rebuild-daily-summaries`)
+    json_object_agg = 'json_object_agg' if op.get_bind().dialect.name == 'postgresql' else 'json_group_object'
+    op.execute(f"""
+        INSERT INTO weather_daily_summaries (
+            location_id, day, record_count, temperature_min, temperature_max, temperature_sum,
+            valid_count, valid_min, valid_max, valid_sum, condition_counts, updated_at
+        )
+        SELECT d.location_id, d.day, d.record_count, d.temperature_min, d.temperature_max, d.temperature_sum,
+               d.valid_count, d.valid_min, d.valid_max, d.valid_sum, c.condition_counts, CURRENT_TIMESTAMP
+        FROM (
+            SELECT location_id, date(recorded_at) AS day,
+                   COUNT(*) AS record_count,
+                   MIN(temperature) AS temperature_min,
+                   MAX(temperature) AS temperature_max,
+                   SUM(temperature) AS temperature_sum,
+                   COUNT(CASE WHEN temperature BETWEEN 0 AND 45 THEN temperature END) AS valid_count,
+                   MIN(CASE WHEN temperature BETWEEN 0 AND 45 THEN temperature END) AS valid_min,
+                   MAX(CASE WHEN temperature BETWEEN 0 AND 45 THEN temperature END) AS valid_max,
+                   SUM(CASE WHEN temperature BETWEEN 0 AND 45 THEN temperature END) AS valid_sum
+            FROM weather_records
+            WHERE recorded_at IS NOT NULL
+            GROUP BY location_id, date(recorded_at)
+        ) d
+        LEFT JOIN (
+            SELECT location_id, day, {json_object_agg}(description, n) AS condition_counts
+            FROM (
+                SELECT location_id, date(recorded_at) AS day, description, COUNT(*) AS n
+                FROM weather_records
+                WHERE recorded_at IS NOT NULL AND description <> ''
+                GROUP BY location_id, date(recorded_at), description
+            ) g
+            GROUP BY location_id, day
+        ) c ON c.location_id = d.location_id AND c.day = d.day
+    """)
+
+
+def downgrade():
+    op.drop_table('weather_daily_summaries')
@@ -0,0 +1,34 @@
+"""Add weather_records_count to locations
+
+Revision ID: d8f3b6a2c915
+Revises: c4e9a1b7d352
+Create Date: 2025-09-09 14:12:03.771940
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f3b6a2c915'
+down_revision = 'c4e9a1b7d352'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weather_records_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the daily rollup, which is how the count is maintained from now on
+    op.execute("""
+        UPDATE locations SET weather_records_count = COALESCE((
+            SELECT SUM(record_count) FROM weather_daily_summaries
+            WHERE weather_daily_summaries.location_id = locations.id
+        ), 0)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('locations', schema=None) as batch_op:
+        batch_op.drop_column('weather_records_count')
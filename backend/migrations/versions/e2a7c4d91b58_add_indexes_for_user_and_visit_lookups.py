@@ -0,0 +1,41 @@
+"""Add indexes for user and visit lookups
+
+Revision ID: e2a7c4d91b58
+Revises: d8f3b6a2c915
+Create Date: 2025-09-10 10:27:45.118302
+
+weather_records(location_id, recorded_at) needs no new index: the
+uq_weather_records_location_recorded_at constraint (3c1f7a9d2e84) is backed
+by a unique index on exactly those columns.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c4d91b58'
+down_revision = 'd8f3b6a2c915'
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ('ix_locations_user_id', 'locations', ['user_id']),
+    ('ix_people_user_id', 'people', ['user_id']),
+    ('ix_person_locations_person_id', 'person_locations', ['person_id']),
+    ('ix_person_locations_location_id', 'person_locations', ['location_id']),
+)
+
+
+def upgrade():
+    # CONCURRENTLY can't run inside a transaction; on PostgreSQL this builds the
+    # indexes without blocking writes to the tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
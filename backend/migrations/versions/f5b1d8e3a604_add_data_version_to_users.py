@@ -0,0 +1,26 @@
+"""Add data_version to users
+
+Revision ID: f5b1d8e3a604
+Revises: e2a7c4d91b58
+Create Date: 2025-09-11 10:27:45.318206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5b1d8e3a604'
+down_revision = 'e2a7c4d91b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('data_version')
@@ -0,0 +1,23 @@
+import os
+import pytest
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app, db
+from app.models.user import User
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def user(app):
+    user = User('tester', 'tester@example.com', 'password')
+    db.session.add(user)
+    db.session.commit()
+    return user
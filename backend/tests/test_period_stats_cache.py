@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models.location import Location
+from app.services.daily_summaries import cached_period_stats
+from app.services.period_stats_cache import get_period_stats_cache
+from app.services.weather_ingest import insert_weather_rows
+
+WINDOW_START = datetime(2020, 9, 2)
+WINDOW_END = datetime(2020, 9, 5, 23, 59, 59)
+
+def _insert(location_id, first, hours):
+    rows = [
+        {'location_id': location_id, 'temperature': 20.0 + hour % 5, 'description': 'clear sky',
+         'recorded_at': first + timedelta(hours=hour)}
+        for hour in range(hours)
+    ]
+    insert_weather_rows(db.session, 'sqlite', rows)
+    db.session.commit()
+
+@pytest.fixture
+def location(user):
+    location = Location(user.id, 'Home', city='San Francisco', country='US', latitude=37.75, longitude=-122.5)
+    db.session.add(location)
+    db.session.commit()
+    _insert(location.id, WINDOW_START, 72)
+    get_period_stats_cache().clear()
+    return location
+
+def _window_stats(location):
+    cache = get_period_stats_cache()
+    hits = cache.hits
+    totals, _ = cached_period_stats([(location.id, WINDOW_START, WINDOW_END)])
+    return totals[0]['record_count'], cache.hits > hits
+
+def test_insert_outside_window_keeps_hit(location):
+    assert _window_stats(location) == (72, False)
+    _insert(location.id, datetime(2020, 9, 26), 10)
+    assert _window_stats(location) == (72, True)
+    assert len(get_period_stats_cache()) == 1
+
+def test_insert_inside_window_misses(location):
+    assert _window_stats(location) == (72, False)
+    _insert(location.id, datetime(2020, 9, 5), 10)
+    assert _window_stats(location) == (82, False)
+    assert _window_stats(location) == (82, True)
+    assert len(get_period_stats_cache()) == 1
@@ -0,0 +1,48 @@
+import io
+import pytest
+from app import db
+from app.models.upload_job import UploadJob
+from app.services.upload_jobs import create_upload_job, upload_job_runner
+
+class BrokenBody(io.RawIOBase):
+    """A request body whose client disconnects after the first chunk"""
+
+    def __init__(self):
+        self.reads = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.reads += 1
+        if self.reads > 1:
+            raise OSError('client disconnected')
+        buffer[:2] = b'[{'
+        return 2
+
+def test_failed_spool_frees_slot_and_fails_job(user):
+    pending = upload_job_runner._pending
+
+    with pytest.raises(OSError):
+        create_upload_job(user.id, None, BrokenBody(), lambda records, progress: {'success': True})
+
+    assert upload_job_runner._pending == pending
+    job = UploadJob.query.filter_by(user_id=user.id).one()
+    assert job.status == 'failed'
+    assert 'client disconnected' in job.error
+    assert job.finished_at is not None
+
+def test_completed_job_reports_date_fallbacks(app, user):
+    job = UploadJob(user_id=user.id, location_id=None)
+    db.session.add(job)
+    db.session.commit()
+    upload_job_runner._pending += 1  # the slot submit() would have taken
+
+    result = {'success': True, 'total_records': 3, 'stored_records': 3, 'skipped_records': 0,
+              'errors': [], 'date_format': 'iso', 'date_fallbacks': 2}
+    upload_job_runner._run(app, job.id, io.BytesIO(b'[]'), lambda records, progress: result)
+
+    db.session.expire_all()
+    payload = db.session.get(UploadJob, job.id).to_dict()
+    assert payload['status'] == 'completed'
+    assert payload['date_fallbacks'] == 2
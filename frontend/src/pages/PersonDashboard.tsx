@@ -38,7 +38,7 @@ import {
 import { useParams, useNavigate } from 'react-router-dom';
 import { peopleService, Person as PersonType } from '../services/peopleService';
 import { locationService, Location as LocationType } from '../services/locationService';
-import { weatherService } from '../services/weatherService';
+import { weatherService, WeatherPeriodWindow, WeatherPeriodStatsBatchResponse } from '../services/weatherService';
 import { countUniqueCountries } from '../utils/countryUtils';
 import { usePreferences, TemperatureUnit } from '../contexts/PreferencesContext';
 import PersonLocationMap from '../components/PersonLocationMap';
@@ -416,98 +416,118 @@ const PersonDashboard: React.FC = () => {
       // IMPORTANT: Weather API date ranges should match the dates displayed in the timeline UI
       // This ensures weather averages are calculated for the exact same period users see
       
-      const eventsWithPeriodStats = await Promise.all(
-        events.map(async (event) => {
-          if (event.location && event.type !== 'birth') {
-            try {
-              console.log(`🌤️ Processing event: ${event.title} at location: ${event.location.name}`);
-              
-              // For home events, we need to determine the time period
-              let startDate: string;
-              let endDate: string;
+      // Work out every event's period first, then fetch them in batch requests
+      const windows: (WeatherPeriodWindow | null)[] = events.map((event) => {
+        if (event.location && event.type !== 'birth') {
+          console.log(`🌤️ Processing event: ${event.title} at location: ${event.location.name}`);
+          
+          // For home events, we need to determine the time period
+          let startDate: string;
+          let endDate: string;
+          
+          if (event.type === 'home') {
+            // For home events, use a more focused period that's realistic for "home" weather
+            const eventDate = event.date; // event.date is already a Date object
+            // Use a 7-day period centered on the event date for more realistic home weather
+            startDate = new Date(eventDate.getTime() - 3 * 24 * 60 * 60 * 1000).toISOString(); // 3 days before
+            endDate = new Date(eventDate.getTime() + 3 * 24 * 60 * 60 * 1000).toISOString(); // 3 days after
+            console.log(`🏠 Home event - using focused 7-day period: ${startDate} to ${endDate}`);
+          } else if (event.type === 'visit' && personData && personData.visits) {
+            // For visit events, find the actual visit data to get start/end dates
+            console.log(`🔍 DEBUG: Event type is 'visit', checking person.visits...`);
+            console.log(`🔍 DEBUG: person.visits:`, personData.visits);
+            console.log(`�� DEBUG: Looking for visit with location_id: ${event.location!.id}`);
+            
+            const visit = personData.visits.find(v => v.location_id === event.location!.id);
+            console.log(`🔍 DEBUG: Found visit:`, visit);
+            
+            if (visit) {
+              const startDateObj = parseDateConsistent(visit.start_date);
+              const endDateObj = visit.end_date ? parseDateConsistent(visit.end_date) : parseDateConsistent(visit.start_date);
               
-              if (event.type === 'home') {
-                // For home events, use a more focused period that's realistic for "home" weather
-                const eventDate = event.date; // event.date is already a Date object
-                // Use a 7-day period centered on the event date for more realistic home weather
-                startDate = new Date(eventDate.getTime() - 3 * 24 * 60 * 60 * 1000).toISOString(); // 3 days before
-                endDate = new Date(eventDate.getTime() + 3 * 24 * 60 * 60 * 1000).toISOString(); // 3 days after
-                console.log(`🏠 Home event - using focused 7-day period: ${startDate} to ${endDate}`);
-              } else if (event.type === 'visit' && personData && personData.visits) {
-                // For visit events, find the actual visit data to get start/end dates
-                console.log(`🔍 DEBUG: Event type is 'visit', checking person.visits...`);
-                console.log(`🔍 DEBUG: person.visits:`, personData.visits);
-                console.log(`�� DEBUG: Looking for visit with location_id: ${event.location!.id}`);
-                
-                const visit = personData.visits.find(v => v.location_id === event.location!.id);
-                console.log(`🔍 DEBUG: Found visit:`, visit);
-                
-                if (visit) {
-                  const startDateObj = parseDateConsistent(visit.start_date);
-                  const endDateObj = visit.end_date ? parseDateConsistent(visit.end_date) : parseDateConsistent(visit.start_date);
-                  
-                  // For single-day visits, ensure we cover the entire 24-hour period
-                  if (startDateObj.toDateString() === endDateObj.toDateString()) {
-                    // Same day - set start to beginning of day, end to end of day
-                    startDate = new Date(startDateObj.getFullYear(), startDateObj.getMonth(), startDateObj.getDate(), 0, 0, 0).toISOString();
-                    endDate = new Date(endDateObj.getFullYear(), endDateObj.getMonth(), endDateObj.getDate(), 23, 59, 59).toISOString();
-                  } else {
-                    // Different days - use exact dates
-                    startDate = startDateObj.toISOString();
-                    endDate = endDateObj.toISOString();
-                  }
-                  
-                  console.log(`🎯 Visit event - using date range: ${startDate} to ${endDate}`);
-                } else {
-                  // Fallback to default period if visit not found
-                  const eventDate = event.date; // event.date is already a Date object
-                  startDate = new Date(eventDate.getTime() - 14 * 24 * 60 * 60 * 1000).toISOString();
-                  endDate = new Date(eventDate.getTime() + 14 * 24 * 60 * 60 * 1000).toISOString();
-                  console.log(`⚠️ Visit event - fallback to default period: ${startDate} to ${endDate}`);
-                }
+              // For single-day visits, ensure we cover the entire 24-hour period
+              if (startDateObj.toDateString() === endDateObj.toDateString()) {
+                // Same day - set start to beginning of day, end to end of day
+                startDate = new Date(startDateObj.getFullYear(), startDateObj.getMonth(), startDateObj.getDate(), 0, 0, 0).toISOString();
+                endDate = new Date(endDateObj.getFullYear(), endDateObj.getMonth(), endDateObj.getDate(), 23, 59, 59).toISOString();
               } else {
-                // Fallback to default period
-                console.log(`🔍 DEBUG: Event type is NOT 'visit' or person.visits not found`);
-                console.log(`🔍 DEBUG: Event type: ${event.type}`);
-                console.log(`🔍 DEBUG: person:`, personData);
-                console.log(`🔍 DEBUG: person.visits:`, personData?.visits);
-                
-                const eventDate = event.date; // event.date is already a Date object
-                startDate = new Date(eventDate.getTime() - 14 * 24 * 60 * 60 * 1000).toISOString();
-                endDate = new Date(eventDate.getTime() + 14 * 24 * 60 * 60 * 1000).toISOString();
-                console.log(`⚠️ Unknown event type - fallback to default period: ${startDate} to ${endDate}`);
+                // Different days - use exact dates
+                startDate = startDateObj.toISOString();
+                endDate = endDateObj.toISOString();
               }
               
-              console.log(`📡 Calling API for location ${event.location.id}: ${startDate} to ${endDate}`);
-              
-              const periodStats = await weatherService.getWeatherPeriodStats(
-                event.location.id,
-                startDate,
-                endDate
-              );
-              
-              console.log(`✅ Got period stats for ${event.location.name}:`, periodStats.period_stats);
-              
-              return {
-                ...event,
-                periodWeatherStats: {
-                  average_temperature: periodStats.period_stats.average_temperature,
-                  highest_temperature: periodStats.period_stats.highest_temperature,
-                  lowest_temperature: periodStats.period_stats.lowest_temperature,
-                  total_records: periodStats.period_stats.total_records,
-                  data_exists: periodStats.period_stats.data_exists,
-                  data_coverage: periodStats.period_stats.data_coverage,
-                  days_with_data: periodStats.period_stats.days_with_data,
-                  total_days: periodStats.period_stats.total_days,
-                  coverage_percentage: periodStats.period_stats.coverage_percentage
-                }
-              };
+              console.log(`🎯 Visit event - using date range: ${startDate} to ${endDate}`);
+            } else {
+              // Fallback to default period if visit not found
+              const eventDate = event.date; // event.date is already a Date object
+              startDate = new Date(eventDate.getTime() - 14 * 24 * 60 * 60 * 1000).toISOString();
+              endDate = new Date(eventDate.getTime() + 14 * 24 * 60 * 60 * 1000).toISOString();
+              console.log(`⚠️ Visit event - fallback to default period: ${startDate} to ${endDate}`);
+            }
+          } else {
+            // Fallback to default period
+            console.log(`🔍 DEBUG: Event type is NOT 'visit' or person.visits not found`);
+            console.log(`🔍 DEBUG: Event type: ${event.type}`);
+            console.log(`🔍 DEBUG: person:`, personData);
+            console.log(`🔍 DEBUG: person.visits:`, personData?.visits);
+            
+            const eventDate = event.date; // event.date is already a Date object
+            startDate = new Date(eventDate.getTime() - 14 * 24 * 60 * 60 * 1000).toISOString();
+            endDate = new Date(eventDate.getTime() + 14 * 24 * 60 * 60 * 1000).toISOString();
+            console.log(`⚠️ Unknown event type - fallback to default period: ${startDate} to ${endDate}`);
+          }
+          
+          console.log(`📡 Requesting period stats for location ${event.location.id}: ${startDate} to ${endDate}`);
+          return { location_id: event.location.id, start_date: startDate, end_date: endDate };
+        }
+        return null;
+      });
+      
+      const requestedWindows = windows.filter((window): window is WeatherPeriodWindow => window !== null);
+      const batch: WeatherPeriodStatsBatchResponse = requestedWindows.length > 0
+        ? await weatherService.getWeatherPeriodStatsBatch(requestedWindows)
+        : { results: [] };
+      
+      // Results come back in request order
+      let resultIndex = 0;
+      const eventsWithPeriodStats = await Promise.all(
+        events.map(async (event, index) => {
+          const window = windows[index];
+          if (!window) {
+            return event;
+          }
+          
+          const result = batch.results[resultIndex++];
+          if (result.error || !result.period_stats) {
+            console.warn(`❌ Could not fetch period stats for ${event.location!.name}:`, result.error);
+            return event;
+          }
+          
+          let stats = result.period_stats;
+          if (!stats.data_exists) {
+            // Nothing stored for this period: the single-window endpoint fills it from the historical weather API
+            try {
+              stats = (await weatherService.getWeatherPeriodStats(window.location_id, window.start_date, window.end_date)).period_stats;
             } catch (statsErr) {
-              console.warn(`❌ Could not fetch period stats for ${event.location.name}:`, statsErr);
-              return event;
+              console.warn(`⚠️ Historical weather fallback failed for ${event.location!.name}:`, statsErr);
             }
           }
-          return event;
+          console.log(`✅ Got period stats for ${event.location!.name}:`, stats);
+          
+          return {
+            ...event,
+            periodWeatherStats: {
+              average_temperature: stats.average_temperature,
+              highest_temperature: stats.highest_temperature,
+              lowest_temperature: stats.lowest_temperature,
+              total_records: stats.total_records,
+              data_exists: stats.data_exists,
+              data_coverage: stats.data_coverage,
+              days_with_data: stats.days_with_data,
+              total_days: stats.total_days,
+              coverage_percentage: stats.coverage_percentage
+            }
+          };
         })
       );
       
@@ -56,6 +56,36 @@ export interface WeatherResponse {
 export interface WeatherHistoryResponse {
   location: Location;
   weather_history: WeatherData[];
+  next_cursor?: string | null;
+}
+
+export interface WeatherHistoryParams {
+  limit?: number;
+  cursor?: string;
+  start?: string;
+  end?: string;
+}
+
+// History as value arrays (format=rows): each row follows the order of columns
+export interface WeatherHistoryRowsResponse {
+  location: Location;
+  columns: (keyof WeatherData)[];
+  rows: (string | number | null)[][];
+  next_cursor?: string | null;
+}
+
+export interface WeatherHistorySeriesResponse {
+  location: Location;
+  total_records: number;
+  downsampling: { method: 'lttb'; points: number } | { method: 'bucket'; bucket_seconds: number };
+  series: {
+    recorded_at: string;
+    temperature?: number;
+    count?: number;
+    min?: number;
+    avg?: number;
+    max?: number;
+  }[];
 }
 
 export interface WeatherStats {
@@ -97,6 +127,24 @@ export interface WeatherPeriodStatsResponse {
   period_stats: WeatherPeriodStats;
 }
 
+export interface WeatherPeriodWindow {
+  location_id: number;
+  start_date: string;
+  end_date: string;
+}
+
+// One per window, in request order: period_stats, or error when that window couldn't be answered
+export interface WeatherPeriodStatsBatchResponse {
+  results: {
+    location_id: number | null;
+    period_stats?: WeatherPeriodStats;
+    error?: string;
+  }[];
+}
+
+// Server-side cap on windows per batch request (MAX_PERIOD_STATS_WINDOWS in routes/weather.py)
+export const MAX_PERIOD_STATS_WINDOWS = 200;
+
 export interface DashboardData {
   total_locations: number;
   average_temperature: number;
@@ -141,8 +189,23 @@ export const weatherService = {
     return response.data;
   },
 
-  async getWeatherHistory(locationId: number): Promise<WeatherHistoryResponse> {
-    const response = await api.get(`/weather/history/${locationId}`);
+  async getWeatherHistory(locationId: number, params?: WeatherHistoryParams): Promise<WeatherHistoryResponse> {
+    const response = await api.get(`/weather/history/${locationId}`, { params });
+    return response.data;
+  },
+
+  // Compact history for large tables: value arrays instead of one object per record
+  async getWeatherHistoryRows(locationId: number, params?: WeatherHistoryParams): Promise<WeatherHistoryRowsResponse> {
+    const response = await api.get(`/weather/history/${locationId}`, { params: { ...params, format: 'rows' } });
+    return response.data;
+  },
+
+  // Downsampled chart series: pass points (LTTB) or bucket (e.g. '1h', '1d') and optional start/end
+  async getWeatherHistorySeries(
+    locationId: number,
+    params: { points?: number; bucket?: string; start?: string; end?: string }
+  ): Promise<WeatherHistorySeriesResponse> {
+    const response = await api.get(`/weather/history/${locationId}`, { params });
     return response.data;
   },
 
@@ -156,6 +219,22 @@ export const weatherService = {
     return response.data;
   },
 
+  async getWeatherPeriodStatsBatch(windows: WeatherPeriodWindow[]): Promise<WeatherPeriodStatsBatchResponse> {
+    // Split into requests the server accepts; results are concatenated back in order
+    const chunks: WeatherPeriodWindow[][] = [];
+    for (let i = 0; i < windows.length; i += MAX_PERIOD_STATS_WINDOWS) {
+      chunks.push(windows.slice(i, i + MAX_PERIOD_STATS_WINDOWS));
+    }
+    const responses = await Promise.all(
+      chunks.map((chunk) => api.post('/weather/period-stats/batch', chunk))
+    );
+    return {
+      results: responses.reduce<WeatherPeriodStatsBatchResponse['results']>(
+        (results, response) => results.concat(response.data.results), []
+      )
+    };
+  },
+
   async getWeatherDashboard(): Promise<DashboardData> {
     const response = await api.get('/weather/dashboard');
     return response.data;